@@ -0,0 +1,8 @@
+class DeadlineExceededException(Exception):
+    """Exception raised when a chunk or batch runs past its deadline."""
+    
+    def __init__(self, label: str, budget_s: float, message: str = "Deadline exceeded"):
+        self.label = label
+        self.budget_s = budget_s
+        self.message = f"{message}: {label} ran past its {budget_s:.0f}s budget"
+        super().__init__(self.message)
@@ -0,0 +1,8 @@
+class OutputTimeoutException(Exception):
+    """Exception raised when a translation output doesn't show up (or stays stale) before its deadline."""
+    
+    def __init__(self, timeout_ms: float, stale: bool = False, message: str = "No translation output"):
+        self.timeout_ms = timeout_ms
+        self.stale = stale
+        self.message = f"{message} within {timeout_ms / 1000:.1f}s{' (output still shows the previous translation)' if stale else ''}"
+        super().__init__(self.message)
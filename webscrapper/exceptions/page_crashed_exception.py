@@ -0,0 +1,8 @@
+class PageCrashedException(Exception):
+    """Exception raised when a crashed or closed page can't be rebuilt."""
+    
+    def __init__(self, reason: str, recoveries: int, message: str = "Page crashed"):
+        self.reason = reason
+        self.recoveries = recoveries
+        self.message = f"{message}: {reason} (after {recoveries} recoveries)"
+        super().__init__(self.message)
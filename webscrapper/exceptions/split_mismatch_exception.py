@@ -0,0 +1,8 @@
+class SplitMismatchException(Exception):
+    """Exception raised when a merged translation doesn't split back into the expected number of sentences."""
+    
+    def __init__(self, expected_count: int, actual_count: int, message: str = "Split count mismatch"):
+        self.expected_count = expected_count
+        self.actual_count = actual_count
+        self.message = f"{message} Expected {expected_count} but got {actual_count}"
+        super().__init__(self.message)
@@ -0,0 +1,255 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# runnable as `python -m mock_site.benchmark` from webscrapper/, the run itself happens in a scratch folder
+WEBSCRAPPER_FOLDER = str(Path(__file__).resolve().parent.parent)
+if WEBSCRAPPER_FOLDER not in sys.path:
+    sys.path.insert(0, WEBSCRAPPER_FOLDER)
+
+from mock_site.server import FIXTURES_FOLDER, add_server_arguments, get_server_settings, start_server
+from scrapper_config import CONFIG
+'''
+End-to-end throughput benchmark: runs translator_maitre (browser pool, planner, cache, ledger,
+retry queue, sink) against the local mock site and reports sentences/s, p50/p95 chunk latency
+and the RSS of the browsers. Pacing and human-simulation delays are zeroed unless --human-delays
+is given, so the numbers measure the scraper rather than the sleeps.
+Usage: python -m mock_site.benchmark --sentences 600 --workers 4 --latency-ms 200 600 --failure-rate 0.02
+With --capture-network the Google backend reads its translations from the batchexecute responses
+(CONFIG["google_capture_network"]); the recorded fixture bodies are decoded and checked first.
+
+Nothing that creates a logger, ledger or cache may be imported before main() has moved into the
+scratch folder: every output path is relative to OUTPUT_FOLDER, and CONFIG defaults are bound at import.
+'''
+
+BENCHMARK_CONFIG = {
+    "new_request_delay_range": (0, 0),
+    "new_batch_delay_range": (0, 0),
+    "interaction_delay_range": (0, 0),
+    "scroll_delay_range": (0, 0),
+    "button_delay_range": (0, 0),
+    "retry_delay_range": (0.5, 1),
+    "min_batch_interval": 0,
+    "max_batch_interval": 0,
+    "backends_global_interval_range": (0, 0),
+    "origin_interval_range": None,
+    "max_scroll_iterations": 1,
+    "button_click_probability": 0,
+    "safe_button_click_probability": 0,
+    "unsafe_button_click_probability": 0,
+    "double_button_click_probability": 0,
+}
+
+
+def configure(
+    mock_site_url: str,
+    backend_names: List[str],
+    human_delays: bool,
+    target_languages: Optional[List[str]] = None,
+    capture_network: bool = False) -> None:
+    CONFIG["mock_site_url"] = mock_site_url
+    CONFIG["target_languages"] = target_languages
+    CONFIG["google_capture_network"] = capture_network
+    CONFIG["proxy_rotation"] = False
+    for name, settings in CONFIG["backends"].items():
+        settings["enabled"] = name in backend_names
+        if not human_delays:
+            settings["interval_range"] = (0, 0)
+            settings["request_delay_range"] = (0, 0)
+    if not human_delays:
+        CONFIG.update(BENCHMARK_CONFIG)
+
+
+def make_pairs(count: int) -> List[Tuple[str, str]]:
+    """Unique synthetic (source, original) pairs of realistic sentence length."""
+    return [
+        (f"Ceci est la phrase numéro {i} du banc d'essai, elle décrit une journée ordinaire au marché du village.", f"Frazenn {i}")
+        for i in range(1, count + 1)
+    ]
+
+
+def check_recorded_responses() -> Dict[str, int]:
+    """Decode every recorded batchexecute body with the Google backend's decoder and compare it with its translation."""
+    from scrapper_google_translate import decode_translation_response
+
+    path = FIXTURES_FOLDER / "google_batchexecute.json"
+    if not path.exists():
+        return {"checked": 0, "mismatches": 0}
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+
+    mismatches = [
+        (entry, decoded) for entry in entries
+        if (decoded := decode_translation_response(entry["body"])) != entry["translation"]
+    ]
+    for entry, decoded in mismatches:
+        print(f"Fixture mismatch for [{entry['sl']} → {entry['tl']}] {entry['source'][:40]!r}: decoded {decoded!r}, expected {entry['translation']!r}", file=sys.stderr)
+    return {"checked": len(entries), "mismatches": len(mismatches)}
+
+
+def read_process_tree(root_pid: int) -> Dict[int, str]:
+    """{pid: command name} of every descendant of root_pid, read from /proc."""
+    children: Dict[int, List[int]] = {}
+    names: Dict[int, str] = {}
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry.name}/stat", "r") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # the command name is parenthesised and may contain spaces
+        name = stat[stat.index("(") + 1:stat.rindex(")")]
+        ppid = int(stat[stat.rindex(")") + 2:].split()[1])
+        names[int(entry.name)] = name
+        children.setdefault(ppid, []).append(int(entry.name))
+
+    descendants: Dict[int, str] = {}
+    stack = list(children.get(root_pid, []))
+    while stack:
+        pid = stack.pop()
+        descendants[pid] = names[pid]
+        stack.extend(children.get(pid, []))
+    return descendants
+
+
+def read_rss_kb(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+class RssSampler(threading.Thread):
+    """
+    Samples the RSS of the browser processes (and of the Playwright drivers) started by this
+    process. RSS counts shared pages once per process, so the sums are an upper bound.
+    """
+
+    def __init__(self, interval: float = 1.0):
+        super().__init__(name="rss_sampler", daemon=True)
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.samples: List[Dict[str, int]] = []
+
+    def run(self) -> None:
+        if not os.path.isdir("/proc"):
+            return
+        while not self.stop_event.is_set():
+            browser_kb = driver_kb = 0
+            for pid, name in read_process_tree(os.getpid()).items():
+                if "chrom" in name.lower() or "headless" in name.lower():
+                    browser_kb += read_rss_kb(pid)
+                else:
+                    driver_kb += read_rss_kb(pid)
+            self.samples.append({"browser_kb": browser_kb, "driver_kb": driver_kb, "python_kb": read_rss_kb(os.getpid())})
+            self.stop_event.wait(self.interval)
+
+    def stop(self) -> None:
+        self.stop_event.set()
+        self.join()
+
+    def get_stats(self) -> Dict[str, Optional[float]]:
+        if not self.samples:
+            return {}
+        stats = {}
+        for key in ("browser_kb", "driver_kb", "python_kb"):
+            values = [sample[key] for sample in self.samples]
+            label = key.removesuffix("_kb")
+            stats[f"{label}_peak_mb"] = max(values) / 1024
+            stats[f"{label}_mean_mb"] = sum(values) / len(values) / 1024
+        return stats
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark translator_maitre against the local mock site")
+    add_server_arguments(parser)
+    parser.set_defaults(port=0)
+    parser.add_argument("--sentences", type=int, default=600, help="Synthetic sentences seeded in the ledger")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--backends", nargs="+", default=["google_translate"], choices=list(CONFIG["backends"]))
+    parser.add_argument("--workdir", default=None, help="Scratch folder for the ledger, cache and outputs (default: a new temp folder)")
+    parser.add_argument("--human-delays", action="store_true", help="Keep the configured pacing and human-simulation delays")
+    parser.add_argument("--target-languages", nargs="+", default=None, help="Fan every input out to these target languages (CONFIG['target_languages'])")
+    parser.add_argument("--capture-network", action="store_true", help="Decode Google translations from the batchexecute responses (CONFIG['google_capture_network'])")
+    args = parser.parse_args(argv)
+
+    server = start_server(args.host, args.port, **get_server_settings(args))
+    configure(server.url, args.backends, args.human_delays, args.target_languages, args.capture_network)
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix="mock_benchmark_")).resolve()
+    workdir.mkdir(parents=True, exist_ok=True)
+    os.chdir(workdir)
+
+    from logger import translation_logger
+    import translator_maitre as maitre
+
+    logger = translation_logger.get_logger()
+    logger.info(f"Benchmark | mock site {server.url}, scratch folder {workdir}")
+
+    fixtures = check_recorded_responses() if args.capture_network else None
+    if fixtures is not None:
+        logger.info(f"Benchmark | decoded {fixtures['checked']} recorded batchexecute responses, {fixtures['mismatches']} mismatches")
+        if fixtures["mismatches"]:
+            server.shutdown()
+            raise SystemExit("The batchexecute decoder doesn't match the recorded fixtures")
+
+    maitre.ledger.seed(make_pairs(args.sentences))
+    claimable = maitre.ledger.count_claimable()
+    total_of_batches = -(-claimable // CONFIG["batch_size"]) + 1
+    maitre.scheduler.set_max_workers(min(args.workers, total_of_batches))
+    logger.info(f"Benchmark | {claimable:,} sentences, {maitre.scheduler.max_workers} workers, backends {args.backends}")
+
+    sampler = RssSampler()
+    sampler.start()
+    start_time = time.perf_counter()
+    sink = maitre.run_workers(total_of_batches, maitre.get_columns())
+    elapsed = time.perf_counter() - start_time
+    sampler.stop()
+    maitre.ledger.recover_in_flight()
+
+    counts = maitre.ledger.counts()
+    report = {
+        "sentences": claimable,
+        "workers": maitre.scheduler.max_workers,
+        "elapsed_s": elapsed,
+        "sentences_per_s": counts[maitre.DONE] / elapsed if elapsed else 0.0,
+        "ledger": counts,
+        "sink": sink.get_stats(),
+        "chunk_latency_s": maitre.request_latencies.get_stats(),
+        "rss": sampler.get_stats(),
+        "chunk_planner": {"shared": maitre.chunk_planner.get_stats(), **{name: planner.get_stats() for name, planner in maitre.chunk_planners.items()}},
+        "retry_queue": maitre.retry_queue.get_stats(),
+        "circuit_breakers": maitre.scheduler.breakers.get_stats(),
+        "hangs": maitre.watchdog.get_hangs(),
+        "mock_site": server.get_stats(),
+        "fixtures": fixtures,
+        "settings": {**get_server_settings(args), "human_delays": args.human_delays, "capture_network": args.capture_network, "backends": args.backends, "target_languages": args.target_languages},
+    }
+    server.shutdown()
+
+    report_path = workdir / "benchmark_report.json"
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, default=str)
+
+    logger.info(f"Benchmark | {report['sentences_per_s']:.2f} sentences/s over {elapsed:.1f}s, ledger {counts}")
+    for backend, latency in report["chunk_latency_s"].items():
+        logger.info(f"Benchmark | {backend} chunk latency p50 {latency['p50']:.2f}s, p95 {latency['p95']:.2f}s over {latency['count']} chunks")
+    if report["rss"]:
+        logger.info(f"Benchmark | browser RSS peak {report['rss']['browser_peak_mb']:.0f} MB, mean {report['rss']['browser_mean_mb']:.0f} MB")
+    logger.info(f"Benchmark | report written to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+import argparse
+import io
+import json
+import random
+import re
+import threading
+import time
+import zipfile
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+from xml.etree import ElementTree
+'''
+Local stand-in for the translation sites, reproducing the DOM contract the scrapers depend on:
+    /?sl=..&tl=..&op=translate   Google Translate (textarea, span[jsname='jqKxS'], language menus, sl/tl params)
+    /?sl=..&tl=..&op=docs        Google Translate documents (file input, Translate, Download translation)
+    /en/translator               DeepL (contenteditable source/target, result toolbar)
+    /corpus/?locale=en           Korpus Kernewek (search box, tr.even/tr.odd result rows, pager past 25 rows)
+The Google page talks to the batchexecute endpoint in the site's own wire format (recorded exchanges in
+fixtures/ are replayed verbatim), the others to /api/*. Latency and failures are injected there.
+Usage: python -m mock_site.server --port 8765 --latency-ms 300 800 --failure-rate 0.05
+'''
+
+PAGES_FOLDER = Path(__file__).parent / "pages"
+FIXTURES_FOLDER = Path(__file__).parent / "fixtures"
+
+BATCHEXECUTE_PATH = "/_/TranslateWebserverUi/data/batchexecute"
+TRANSLATION_RPC_ID = "MkEWBc"
+COMPACT = (",", ":")
+
+# must match translator_maitre.MERGE_SYMBOL, merged chunks are translated segment by segment
+MERGE_SYMBOL = "<|||>"
+
+LANGUAGES = {
+    "fr": "French", "en": "English", "br": "Breton", "kw": "Cornish", "cy": "Welsh", "ga": "Irish",
+    "es": "Spanish", "de": "German", "it": "Italian", "pt": "Portuguese", "nl": "Dutch",
+}
+
+DOCUMENTS_PATH = "/api/documents/translate"
+CORPUS_PAGE_SIZE = 25
+WORD_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+LINE_ID_PATTERN = re.compile(r"^(\s*\[\[\s*\d+\s*\]\]\s*)(.*)$", re.S)
+
+ROUTES = {
+    "/": "google_translate.html",
+    "/en/translator": "deepl.html",
+    "/corpus/": "korpus_kernewek.html",
+}
+
+
+def mock_translate(text: str, sl: str, tl: str) -> str:
+    """Deterministic fake translation that keeps the merge separators of a chunk in place."""
+    segments = [segment.strip() for segment in text.split(MERGE_SYMBOL)]
+    return f" {MERGE_SYMBOL} ".join(f"{tl}: {segment}" if segment else segment for segment in segments)
+
+
+def encode_batchexecute(source: str, sl: str, tl: str, translation: str) -> str:
+    """Response body of a MkEWBc call, in the length-prefixed batchexecute envelope."""
+    length = len(source)
+    payload = [
+        [None, None, sl, [[[0, [[[None, length]], [True]]]], length], [[source, None, None, length]], None, [source, sl, tl, True]],
+        [[[None, None, None, None, None, [[translation, None, None, None, [[translation, [5]]]]]]], tl, 1, sl, [source, sl, tl, True]],
+        sl,
+    ]
+    envelope = json.dumps([
+        ["wrb.fr", TRANSLATION_RPC_ID, json.dumps(payload, ensure_ascii=False, separators=COMPACT), None, None, None, "generic"],
+        ["di", random.randint(20, 90)],
+        ["af.httprm", random.randint(20, 90), str(random.randint(-2**62, 2**62)), 12],
+    ], ensure_ascii=False, separators=COMPACT)
+    trailer = json.dumps([["e", 4, None, None, len(envelope) + 60]], separators=COMPACT)
+    return f")]}}'\n\n{len(envelope)}\n{envelope}\n{len(trailer)}\n{trailer}\n"
+
+
+def decode_batchexecute_request(body: str) -> Tuple[str, str, str]:
+    """(text, sl, tl) from the f.req form field of a MkEWBc call."""
+    f_req = json.loads(parse_qs(body).get("f.req", ["[]"])[0])
+    for rpc_id, arguments, *_ in f_req[0]:
+        if rpc_id == TRANSLATION_RPC_ID:
+            (text, sl, tl, *_), *_ = json.loads(arguments)
+            return text, sl, tl
+    raise ValueError("No MkEWBc call in f.req")
+
+
+def load_recorded_responses() -> Dict[Tuple[str, str, str], str]:
+    """{(source, sl, tl): body} of the recorded batchexecute exchanges."""
+    path = FIXTURES_FOLDER / "google_batchexecute.json"
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return {(entry["source"], entry["sl"], entry["tl"]): entry["body"] for entry in json.load(f)}
+
+
+def translate_document_line(line: str, sl: str, tl: str) -> str:
+    """Like the real site, a leading [[n]] line id goes through untouched."""
+    match = LINE_ID_PATTERN.match(line)
+    if match is None:
+        return mock_translate(line, sl, tl) if line.strip() else line
+    return match.group(1) + mock_translate(match.group(2), sl, tl)
+
+
+def translate_document(content: bytes, filename: str, sl: str, tl: str) -> bytes:
+    """Translate a .txt file line by line, or every paragraph of a .docx file in place."""
+    if filename.endswith(".txt"):
+        lines = content.decode("utf-8-sig").splitlines()
+        return ("\n".join(translate_document_line(line, sl, tl) for line in lines) + "\n").encode("utf-8")
+    if not filename.endswith(".docx"):
+        raise ValueError(f"Unsupported document: {filename}")
+
+    ElementTree.register_namespace("w", WORD_NAMESPACE)
+    source = zipfile.ZipFile(io.BytesIO(content))
+    root = ElementTree.fromstring(source.read("word/document.xml"))
+    for paragraph in root.iter(f"{{{WORD_NAMESPACE}}}p"):
+        texts = list(paragraph.iter(f"{{{WORD_NAMESPACE}}}t"))
+        if texts:
+            texts[0].text = translate_document_line("".join(text.text or "" for text in texts), sl, tl)
+            for text in texts[1:]:
+                text.text = ""
+
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as translated:
+        for item in source.infolist():
+            data = source.read(item.filename)
+            if item.filename == "word/document.xml":
+                data = ElementTree.tostring(root, encoding="utf-8", xml_declaration=True)
+            translated.writestr(item, data)
+    return output.getvalue()
+
+
+def mock_corpus_rows(term: str, rows: Optional[int] = None) -> List[Tuple[str, str]]:
+    """Example rows for a term; without a count, 1 to 60 rows derived from the term so some searches paginate."""
+    if rows is None:
+        rows = 1 + sum(map(ord, term)) % 60
+    return [(f"the {term} example {i}", f"an {term} ensampel {i}") for i in range(1, rows + 1)]
+
+
+class MockSiteServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server with the injection knobs shared by every request:
+    latency_range   seconds added to each translation or search call, drawn uniformly
+    failure_rate    fraction of those calls answered with a 503 (the page shows an error, no output)
+    mismatch_rate   fraction of merged translations that lose one separator
+    not_found_rate  fraction of corpus searches without any result
+    stale_output    keep the previous translation on screen until the next one arrives
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        latency_range: Tuple[float, float] = (0.3, 0.8),
+        failure_rate: float = 0.0,
+        mismatch_rate: float = 0.0,
+        not_found_rate: float = 0.0,
+        stale_output: bool = False,
+    ):
+        super().__init__(address, MockSiteHandler)
+        self.latency_range = latency_range
+        self.failure_rate = failure_rate
+        self.mismatch_rate = mismatch_rate
+        self.not_found_rate = not_found_rate
+        self.stale_output = stale_output
+        self.recorded_responses = load_recorded_responses()
+
+        self.stats_lock = threading.Lock()
+        self.stats: Dict[str, int] = {"pages": 0, "translations": 0, "replayed": 0, "documents": 0, "searches": 0, "failures": 0, "mismatches": 0}
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, key: str) -> None:
+        with self.stats_lock:
+            self.stats[key] += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        with self.stats_lock:
+            return dict(self.stats)
+
+
+class MockSiteHandler(BaseHTTPRequestHandler):
+    server: MockSiteServer
+
+    def log_message(self, format, *args) -> None:
+        # the benchmark runs thousands of requests, keep stderr quiet
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: Dict) -> None:
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8")
+
+    def _inject(self) -> bool:
+        """Sleep the configured latency; returns True when this call should fail."""
+        time.sleep(random.uniform(*self.server.latency_range))
+        if random.random() < self.server.failure_rate:
+            self.server.count("failures")
+            self._send_json(503, {"error": "Translation error"})
+            return True
+        return False
+
+    def _read_bytes(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def _read_body(self) -> str:
+        return self._read_bytes().decode("utf-8")
+
+    def _read_json(self) -> Dict:
+        return json.loads(self._read_body() or "{}")
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        path = url.path
+        page = ROUTES.get(path)
+        if path == "/" and parse_qs(url.query).get("op") == ["docs"]:
+            page = "google_translate_docs.html"
+        if page is None:
+            self._send(404, b"Not found", "text/plain; charset=utf-8")
+            return
+        self.server.count("pages")
+        settings = {"languages": LANGUAGES, "staleOutput": self.server.stale_output}
+        html = (PAGES_FOLDER / page).read_text(encoding="utf-8").replace("/*MOCK_SETTINGS*/{}", json.dumps(settings))
+        self._send(200, html.encode("utf-8"), "text/html; charset=utf-8")
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        path = url.path
+        if path == BATCHEXECUTE_PATH:
+            self._batchexecute(self._read_body())
+        elif path == DOCUMENTS_PATH:
+            self._translate_document(self._read_bytes(), parse_qs(url.query))
+        elif path == "/api/translate":
+            self._translate(self._read_json())
+        elif path == "/api/corpus":
+            self._search(self._read_json())
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def _get_translation(self, text: str, sl: str, tl: str) -> str:
+        self.server.count("translations")
+        translation = mock_translate(text, sl, tl)
+        separator = f" {MERGE_SYMBOL} "
+        if separator in translation and random.random() < self.server.mismatch_rate:
+            self.server.count("mismatches")
+            translation = translation.replace(separator, " ", 1)
+        return translation
+
+    def _translate(self, payload: Dict) -> None:
+        if self._inject():
+            return
+        self._send_json(200, {"translation": self._get_translation(payload.get("text", ""), payload.get("sl", ""), payload.get("tl", ""))})
+
+    def _batchexecute(self, body: str) -> None:
+        try:
+            text, sl, tl = decode_batchexecute_request(body)
+        except (ValueError, KeyError, IndexError, TypeError):
+            self._send_json(400, {"error": "Bad request"})
+            return
+        if self._inject():
+            return
+        recorded = self.server.recorded_responses.get((text, sl, tl))
+        if recorded is not None:
+            self.server.count("replayed")
+            response = recorded
+        else:
+            response = encode_batchexecute(text, sl, tl, self._get_translation(text, sl, tl))
+        self._send(200, response.encode("utf-8"), "application/json; charset=utf-8")
+
+    def _translate_document(self, content: bytes, query: Dict[str, List[str]]) -> None:
+        filename, sl, tl = (query.get(key, [""])[0] for key in ("name", "sl", "tl"))
+        if self._inject():
+            return
+        try:
+            translated = translate_document(content, filename, sl, tl)
+        except (ValueError, KeyError, zipfile.BadZipFile, ElementTree.ParseError) as e:
+            self._send_json(400, {"error": f"Can't translate this document: {e}"})
+            return
+        self.server.count("documents")
+        self._send(200, translated, "application/octet-stream")
+
+    def _search(self, payload: Dict) -> None:
+        if self._inject():
+            return
+        self.server.count("searches")
+        term = payload.get("term", "").strip()
+        rows = [] if not term or random.random() < self.server.not_found_rate else mock_corpus_rows(term)
+        start = max(0, int(payload.get("start", 0)))
+        self._send_json(200, {"rows": rows[start:start + CORPUS_PAGE_SIZE], "start": start, "total": len(rows)})
+
+
+def start_server(host: str = "127.0.0.1", port: int = 0, **settings) -> MockSiteServer:
+    """Serve the mock site from a daemon thread; port 0 picks a free port (see server.url)."""
+    server = MockSiteServer((host, port), **settings)
+    threading.Thread(target=server.serve_forever, name="mock_site", daemon=True).start()
+    return server
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, nargs=2, default=(300, 800), metavar=("MIN", "MAX"))
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--mismatch-rate", type=float, default=0.0)
+    parser.add_argument("--not-found-rate", type=float, default=0.0)
+    parser.add_argument("--stale-output", action="store_true")
+
+
+def get_server_settings(args: argparse.Namespace) -> Dict:
+    return {
+        "latency_range": (args.latency_ms[0] / 1000, args.latency_ms[1] / 1000),
+        "failure_rate": args.failure_rate,
+        "mismatch_rate": args.mismatch_rate,
+        "not_found_rate": args.not_found_rate,
+        "stale_output": args.stale_output,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Serve the mock translation sites")
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = MockSiteServer((args.host, args.port), **get_server_settings(args))
+    print(f"Mock site on {server.url} (set CONFIG['mock_site_url'] to use it)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Served: {server.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
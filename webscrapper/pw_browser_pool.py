@@ -0,0 +1,165 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+from playwright.sync_api import sync_playwright, Browser, BrowserContext, Playwright
+
+from constants.output import LOG_FILENAME, OUTPUT_FOLDER
+from logger import translation_logger
+from pw_context import launch_browser, new_browser_context
+from scrapper_config import CONFIG
+
+logger = translation_logger.get_logger(
+    output_folder=OUTPUT_FOLDER,
+    log_filename=LOG_FILENAME
+)
+
+
+class _WorkerBrowser:
+    """Playwright driver and browser owned by a single worker thread."""
+
+    def __init__(self):
+        self.playwright_manager = None
+        self.playwright: Optional[Playwright] = None
+        self.browser: Optional[Browser] = None
+        self.batches_served = 0
+
+
+class BrowserPool:
+    """
+    Keeps one long-lived Playwright driver and Chromium per worker thread and hands out
+    a fresh BrowserContext per batch. The sync API is bound to the thread that started it,
+    so browsers are never shared between workers, only reused across their batches.
+    """
+
+    def __init__(self, headless: bool = True, max_batches_per_browser: int = CONFIG["browser_recycle_after_batches"]):
+        self.headless = headless
+        self.max_batches_per_browser = max_batches_per_browser
+        self._local = threading.local()
+
+        self.stats_lock = threading.Lock()
+        self.launches = 0
+        self.reuses = 0
+        self.recycles = 0
+        self.recoveries = 0
+        self.total_launch_time = 0.0
+
+    def _get_worker_browser(self) -> _WorkerBrowser:
+        worker_browser = getattr(self._local, "worker_browser", None)
+        if worker_browser is None:
+            worker_browser = _WorkerBrowser()
+            self._local.worker_browser = worker_browser
+        return worker_browser
+
+    def _launch(self, worker_browser: _WorkerBrowser, headless: bool, msg_prefix: str = '') -> None:
+        start_time = time.perf_counter()
+        if worker_browser.playwright is None:
+            worker_browser.playwright_manager = sync_playwright()
+            worker_browser.playwright = worker_browser.playwright_manager.start()
+        worker_browser.browser = launch_browser(playwright=worker_browser.playwright, headless=headless)
+        worker_browser.batches_served = 0
+        launch_time = time.perf_counter() - start_time
+
+        with self.stats_lock:
+            self.launches += 1
+            self.total_launch_time += launch_time
+        logger.info(f"{msg_prefix} Launched pooled browser in {launch_time:.2f}s")
+
+    def _close_browser(self, worker_browser: _WorkerBrowser, msg_prefix: str = '') -> None:
+        if worker_browser.browser is None:
+            return
+        try:
+            worker_browser.browser.close()
+        except Exception as e:
+            logger.warning(f"{msg_prefix} Failed to close pooled browser: {e}")
+        worker_browser.browser = None
+
+    @contextmanager
+    def new_context(
+        self,
+        headless: Optional[bool] = None,
+        useProxy: bool = False,
+        msg_prefix: str = '',
+        storage_state: Optional[Dict[str, Any]] = None) -> Iterator[BrowserContext]:
+        """
+        Yield a fresh BrowserContext from this worker's browser, launching it on first use
+        and recycling it once it has served max_batches_per_browser batches (or crashed).
+        storage_state restores the cookies and local storage of a previous context.
+        """
+        worker_browser = self._get_worker_browser()
+        headless = self.headless if headless is None else headless
+
+        if worker_browser.browser is not None and (
+            worker_browser.batches_served >= self.max_batches_per_browser
+            or not worker_browser.browser.is_connected()
+        ):
+            logger.info(f"{msg_prefix} Recycling browser after {worker_browser.batches_served} batches")
+            self._close_browser(worker_browser, msg_prefix)
+            with self.stats_lock:
+                self.recycles += 1
+
+        if worker_browser.browser is None:
+            self._launch(worker_browser, headless=headless, msg_prefix=msg_prefix)
+        else:
+            with self.stats_lock:
+                self.reuses += 1
+            logger.debug(f"{msg_prefix} Reusing pooled browser ({worker_browser.batches_served} batches served)")
+
+        context = new_browser_context(browser=worker_browser.browser, useProxy=useProxy, msg_prefix=msg_prefix, storage_state=storage_state)
+        try:
+            yield context
+        finally:
+            worker_browser.batches_served += 1
+            try:
+                context.close()
+            except Exception as e:
+                logger.warning(f"{msg_prefix} Failed to close context: {e}")
+
+    def discard_browser(self, msg_prefix: str = '') -> None:
+        """Close the calling thread's browser (e.g. after a hung page) so its next batch gets a new one."""
+        worker_browser = getattr(self._local, "worker_browser", None)
+        if worker_browser is None or worker_browser.browser is None:
+            return
+        logger.warning(f"{msg_prefix} Discarding browser after {worker_browser.batches_served} batches")
+        self._close_browser(worker_browser, msg_prefix)
+        with self.stats_lock:
+            self.recycles += 1
+
+    def record_recovery(self) -> None:
+        """Count a crashed page rebuilt by a PageSession."""
+        with self.stats_lock:
+            self.recoveries += 1
+
+    def close_worker(self, msg_prefix: str = '') -> None:
+        """Close the browser and driver owned by the calling thread. Call before the worker exits."""
+        worker_browser = getattr(self._local, "worker_browser", None)
+        if worker_browser is None:
+            return
+        self._close_browser(worker_browser, msg_prefix)
+        if worker_browser.playwright_manager is not None:
+            try:
+                worker_browser.playwright_manager.stop()
+            except Exception as e:
+                logger.warning(f"{msg_prefix} Failed to stop Playwright driver: {e}")
+        self._local.worker_browser = None
+
+    def get_stats(self) -> Dict[str, float]:
+        """Launch/reuse counters and the estimated startup time saved by reusing browsers."""
+        with self.stats_lock:
+            average_launch_time = self.total_launch_time / self.launches if self.launches else 0.0
+            return {
+                "launches": self.launches,
+                "reuses": self.reuses,
+                "recycles": self.recycles,
+                "recoveries": self.recoveries,
+                "average_launch_time": average_launch_time,
+                "startup_time_saved": average_launch_time * self.reuses,
+            }
+
+    def log_stats(self, msg: str = '') -> None:
+        stats = self.get_stats()
+        logger.info(
+            f"{msg} Browser pool: {stats['launches']} launches, {stats['reuses']} reuses, "
+            f"{stats['recycles']} recycles, {stats['recoveries']} crash recoveries | avg launch {stats['average_launch_time']:.2f}s | "
+            f"startup time saved ~{stats['startup_time_saved']:.1f}s"
+        )
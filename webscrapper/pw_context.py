@@ -1,5 +1,5 @@
 import random
-from typing import Tuple
+from typing import Any, Dict, Optional, Tuple
 from playwright.sync_api import Playwright, Browser, BrowserContext
 from constants.output import LOG_FILENAME, OUTPUT_FOLDER
 from pw_proxies import get_proxy
@@ -12,15 +12,16 @@ logger = translation_logger.get_logger(
 )
 locales = ["en-US", "en-GB", "en-CA", "en-AU", "en-NZ", "en-IE"]
 
-def get_new_context(playwright: Playwright, headless: bool = False, useProxy: bool = False, msg_prefix: str = '') -> Tuple[Browser, BrowserContext]:
+def launch_browser(playwright: Playwright, headless: bool = False) -> Browser:
     args = [] if random.random() < 0.6 else ['--mute-audio']
-  
+    return playwright.chromium.launch(headless=headless, args=args)  # Set to True for headless mode
+
+def new_browser_context(browser: Browser, useProxy: bool = False, msg_prefix: str = '', storage_state: Optional[Dict[str, Any]] = None) -> BrowserContext:
     random_locale = random.choice(locales)
-    browser = playwright.chromium.launch(headless=headless, args=args)  # Set to True for headless mode
       
     proxy = get_proxy() if useProxy else None
     logger.info(f"{msg_prefix} Proxy: {proxy['server'] if proxy else 'None'}")
-    return browser, browser.new_context(
+    return browser.new_context(
         user_agent=random.choice(USER_AGENTS),
         extra_http_headers={
             "Accept-Language": "en-US,en;q=0.9",
@@ -32,10 +33,15 @@ def get_new_context(playwright: Playwright, headless: bool = False, useProxy: bo
         },
         proxy=proxy,
         locale=random_locale,
+        storage_state=storage_state,
         java_script_enabled=True,
         viewport={
             'width': random.randint(1366, 1920),
             'height': random.randint(768, 1080)
         },
     )
-    
\ No newline at end of file
+
+def get_new_context(playwright: Playwright, headless: bool = False, useProxy: bool = False, msg_prefix: str = '') -> Tuple[Browser, BrowserContext]:
+    browser = launch_browser(playwright=playwright, headless=headless)
+    return browser, new_browser_context(browser=browser, useProxy=useProxy, msg_prefix=msg_prefix)
+    
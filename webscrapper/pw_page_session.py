@@ -0,0 +1,154 @@
+from contextlib import ExitStack
+from typing import Any, Dict, Optional
+from playwright.sync_api import BrowserContext, Page
+
+from constants.output import LOG_FILENAME, OUTPUT_FOLDER
+from exceptions.page_crashed_exception import PageCrashedException
+from logger import translation_logger
+from pw_browser_pool import BrowserPool
+from scrapper_config import CONFIG
+from utils.deadline import cap_timeout_ms
+from utils.pw_helper import apply_deadline_timeouts, handle_cookies_request, perform_action
+'''
+The page a batch runs on. When Chromium crashes or the page, its context or the browser gets closed
+under it, every later call fails with "Target closed"; PageSession.recover() rebuilds the context
+(relaunching the pooled browser if it died) and the page, restores the cookies and local storage
+saved after the last successful chunk and navigates back to the same URL, so the batch resumes
+from the chunk that failed.
+'''
+
+logger = translation_logger.get_logger(
+    output_folder=OUTPUT_FOLDER,
+    log_filename=LOG_FILENAME
+)
+
+STEALTH_INIT_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {get: () => false});
+    window.chrome = { runtime: {}, app: {}, LoadTimes: function(){} };
+    Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
+    Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
+"""
+
+# Playwright error messages once the page, its context or the browser is gone
+CRASH_MARKERS = (
+    "target closed",
+    "target crashed",
+    "page crashed",
+    "has been closed",
+    "browser closed",
+    "connection closed",
+)
+
+
+def is_page_crash(page: Page, error: BaseException) -> bool:
+    """Whether error comes from a dead page rather than from the site."""
+    if isinstance(error, PageCrashedException):
+        return True
+    message = str(error).lower()
+    if any(marker in message for marker in CRASH_MARKERS):
+        return True
+    try:
+        return page.is_closed()
+    except Exception:
+        return True
+
+
+class PageSession:
+    """
+    Context and page of one batch, taken from the worker's BrowserPool and rebuilt on a crash
+    at most max_recoveries times. Use as a context manager: the page is ready on enter.
+    """
+
+    def __init__(
+        self,
+        browser_pool: BrowserPool,
+        url: str,
+        headless: Optional[bool] = None,
+        msg_prefix: str = '',
+        max_recoveries: int = CONFIG["page_max_recoveries"],
+    ):
+        self.browser_pool = browser_pool
+        self.url = url
+        self.headless = headless
+        self.msg_prefix = msg_prefix
+        self.max_recoveries = max_recoveries
+
+        self.context: Optional[BrowserContext] = None
+        self.page: Optional[Page] = None
+        self.storage_state: Optional[Dict[str, Any]] = None
+        self.recoveries = 0
+        self.crash_reason: Optional[str] = None
+        self._stack: Optional[ExitStack] = None
+        self._closing = False
+
+    def __enter__(self) -> "PageSession":
+        self._open()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self._close()
+
+    def _on_crash(self, reason: str) -> None:
+        if not self._closing and self.crash_reason is None:
+            self.crash_reason = reason
+            logger.error(f"{self.msg_prefix} {reason.capitalize()}")
+
+    def _open(self) -> None:
+        self._closing = False
+        self.crash_reason = None
+        self._stack = ExitStack()
+        try:
+            self.context = self._stack.enter_context(self.browser_pool.new_context(
+                headless=self.headless, msg_prefix=self.msg_prefix, storage_state=self.storage_state
+            ))
+            self.context.on("close", lambda _: self._on_crash("browser context closed"))
+            self.page = self.context.new_page()
+            self.page.on("crash", lambda _: self._on_crash("page crashed"))
+            self.page.on("close", lambda _: self._on_crash("page closed"))
+            self.page.add_init_script(STEALTH_INIT_SCRIPT)
+            apply_deadline_timeouts(self.page)
+
+            perform_action(
+                lambda: self.page.goto(self.url, timeout=cap_timeout_ms(CONFIG["page_timeout_ms"])),
+                f"{self.msg_prefix} goto",
+                raise_exception=self.recoveries > 0,
+                msg=self.msg_prefix
+            )
+            # restored cookies already carry the consent, waiting for a banner would only cost time
+            if self.storage_state is None:
+                handle_cookies_request(page=self.page, batch_msg=self.msg_prefix)
+        except BaseException:
+            self._close()
+            raise
+
+    def _close(self) -> None:
+        self._closing = True
+        if self._stack is not None:
+            self._stack.close()
+            self._stack = None
+
+    def save_state(self) -> None:
+        """Remember the cookies, local storage and URL of a page that just translated a chunk."""
+        try:
+            self.storage_state = self.context.storage_state()
+            self.url = self.page.url
+        except Exception as e:
+            logger.debug(f"{self.msg_prefix} Couldn't save the page state: {e}")
+
+    def is_crash(self, error: BaseException) -> bool:
+        return self.crash_reason is not None or is_page_crash(self.page, error)
+
+    def recover(self, error: Optional[BaseException] = None, msg: str = '') -> Page:
+        """Rebuild the context and page on the last saved state; raises PageCrashedException once out of recoveries."""
+        msg = msg or self.msg_prefix
+        reason = self.crash_reason or str(error) or "page unusable"
+        if self.recoveries >= self.max_recoveries:
+            raise PageCrashedException(reason, self.recoveries, message=f"{msg} Page crashed too often") from error
+
+        self.recoveries += 1
+        logger.warning(f"{msg} Rebuilding the page after: {reason[:200]} (recovery {self.recoveries}/{self.max_recoveries})")
+        self._close()
+        self._open()
+        self.browser_pool.record_recovery()
+        logger.info(f"{msg} Page rebuilt on {self.url}")
+        return self.page
@@ -0,0 +1,163 @@
+import importlib
+import threading
+
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse, urlunparse
+
+from constants.languages import SL, TL
+from constants.output import LOG_FILENAME, OUTPUT_FOLDER
+from scrapper_config import CONFIG
+from utils.translation_cache import TranslationCache
+
+from logger import translation_logger
+'''
+Registry of the translation backends. A backend is a scrapper_*.py module implementing the shared
+contract get_url(sl, tl) and translate_sentence(page, sentence, batch_idx), and optionally
+translate_batch(page, sentences, batch_idx) returning one translation per sentence (None for a sentence it lost)
+and translate_targets(page, sentence, batch_idx, target_languages) returning {language: translation} for one input.
+Each backend's module, worker limit and request pacing are declared in CONFIG["backends"].
+With CONFIG["mock_site_url"] set, every backend is pointed at the local mock site (mock_site/).
+'''
+
+logger = translation_logger.get_logger(
+    output_folder=OUTPUT_FOLDER,
+    log_filename=LOG_FILENAME
+)
+
+IntervalRange = Tuple[float, float]
+
+
+class Backend:
+    """One translation site: its contract functions plus the budget it runs under."""
+
+    def __init__(
+        self,
+        name: str,
+        module: str,
+        max_concurrency: int,
+        interval_range: IntervalRange,
+        request_delay_range: IntervalRange = CONFIG["new_request_delay_range"],
+        batch_size: int = CONFIG["batch_size"],
+        char_budget: int = CONFIG["request_char_budget"],
+        max_sentences: int = CONFIG["sentences_per_request_range"][1],
+        chunk_deadline_s: float = CONFIG["chunk_deadline_s"],
+    ):
+        backend_module = importlib.import_module(module)
+        self.name = name
+        self.module = module
+        self._get_site_url: Callable[[str, str], str] = backend_module.get_url
+        self.translate_sentence: Callable = backend_module.translate_sentence
+        self.translate_batch: Optional[Callable] = getattr(backend_module, "translate_batch", None)
+        self.translate_targets: Optional[Callable] = getattr(backend_module, "translate_targets", None)
+        self.max_concurrency = max_concurrency
+        self.interval_range = interval_range
+        self.request_delay_range = request_delay_range
+        self.batch_size = batch_size
+        self.char_budget = char_budget
+        self.max_sentences = max_sentences
+        self.chunk_deadline_s = chunk_deadline_s
+        # pacing stays keyed on the real site, the mock site serves every backend from one origin
+        self.origin = urlparse(self._get_site_url(SL, TL)).netloc
+
+        self._caches: Dict[str, TranslationCache] = {}
+        self._cache_lock = threading.Lock()
+
+    def get_url(self, sl: str, tl: str) -> str:
+        url = self._get_site_url(sl, tl)
+        if not CONFIG["mock_site_url"]:
+            return url
+        mock_site = urlparse(CONFIG["mock_site_url"])
+        return urlunparse(urlparse(url)._replace(scheme=mock_site.scheme, netloc=mock_site.netloc))
+
+    @property
+    def cache(self) -> TranslationCache:
+        """Translation memory of this backend into TL, created on first use."""
+        return self.get_cache(TL)
+
+    def get_cache(self, target_lang: str) -> TranslationCache:
+        """Translation memory of this backend into target_lang, created on first use."""
+        with self._cache_lock:
+            cache = self._caches.get(target_lang)
+            if cache is None:
+                cache = self._caches[target_lang] = TranslationCache(backend=self.name, target_lang=target_lang)
+            return cache
+
+    def close_caches(self) -> None:
+        """Close the calling thread's connections to every translation memory of this backend."""
+        with self._cache_lock:
+            caches = list(self._caches.values())
+        for cache in caches:
+            cache.close()
+
+    @property
+    def target_languages(self) -> List[str]:
+        """Languages one request translates into: every configured target when the backend can fan out, else TL."""
+        return get_target_languages() if self.translate_targets else [TL]
+
+    def __repr__(self) -> str:
+        return f"Backend({self.name!r}, origin={self.origin!r}, max_concurrency={self.max_concurrency})"
+
+
+_registry: Dict[str, Backend] = {}
+_registry_lock = threading.Lock()
+
+
+def get_backend(name: str) -> Backend:
+    """Build (once) and return the backend declared under CONFIG["backends"][name]."""
+    with _registry_lock:
+        backend = _registry.get(name)
+        if backend is None:
+            settings = CONFIG["backends"].get(name)
+            if settings is None:
+                raise ValueError(f"Unknown backend {name!r}. Declared backends: {', '.join(CONFIG['backends'])}")
+            backend = _registry[name] = Backend(
+                name=name,
+                module=settings["module"],
+                max_concurrency=settings["max_concurrency"],
+                interval_range=settings["interval_range"],
+                request_delay_range=settings.get("request_delay_range", CONFIG["new_request_delay_range"]),
+                batch_size=settings.get("batch_size", CONFIG["batch_size"]),
+                char_budget=settings.get("request_char_budget", CONFIG["request_char_budget"]),
+                max_sentences=settings.get("sentences_per_request", CONFIG["sentences_per_request_range"][1]),
+                chunk_deadline_s=settings.get("chunk_deadline_s", CONFIG["chunk_deadline_s"]),
+            )
+            logger.debug(f"Registered backend {backend}")
+        return backend
+
+
+def get_target_languages() -> List[str]:
+    """CONFIG["target_languages"] with TL first, TL alone when none are configured."""
+    return list(dict.fromkeys([TL, *(CONFIG["target_languages"] or [])]))
+
+
+def get_enabled_backends() -> List[Backend]:
+    backends = [get_backend(name) for name, settings in CONFIG["backends"].items() if settings.get("enabled")]
+    if not backends:
+        raise ValueError("No backend is enabled in CONFIG['backends']")
+    return backends
+
+
+def get_origin_interval_ranges(backends: List[Backend]) -> Dict[str, IntervalRange]:
+    """Per-origin pacing for the rate limiter, configured origins first and each backend's own on top."""
+    interval_ranges = dict(CONFIG["origin_interval_ranges"])
+    interval_ranges.update({backend.origin: backend.interval_range for backend in backends})
+    return interval_ranges
+
+
+def assign_workers(backends: List[Backend], worker_count: int) -> List[Backend]:
+    """
+    Bind worker slots to backends round-robin, never giving a backend more workers than its
+    max_concurrency. Returns one backend per worker; fewer than worker_count if the caps run out.
+    """
+    assigned: List[Backend] = []
+    counts = {backend.name: 0 for backend in backends}
+    while len(assigned) < worker_count:
+        available = [backend for backend in backends if counts[backend.name] < backend.max_concurrency]
+        if not available:
+            break
+        for backend in available:
+            if len(assigned) == worker_count:
+                break
+            assigned.append(backend)
+            counts[backend.name] += 1
+    return assigned
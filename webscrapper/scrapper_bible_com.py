@@ -7,7 +7,7 @@ from playwright.sync_api import sync_playwright, Page
 # Import the singleton logger
 from constants.bibles import DEFAULT, FASTER, SLOWER
 from logger import translation_logger
-from utils.pw_helper import get_random_delay, perform_action, take_screenshot
+from utils.pw_helper import get_random_delay, perform_action
 from pw_user_sim import simulate_human
 from exceptions.not_found_exception import NotFoundException
 
@@ -28,6 +28,31 @@ SAFE_CLICK_SELECTORS = [
 ]
 
 
+VERSE_SELECTOR = '[class*="ChapterContent_verse"]'
+LABEL_SELECTOR = '[class*="ChapterContent_label"]'
+CONTENT_SELECTOR = '[class*="ChapterContent_content"]'
+NOTE_SELECTOR = '[class*="ChapterContent_note"]'
+
+# Every verse container in document order as {label, contents, note}: the text of its first label when
+# visible, the text of each content fragment and whether it shows a note. Returns null until the
+# containers are attached, so it also serves as the wait_for_function predicate.
+READ_VERSES_JS = """
+([verseSelector, labelSelector, contentSelector, noteSelector]) => {
+    const isVisible = (node) => Boolean(node) && node.getClientRects().length > 0 && getComputedStyle(node).visibility !== "hidden";
+    const verses = document.querySelectorAll(verseSelector);
+    if (!verses.length) return null;
+    return Array.from(verses, (verse) => {
+        const label = verse.querySelector(labelSelector);
+        return {
+            label: isVisible(label) ? label.innerText.trim() : null,
+            contents: Array.from(verse.querySelectorAll(contentSelector), (content) => content.innerText),
+            note: isVisible(verse.querySelector(noteSelector)),
+        };
+    });
+}
+"""
+
+
 def get_url(version_id: str, abbrev: str, chapter: int, suffix: str) -> str:
     if version_id == None or abbrev == None or chapter == None or suffix == None:
         raise f"Can't generate a link. version_id: {version_id}, abbrev: {abbrev}, chapter: {chapter}, suffix: {suffix}."
@@ -78,60 +103,44 @@ def fetch_chapter(page: Page, full_name: str, url: str, chapter: int, total_of_c
 
 def extract_verses(page: Page, msg: str = '') -> List[str]:
     try:
-        # Wait for verse containers to be attached to the DOM
-        verse_locators = page.locator('[class*="ChapterContent_verse"]')
-        verse_locators.first.wait_for(state="attached", timeout=CONFIG["page_timeout_ms"])
+        # one round-trip: waits in the page for the verse containers and reads all of them at once
+        verses = page.wait_for_function(
+            READ_VERSES_JS,
+            arg=[VERSE_SELECTOR, LABEL_SELECTOR, CONTENT_SELECTOR, NOTE_SELECTOR],
+            polling=CONFIG["output_poll_interval_ms"],
+            timeout=CONFIG["page_timeout_ms"],
+        ).json_value()
 
-        logger.info(f"{msg} Found {verse_locators.count()} verse containers")
+        logger.info(f"{msg} Found {len(verses)} verse containers")
 
         extracted_verses = []
-        for i in range(verse_locators.count()):
-            try:     
-                verse = verse_locators.nth(i)
-                verse_num_locator = verse.locator('[class*="ChapterContent_label"]').first         
-                verse_text_locator = verse.locator('[class*="ChapterContent_content"]')
-                is_there_a_note = verse.locator('[class*="ChapterContent_note"]').first
-
-                verse_num = verse_num_locator.inner_text().strip() if verse_num_locator.is_visible() and verse_num_locator.inner_text().strip().isdigit() else None
-                     
-                content_texts = verse_text_locator.all_inner_texts()          
-                verse_text = " ".join([text.strip() for text in content_texts if text.strip()])
-                              
-                             
-                # if no verse_text and verse_number and note: skip
-                # if verse_text and verse_number and note: add
-                # if verse_text and no verse_number and note: add
-                # if verse_text and verse_number is greater than previous+1: skip and add
-                              
-                                                              
-                if verse_text:
-                    if verse_num:
-                        if str.isnumeric(verse_num) and int(verse_num) > len(extracted_verses) + 1:                          
-                            extracted_verses.append('')
-                            logger.debug(f"{msg} Inserting missing verse placeholder.")
-                        extracted_verses.append(verse_text)
-                        logger.debug(f"{msg} Verse {verse_num}: {verse_text[:50]}...")
-                                    
-                    elif verse_num is None and extracted_verses:                            
-                        # if is_there_a_note.is_visible():
-                        #    extracted_verses.append('')
-                        #    logger.debug(f"{msg} Skipping verse {verse_num} as it contains only a note.")
-                        # else:
-                            extracted_verses[-1] += " " + verse_text                        
-                            logger.debug(f"{msg} Continued verse: {verse_text[:50]}...")
-                    
-                  
-                elif is_there_a_note.is_visible():
-                    extracted_verses.append('')
-                    logger.debug(f"{msg} Skipping verse {verse_num} as it contains only a note.")
-                     
-                else:
-                    logger.debug(f"{msg} No text found for verse {verse_num}")
-            except Exception as e:
-                err_msg = f"Error processing verse {verse_num}: {str(e)}"
-                take_screenshot(page, filename=err_msg, msg_prefix=msg)
-
-                logger.error(f"{msg} {err_msg}")
+        for verse in verses:
+            verse_num = verse["label"] if verse["label"] and verse["label"].isdigit() else None
+            verse_text = " ".join([text.strip() for text in verse["contents"] if text.strip()])
+                          
+            # if no verse_text and verse_number and note: skip
+            # if verse_text and verse_number and note: add
+            # if verse_text and no verse_number and note: add
+            # if verse_text and verse_number is greater than previous+1: skip and add
+                          
+            if verse_text:
+                if verse_num:
+                    if str.isnumeric(verse_num) and int(verse_num) > len(extracted_verses) + 1:                          
+                        extracted_verses.append('')
+                        logger.debug(f"{msg} Inserting missing verse placeholder.")
+                    extracted_verses.append(verse_text)
+                    logger.debug(f"{msg} Verse {verse_num}: {verse_text[:50]}...")
+                                
+                elif verse_num is None and extracted_verses:                            
+                    extracted_verses[-1] += " " + verse_text                        
+                    logger.debug(f"{msg} Continued verse: {verse_text[:50]}...")
+              
+            elif verse["note"]:
+                extracted_verses.append('')
+                logger.debug(f"{msg} Skipping verse {verse_num} as it contains only a note.")
+                 
+            else:
+                logger.debug(f"{msg} No text found for verse {verse_num}")
         logger.info(f"{msg} Extracted {len(extracted_verses)} verses")
         return extracted_verses
     except Exception as e:
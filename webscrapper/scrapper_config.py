@@ -5,21 +5,98 @@ CONFIG = {
     "interaction_delay_range": (2, 6), # Delay range for interactions
     "new_request_delay_range": (3, 15),  # Delay range between requests
     "retry_attempts": 3,       # Retry attempts for failed requests
-    "retry_delay_range": (4, 20),  # Delay range between retries
+    "retry_delay_range": (4, 20),  # Base backoff range before a failed chunk is retried
+    "retry_backoff_factor": 2,     # Backoff multiplier per failed attempt of the same chunk
+    "retry_max_delay_s": 300,      # Upper bound of the retry backoff
     "new_batch_delay_range": (90, 240),  # Delay range between batches
     "scroll_amount_range": (20, 400),  # Range for scroll amount
     "scroll_back_probability": 0.3,    # Probability of scrolling backward
     "min_batch_interval": 1,  # Minimum interval between requests
     "max_batch_interval": 10,  # Maximum interval between requests
+    "origin_interval_range": None,  # Default spacing between requests to the same origin (None: global limit only)
+    "origin_interval_ranges": {},   # Per-origin request spacing in seconds, on top of the global one (backends add their own)
+    "backends_global_interval_range": (0, 0),  # Spacing shared by every backend of a translator run, each backend is paced by its own interval_range
+
+    # Translation backends (scrapper_backends.py): module implementing get_url/translate_sentence,
+    # workers bound to it and its request pacing. Every enabled backend runs at the same time.
+    # Optional per backend: batch_size, request_char_budget, sentences_per_request, chunk_deadline_s (default: the global keys).
+    "backends": {
+        "google_translate": {
+            "module": "scrapper_google_translate",
+            "enabled": True,
+            "max_concurrency": 14,
+            "interval_range": (1, 10),
+            "request_delay_range": (3, 15),
+        },
+        "deepl": {
+            "module": "scrapper_deepl",
+            "enabled": False,
+            "max_concurrency": 4,
+            "interval_range": (5, 20),
+            "request_delay_range": (5, 20),
+            "request_char_budget": 1500,  # the web translator caps free input at 1500 characters
+        },
+        "google_translate_docs": {
+            "module": "scrapper_google_translate_docs",
+            "enabled": False,
+            "max_concurrency": 2,
+            "interval_range": (10, 30),
+            "request_delay_range": (5, 15),
+            "batch_size": 600,
+            "request_char_budget": 200000,
+            "sentences_per_request": 600,
+            "chunk_deadline_s": 600,  # upload, translation and download of a whole document
+        },
+        "korpus_kernewek": {
+            "module": "scrapper_korpus_kernewek",
+            "enabled": False,
+            "max_concurrency": 2,
+            "interval_range": (2, 8),
+            "request_delay_range": (3, 10),
+        },
+    },
+
+    "target_languages": None,  # e.g. ["en", "de", "es"]: each input is entered once and translated into every language (one column each, TL first) by backends that support it. None: TL only
+    "mock_site_url": None,  # e.g. "http://127.0.0.1:8765": send every backend to the local mock site (python -m mock_site.server)
 
     "mouse_move_range_x": (-300, 800),  # X-coordinate range for mouse movement
     "mouse_move_range_y": (-100, 700),  # Y-coordinate range for mouse movement
   
     "max_scroll_iterations": 39,     # Prevent infinite scroll loops
     "max_workers": 14,                    # Concurrent translation workers
+    "shard_processes": 4,                 # Worker processes started by translator_sharded.py, max_workers is split between them
+    "async_max_pages": 40,                # Concurrent pages in the asyncio engine (translator_async.py)
     "batch_size": 30,                    # Sentences per context (proxy switch)    
     "sentences_per_request_range": (10, 25),         # Sentences per translation request
+    "request_char_budget": 4500,         # Characters per translation request, separators included (Google caps input at 5000)
+    "planner_min_budget_ratio": 0.2,     # Lowest fraction of the budget the planner shrinks to after split mismatches
+    "planner_budget_increase": 0.05,     # Budget fraction regained after each clean split
+    "planner_budget_decrease": 0.7,      # Budget multiplier applied after each split mismatch
+    "planner_mismatch_window": 50,       # Recent splits used to report the mismatch rate
+    "bisect_on_mismatch": True,          # Bisect and re-translate chunks whose output doesn't split back cleanly
+    "bisect_max_depth": 5,               # Maximum bisection depth per chunk
     "proxy_rotation": False,    
+    "batch_deadline_s": 1800,             # Upper bound of one batch, chunks not started by then go to the retry queue
+    "chunk_deadline_s": 180,              # Upper bound of one translation request (per backend: chunk_deadline_s in CONFIG["backends"])
+    "action_timeout_ms": 30000,           # Default Playwright timeout of a page, capped by the running deadline
+    "watchdog_interval_s": 5,             # How often the hang watchdog checks the running deadlines
+    "watchdog_grace_s": 30,               # Seconds past its deadline before a page counts as hung and its browser is discarded
+    "circuit_window_s": 120,              # Rolling window of request outcomes each circuit breaker (backend, origin) looks at
+    "circuit_min_requests": 5,            # Requests needed in the window before the error rate can open the breaker
+    "circuit_error_rate": 0.5,            # Failed share of the window that opens the breaker and pauses every worker on it
+    "circuit_open_s": 60,                 # First pause of an open breaker, multiplied by circuit_backoff_factor per trip in a row
+    "circuit_backoff_factor": 2,
+    "circuit_max_open_s": 900,            # Longest pause of an open breaker
+    "circuit_probe_successes": 2,         # Probe requests (one at a time) that must succeed before a half-open breaker closes
+    "page_max_recoveries": 3,             # Crashed or closed pages rebuilt per batch before the batch gives up
+    "browser_recycle_after_batches": 10,   # Batches served by a pooled browser before it is relaunched
+    "sink_flush_every": 50,               # Result rows written before the stream files are flushed and fsynced
+    "sink_flush_interval_s": 5,           # Maximum seconds between two flushes of the stream files
+    "ledger_max_attempts": 3,             # Runs a failed sentence is claimed again before the ledger gives up on it
+    "tm_cache_enabled": True,             # Look sentences up in the translation memory before chunking them
+    "tm_cache_memory_entries": 50000,     # Translations kept in the in-memory LRU
+    "tm_cache_max_entries": 2000000,      # Rows kept in the on-disk cache before the least recently used are evicted
+    "tm_cache_wait_s": 600,               # Seconds to wait for another worker translating the same sentence
     
     # get_bible_versions.py specific
     "scroll_limit": 0.7,  # Scroll limit as a fraction of total height
@@ -28,6 +105,16 @@ CONFIG = {
     "safe_button_click_probability": 0.3,  # Probability of clicking safe buttons
     "unsafe_button_click_probability": 0.2,  # Probability of clicking unsafe buttons
     "double_button_click_probability": 0.12,  # Probability of double clicking buttons
+    "output_timeout_ms": 30000,       # Deadline for the translation output to appear
+    "output_stable_ms": 300,          # The output must stay unchanged this long to count as complete
+    "output_poll_interval_ms": 100,   # In-page polling interval of the output wait
+    "docs_upload_format": "docx",          # File format of the document mode (scrapper_google_translate_docs.py): docx or txt
+    "docs_translation_timeout_ms": 180000, # Deadline for an uploaded document to be translated and downloaded
+    "google_capture_network": False,  # Decode translations from the page's own batchexecute responses, the DOM is only a fallback
+    "korpus_results_timeout_ms": 10000,  # Deadline for the Korpus Kernewek result table to show rows after a search
+    "korpus_max_requests": 200,          # Searches per harvest run (translator_korpus.py)
+    "korpus_min_expected_pairs": 1.0,    # Terms expected to add fewer new pairs than this are skipped as covered
+    "korpus_prior_rows": 25,             # Expected hits of a term before anything has been searched
     
     # translator_maitre.py specific   
     "button_click_probability": 0.7,  # Probability of clicking a button
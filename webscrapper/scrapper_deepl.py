@@ -1,10 +1,24 @@
-import logging
 import random
-from playwright.sync_api import sync_playwright, Page, BrowserContext
 
+from urllib.parse import urlparse
+from playwright.sync_api import Page
+
+from constants.languages import SL, TL
+from constants.output import LOG_FILENAME, OUTPUT_FOLDER
+from exceptions.output_timeout_exception import OutputTimeoutException
 from scrapper_config import CONFIG
 from pw_user_sim import simulate_human
-from utils.pw_helper import get_random_delay, perform_action
+from utils.deadline import cap_timeout_ms
+from utils.pw_helper import perform_action, read_text, take_screenshot, wait_for_stable_text
+
+# Import the singleton logger
+from logger import translation_logger
+'''
+DeepL backend. Works like the Google one: translator_maitre merges a chunk with MERGE_SYMBOL, the whole
+chunk is filled into the source editor in one go, and the output is read once it has been stable for
+output_stable_ms with the result toolbar shown. Failures raise, so retries and bisection stay in maitre.
+'''
+
 # -------------------------------
 # DeepL-specific Selectors (updated Nov 2025)
 # -------------------------------
@@ -31,96 +45,91 @@ INPUT_SELECTOR = "div[aria-labelledby='translation-source-heading'][contentedita
 OUTPUT_SELECTOR = "div[aria-labelledby='translation-target-heading'][contenteditable='true']"
 RESULT_TOOLBAR_SELECTOR = "div[dl-test='translator-target-toolbar']"  # appears when translation is ready
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[logging.StreamHandler()]
+logger = translation_logger.get_logger(
+    output_folder=OUTPUT_FOLDER,
+    log_filename=LOG_FILENAME
 )
-logger = logging.getLogger(__name__)
 
 
 def get_url(sl: str, tl: str) -> str:
-    """
-    DeepL URL format: https://www.deepl.com/translator#source_lang/target_lang/text
-    Note: We encode the text later in the script to avoid URL length issues.
-    """
-    return f"https://www.deepl.com/en/translator"
+    """DeepL keeps the language pair in the fragment: https://www.deepl.com/en/translator#sl/tl/"""
+    return f"https://www.deepl.com/en/translator#{sl}/{tl}/"
 
 
 # -------------------------------
 # Translation Core
 # -------------------------------
 def translate_sentence(page: Page, sentence: str, batch_idx: int) -> str:
-    """
-    Translate one sentence using DeepL.
-    """
-    # Clean and trim input
+    """Translate one input (a whole merged chunk) using DeepL."""
+    batch_msg = f"Batch {batch_idx}"
     sentence = sentence.strip()
     if not sentence:
         return ""
 
-    # Navigate to DeepL with correct languages (only once per batch ideally)
-    # page.goto(get_url(sl, tl), wait_until="domcontentloaded")
-    page.wait_for_load_state("networkidle")
-
-    for attempt in range(CONFIG["retry_attempts"]):
-        try:
-            # Clear previous input if needed (only on retries or if field is not empty)
-            if attempt > 0 or page.locator(INPUT_SELECTOR).input_value():
-                perform_action(
-                    lambda: page.click("button[dl-test='translator-source-clear-button']", timeout=5000),
-                    "clear previous input",
-                    optional=True
-                )
-
-            # Type the sentence naturally
-            perform_action(
-                lambda: page.fill(INPUT_SELECTOR, ""),
-                "clear textarea"
-            )
-            perform_action(
-                lambda: page.type(INPUT_SELECTOR, sentence, delay=random.randint(50, 150)),
-                f"type sentence (attempt {attempt+1})"
-            )
-
-            logger.debug(f"Batch {batch_idx} | Waiting for translation of: {sentence[:40]}...")
-
-            # Wait for result toolbar (most reliable indicator that translation is done)
-            page.wait_for_selector(RESULT_TOOLBAR_SELECTOR, timeout=15000)
-
-            # Additional small delay to ensure final text is rendered
-            get_random_delay((0.8, 2.0))
-
-            # Extract all result spans and join (DeepL splits into multiple <span>)
-            result_elements = page.locator(OUTPUT_SELECTOR).all()
-            translated_text = "".join(el.inner_text() for el in result_elements).strip()
-
-            # Post-translation human simulation
-            simulate_human(page, extra_safe_selectors=SAFE_CLICK_SELECTORS)
-
-            if translated_text and translated_text.lower() != sentence.lower():
-                logger.debug(f"Translated: {sentence[:30]}... → {translated_text[:30]}...")
-                
-                # Occasionally interact lightly (20% chance)
-                if random.random() < 0.2:
-                    simulate_human(page, UNSAFE_CLICK_SELECTORS)
-
-                return translated_text
-
-            else:
-                raise ValueError("Empty or identical translation")
-
-        except Exception as e:
-            logger.warning(f"Attempt {attempt+1}/{CONFIG['retry_attempts']} failed: {e}")
-            get_random_delay(CONFIG["retry_delay_range"])
-
-            if attempt == CONFIG["retry_attempts"] - 1:
-                return "[TRANSLATION FAILED] " + sentence
-
-            # Optional: reload page on severe failure
-            if "timeout" in str(e).lower() or "detached" in str(e).lower():
-                logger.info("Page issue detected, reloading...")
-                page.reload(wait_until="domcontentloaded")
-                page.wait_for_load_state("networkidle")
-
-    return "[TRANSLATION FAILED] " + sentence
+    simulate_human(page=page, msg=batch_msg)
+    ensure_languages(page, batch_msg=batch_msg)
+
+    # whatever the output shows now is stale once the new input is in
+    previous_output = read_text(page, OUTPUT_SELECTOR) if read_text(page, INPUT_SELECTOR) != sentence else None
+    logger.debug(f"{batch_msg} Translating: [{SL} → {TL}] {sentence}...")
+    set_input(page, sentence, msg=batch_msg)
+
+    try:
+        output = wait_for_stable_text(
+            page,
+            OUTPUT_SELECTOR,
+            previous_text=previous_output,
+            ready_selector=RESULT_TOOLBAR_SELECTOR,
+            msg=f"{batch_msg} No DeepL output",
+        )
+    except OutputTimeoutException as e:
+        logger.error(e.message)
+        take_screenshot(page, filename="DeepL output timeout", msg_prefix=batch_msg)
+        raise e
+
+    if output.lower() == sentence.lower():
+        raise ValueError(f"{batch_msg} Output matches input for [{SL} → {TL}]: {sentence[:50]}...")
+    logger.debug(f"{batch_msg} Translated: {sentence[:30]}... → {output[:30]}...")
+
+    stealthInteractionRoutine(page, batch_msg)
+    return output
+
+
+def set_input(page: Page, sentence: str, msg: str = '') -> None:
+    """Put the whole input in the source editor at once, pasting it if fill didn't take."""
+    perform_action(lambda: page.wait_for_selector(INPUT_SELECTOR, timeout=cap_timeout_ms(20000)), f"{msg} wait for the source editor", msg=msg)
+    perform_action(lambda: page.fill(INPUT_SELECTOR, sentence), f"{msg} fill in text to be translated", msg=msg)
+    if read_text(page, INPUT_SELECTOR) == sentence:
+        return
+
+    logger.debug(f"{msg} Fill didn't take, pasting the input instead...")
+    editor = page.locator(INPUT_SELECTOR).first
+    editor.click()
+    page.keyboard.press("ControlOrMeta+A")
+    page.keyboard.insert_text(sentence)
+    if read_text(page, INPUT_SELECTOR) != sentence:
+        raise ValueError(f"{msg} Failed to set input text.")
+
+
+def ensure_languages(page: Page, batch_msg: str = '') -> None:
+    """Keep the page on SL → TL, navigating to the #sl/tl/ URL when the pair in the fragment drifted."""
+    fragment = urlparse(page.url).fragment.split("/")
+    if fragment[:2] == [SL, TL]:
+        return
+    logger.warning(f"{batch_msg} Language mismatch: {fragment[:2]} expected [{SL} → {TL}]. Navigating...")
+    perform_action(
+        lambda: page.goto(f"{page.url.split('#')[0]}#{SL}/{TL}/", timeout=cap_timeout_ms(CONFIG["page_timeout_ms"])),
+        f"{batch_msg} reset languages",
+        raise_exception=True,
+        msg=batch_msg
+    )
+
+
+def stealthInteractionRoutine(page: Page, msg: str = "") -> None:
+    if random.random() < CONFIG["safe_button_click_probability"]:
+        simulate_human(page=page, selectors=SAFE_CLICK_SELECTORS, msg=msg)
+    if random.random() < CONFIG["unsafe_button_click_probability"]:
+        logger.warning(f"{msg} Using unsafe selectors...")
+        simulate_human(page=page, selectors=UNSAFE_CLICK_SELECTORS, msg=msg)
+        ensure_languages(page, batch_msg=msg)
+    logger.debug(f"{msg} Stealth routine completed...")
@@ -1,14 +1,19 @@
+import json
 import random
+import threading
+import weakref
 
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from xml.sax.xmlreader import Locator
-from playwright.sync_api import sync_playwright, Page, BrowserContext
-from urllib.parse import urlparse, parse_qs
+from playwright.sync_api import sync_playwright, Page, BrowserContext, Response, TimeoutError as PlaywrightTimeoutError
+from urllib.parse import urlencode, urlparse, urlunparse, parse_qs
 
 from constants.languages import SL, TL
 from constants.output import LOG_FILENAME, OUTPUT_FOLDER
+from exceptions.output_timeout_exception import OutputTimeoutException
 from scrapper_config import CONFIG
-from utils.pw_helper import click_element, perform_action, take_screenshot
+from utils.deadline import cap_timeout_ms
+from utils.pw_helper import click_element, perform_action, read_text, take_screenshot, wait_for_stable_text
 from pw_user_sim import simulate_human
 
 # Import the singleton logger
@@ -37,6 +42,37 @@ DOUBLE_CLICK_SELECTORS = [
 ]
 
 INPUT_TEXTAREA_SELECTOR = "textarea[aria-label='Source text']"
+OUTPUT_SELECTOR = "span[jsname='jqKxS']"
+
+# Finds the visible option for a language code in one round-trip: returns [group index, option index
+# within the group] or null. The group that held the option last time is searched first.
+FIND_LANGUAGE_OPTION_JS = """
+([languageCode, preferredGroup]) => {
+    const groups = Array.from(document.querySelectorAll('div[role="group"]'));
+    const isVisible = (element) => {
+        const rect = element.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0 && getComputedStyle(element).visibility !== 'hidden';
+    };
+    const order = groups.map((_, index) => index);
+    if (preferredGroup !== null && preferredGroup < groups.length) {
+        order.splice(preferredGroup, 1);
+        order.unshift(preferredGroup);
+    }
+    for (const groupIndex of order) {
+        const options = groups[groupIndex].querySelectorAll('div[role="option"]');
+        for (let optionIndex = 0; optionIndex < options.length; optionIndex++) {
+            const option = options[optionIndex];
+            if (option.getAttribute('data-language-code') === languageCode && isVisible(option)) {
+                return [groupIndex, optionIndex];
+            }
+        }
+    }
+    return null;
+}
+"""
+
+# the page fetches its translations from the batchexecute RPC endpoint, MkEWBc is the translate call
+TRANSLATION_RPC_ID = "MkEWBc"
 
 
 logger = translation_logger.get_logger(
@@ -44,6 +80,16 @@ logger = translation_logger.get_logger(
     log_filename=LOG_FILENAME
 )
 
+# (sl, tl) each page translates, read from its URL once and dropped whenever its main frame navigates
+# (menu clicks and swaps update the URL too), so checking the pair costs nothing in the common case
+_language_states: "weakref.WeakKeyDictionary[Page, Tuple[Optional[str], Optional[str]]]" = weakref.WeakKeyDictionary()
+_tracked_pages: "weakref.WeakSet[Page]" = weakref.WeakSet()
+
+# group index that held each (menu, language) option last time, shared by every worker
+_language_option_groups: Dict[Tuple[str, str], int] = {}
+_language_option_stats = {"hits": 0, "misses": 0}
+_language_option_lock = threading.Lock()
+
 
 def get_url (sl, tl):
     n = random.randint(1, 3)
@@ -63,34 +109,29 @@ def translate_sentence(page: Page, sentence: str, batch_idx: int) -> str:
     # Replace double quotes with single quotes to avoid issues
     sentence = sentence.replace('"', "'")
 
-    current_query_params = get_current_query_params(page.url)
- 
     # Optional: light scroll to trigger lazy load
     simulate_human(page=page, msg=batch_msg)
     
- 
-    ensure_language_parameters_stability(page=page,
-        current_sl=current_query_params.get('sl'),
-        current_tl=current_query_params.get('tl'),
-        final_sl=SL,
-        final_tl=TL,
-        batch_msg=batch_msg,
-    )
-    
-    set_input(page, sentence, msg=batch_msg)
-   
-    logger.debug(f"{batch_msg} Translating: [{current_query_params.get('sl')[0]} → {current_query_params.get('tl')[0]}] {sentence}...")
+    ensure_languages(page, batch_msg=batch_msg)
     
-    output = get_output(page=page, msg=batch_msg)
+    # whatever the output shows now is stale once the new input is in
+    previous_output = read_output(page) if page.input_value(INPUT_TEXTAREA_SELECTOR) != sentence else None
+    logger.debug(f"{batch_msg} Translating: [{SL} → {TL}] {sentence}...")
+
+    if CONFIG["google_capture_network"]:
+        output = capture_output(page, sentence, previous_output=previous_output, msg=batch_msg)
+    else:
+        set_input(page, sentence, msg=batch_msg)
+        output = get_output(page=page, msg=batch_msg, previous_output=previous_output)
     
     if output != sentence:
         logger.debug(f"{batch_msg} Translated: {sentence[:30]}... → {output}...")
         stealthInteractionRoutine(page, batch_msg)
         return output
     else:
-        logger.info(f"{batch_msg} {current_query_params}")
+        logger.info(f"{batch_msg} {get_language_state(page)}")
         logger.info(f"{batch_msg} {SL} -> {TL}")
-        if current_query_params.get('sl')[0] == SL and current_query_params.get('tl')[0] == TL:
+        if get_language_state(page) == (SL, TL):
             logger.warning(f"{batch_msg} Clicking on swap languages {DOUBLE_CLICK_SELECTORS[0]} for backtranslation...")
             try:                
                 click_element(page.locator(DOUBLE_CLICK_SELECTORS[0]).first, msg_prefix=batch_msg, raise_exception=True)
@@ -106,12 +147,17 @@ def translate_sentence(page: Page, sentence: str, batch_idx: int) -> str:
                     take_screenshot(page, filename=err_msg, msg_prefix=batch_msg)
                     raise e
                 
-            output = get_output(page=page, msg=batch_msg)
+            try:
+                output = get_output(page=page, msg=batch_msg, previous_output=output)
+            except OutputTimeoutException as e:
+                if not e.stale:
+                    raise e
+                # the swap left the output unchanged, handled like an output matching the input
+                output = sentence
 
             if output == sentence:
                   
-                current_query_params = get_current_query_params(page.url)
-                if current_query_params.get('sl')[0]== TL and current_query_params.get('tl')[0] == SL:
+                if get_language_state(page) == (TL, SL):
                     err_msg = "Backtranslation failed, output matches input"
                     take_screenshot(page, filename=err_msg, msg_prefix=batch_msg)
 
@@ -141,60 +187,105 @@ def translate_sentence(page: Page, sentence: str, batch_idx: int) -> str:
             return f"[TRANSLATION BACK FROM {TL}] - {output}"
         raise ValueError(f"{batch_msg} Can't perform backtranslation [{SL}] -> [{TL}] for sentence: {sentence[:50]}...")
 
+
+def translate_targets(page: Page, sentence: str, batch_idx: int, target_languages: List[str]) -> Dict[str, str]:
+    """
+    Translate one input into every target language: the input is entered once, then only the
+    target language is switched and each output collected. Returns {language: translation}.
+    """
+    batch_msg = f"Batch {batch_idx}"
+    sentence = sentence.replace('"', "'")
+    simulate_human(page=page, msg=batch_msg)
+
+    # start on the requested target the page already shows, saves one switch per input
+    current_sl, current_tl = get_language_state(page)
+    if current_sl != SL or current_tl not in target_languages:
+        ensure_languages(page, batch_msg=batch_msg, tl=target_languages[0])
+        current_tl = target_languages[0]
+    order = [current_tl] + [language for language in target_languages if language != current_tl]
+
+    translations: Dict[str, str] = {}
+    last_output: Optional[str] = None
+    for language in order:
+        if not translations:
+            previous_output = read_output(page) if page.input_value(INPUT_TEXTAREA_SELECTOR) != sentence else None
+            trigger = lambda: set_input(page, sentence, msg=batch_msg)
+        else:
+            previous_output = last_output
+            trigger = lambda: switch_target_language(page, language, sentence, batch_msg=batch_msg)
+        logger.debug(f"{batch_msg} Translating: [{SL} → {language}] {sentence}...")
+
+        try:
+            if CONFIG["google_capture_network"]:
+                output = capture_output(page, sentence, previous_output=previous_output, msg=batch_msg, trigger=trigger)
+            else:
+                trigger()
+                output = get_output(page=page, msg=batch_msg, previous_output=previous_output)
+        except OutputTimeoutException as e:
+            if not (e.stale and translations):
+                raise e
+            # the pair is verified by the switch, so an unchanged output is this language's translation too
+            output = read_output(page)
+
+        if output == sentence:
+            take_screenshot(page, filename=f"Output matches input {SL} to {language}", msg_prefix=batch_msg)
+            raise ValueError(f"{batch_msg} Output matches input for [{SL} → {language}]: {sentence[:50]}...")
+        logger.debug(f"{batch_msg} Translated [{language}]: {sentence[:30]}... → {output}...")
+        translations[language] = output
+        last_output = output
+
+    stealthInteractionRoutine(page, batch_msg, tl=order[-1])
+    return {language: translations[language] for language in target_languages}
+
+
+def switch_target_language(page: Page, language: str, sentence: str, batch_msg: str = '') -> None:
+    """
+    Switch the target language with the input left in place. The target menu makes the page translate
+    the same input again; if the menu fails, navigate to the language URL and enter the input again.
+    """
+    try:
+        _reset_languages(page, language, is_source_language=False, batch_msg=batch_msg)
+    except Exception as e:
+        logger.warning(f"{batch_msg} Target menu failed for {language}, navigating instead: {e}")
+        perform_action(
+            lambda: page.goto(get_language_url(page.url, SL, language), timeout=cap_timeout_ms(CONFIG["page_timeout_ms"])),
+            f"{batch_msg} switch target language",
+            msg=batch_msg
+        )
+        set_input(page, sentence, msg=batch_msg)
+    _language_states.pop(page, None)
+    if get_language_state(page) != (SL, language):
+        raise ValueError(f"{batch_msg} Target language didn't switch to {language}, page is on {get_language_state(page)}")
+
+
 def _click_language_option(page: Page, language_code: str, _language_list: Locator, batch_msg: str = ''):
-    """Helper function to click language option with fallback"""  
-    # Selector priorities
+    """Open the language menu and click the visible option for language_code, located with a single evaluate."""
     try:
-        menu_state = _language_list.get_attribute('aria-expanded')
-        if menu_state != 'true':
+        menu_label = _language_list.get_attribute('aria-label')
+        if _language_list.get_attribute('aria-expanded') != 'true':
             logger.debug(f"{batch_msg} Opening language menu")
             click_element(_language_list, msg_prefix=batch_msg, hover=True)
-        
-        
-        logger.debug(f"{batch_msg} Searching for language options...")
-        groups = page.locator('div[role="group"]')
-        options = groups.locator('div[role="option"]')
 
-                  
-        # Try each selector until one works
-        success = False
-     
-        found_element = None
-        for i in range(options.count()):
-            option = options.nth(i)
-            option_lang_code = option.get_attribute('data-language-code')
-            
-            if option_lang_code == language_code and option.is_visible():
-                found_element = option
-                logger.debug(f"{batch_msg} Attempting with selector: {found_element.get_attribute('data-language-code')} at index {i}...")
-                try:     
-                    if success:
-                        break    
-                    menu_state = _language_list.get_attribute('aria-expanded')
-                    if menu_state != 'true':
-                        take_screenshot(page, filename=f"Menu not expanded for {_language_list.get_attribute('aria-label')}_menu{language_code} at index {i}", msg_prefix=batch_msg)
-                        logger.debug(f"{batch_msg} Opening language menu")
-                        click_element(_language_list, msg_prefix=batch_msg, hover=True)
-                    # take_screenshot(page, filename=f"Menu expanded for {_language_list.get_attribute('aria-label')}_menu{language_code} at index {i}", msg_prefix=batch_msg)
-                    logger.debug(f"{batch_msg} {_language_list.get_attribute('aria-label')} Menu is visible: {_language_list.is_visible()}, Option is visible: {found_element.is_visible()}")
-                    success = click_element(element=found_element, msg_prefix=batch_msg, hover=True, raise_exception=True)
-                except Exception as e:
-                    logger.debug(f"{batch_msg} Selector failed: {e}")
-                    continue
-                break       
-            
-        if found_element is None:
-            logger.debug(f"{batch_msg} No selector found for {language_code}")
-            raise Exception(f"No selector found for {language_code}. Language list failed to open: {_language_list.get_attribute('aria-label')} Menu is visible: {_language_list.is_visible()}")    
-     
-        if not success:
-            logger.debug(f"{batch_msg} No working selector found for {language_code}")
-            raise Exception(f"No working selector found for {language_code}")      
-              
+        cache_key = (menu_label, language_code)
+        with _language_option_lock:
+            preferred_group = _language_option_groups.get(cache_key)
+        location = page.evaluate(FIND_LANGUAGE_OPTION_JS, [language_code, preferred_group])
+        if location is None:
+            logger.debug(f"{batch_msg} No visible option for {language_code}")
+            raise Exception(f"No selector found for {language_code}. Language list failed to open: {menu_label}")
+
+        group_index, option_index = location
+        with _language_option_lock:
+            _language_option_groups[cache_key] = group_index
+            _language_option_stats["hits" if group_index == preferred_group else "misses"] += 1
+        logger.debug(f"{batch_msg} {menu_label}: {language_code} at group {group_index}, option {option_index} ({get_language_option_stats()})")
+
+        option = page.locator('div[role="group"]').nth(group_index).locator('div[role="option"]').nth(option_index)
+        click_element(element=option, msg_prefix=batch_msg, hover=True, raise_exception=True)
+
         # Verify menu closed
         page.wait_for_timeout(500)
-        final_state = _language_list.get_attribute('aria-expanded')
-        if final_state == 'true':
+        if _language_list.get_attribute('aria-expanded') == 'true':
             logger.warning(f"{batch_msg} Menu didn't close automatically, closing manually")
             click_element(_language_list, msg_prefix=batch_msg, hover=True)
     
@@ -204,6 +295,13 @@ def _click_language_option(page: Page, language_code: str, _language_list: Locat
         take_screenshot(page, filename=error_msg, msg_prefix=batch_msg)        
         raise e
 
+
+def get_language_option_stats() -> Dict[str, float]:
+    """How often the cached group index held the requested language option."""
+    with _language_option_lock:
+        lookups = _language_option_stats["hits"] + _language_option_stats["misses"]
+        return {**_language_option_stats, "hit_rate": _language_option_stats["hits"] / lookups if lookups else 0.0}
+
 def _reset_languages(page: Page, language: str, is_source_language: bool = True, batch_msg: str = '') -> Dict[str, Any]:
     if type(language) is list:
         language = language[0]
@@ -225,7 +323,7 @@ def set_input(page: Page, sentence: str, msg: str = '') -> None:
             click_element(menu, msg_prefix=msg, hover=True)
         
    
-    perform_action(lambda: page.wait_for_selector(INPUT_TEXTAREA_SELECTOR, timeout=20000), f"{msg} wait result")
+    perform_action(lambda: page.wait_for_selector(INPUT_TEXTAREA_SELECTOR, timeout=cap_timeout_ms(20000)), f"{msg} wait result")
     perform_action(lambda:  page.fill(INPUT_TEXTAREA_SELECTOR, sentence), f"{msg} type in text to be translated")
        
     textbox = page.wait_for_selector(INPUT_TEXTAREA_SELECTOR)
@@ -241,20 +339,95 @@ def set_input(page: Page, sentence: str, msg: str = '') -> None:
     if final_text != sentence:
         raise ValueError(f"{msg} Failed to set input text after {attempts} attempts.")
     
-def get_output(page: Page, msg: str = '') -> str:
-    result = page.locator("span[jsname='jqKxS']").first
-    
-    output = result.inner_text()
-    
-    while not output:
-        logger.debug(f"{msg} Waiting for translation result...")
-        perform_action(lambda: page.wait_for_timeout(500), f"{msg} wait for translation")
-        output = result.inner_text()
+def read_output(page: Page) -> str:
+    """Current output text, without waiting."""
+    return read_text(page, OUTPUT_SELECTOR)
+
+
+def get_output(page: Page, msg: str = '', previous_output: Optional[str] = None, timeout_ms: float = CONFIG["output_timeout_ms"]) -> str:
+    """
+    Wait in the page for the translation to be complete: non-empty, different from previous_output
+    (what the output showed before the input changed) and stable for output_stable_ms.
+    Raises OutputTimeoutException when the deadline passes first.
+    """
+    try:
+        output = wait_for_stable_text(page, OUTPUT_SELECTOR, previous_text=previous_output, timeout_ms=timeout_ms, msg=f"{msg} No translation output")
+    except OutputTimeoutException as error:
+        logger.error(error.message)
+        take_screenshot(page, filename="Translation output timeout", msg_prefix=msg)
+        raise error
     logger.debug(f"{msg} Obtained translation output: {output}...")
     return output
     
   
-def stealthInteractionRoutine(page: Page, msg: str = "") -> None:
+def is_translation_response(response: Response) -> bool:
+    query = parse_qs(urlparse(response.url).query)
+    return response.request.method == "POST" and TRANSLATION_RPC_ID in query.get("rpcids", [''])[0].split(",")
+
+
+def decode_translation_response(body: str) -> Optional[str]:
+    """
+    Translated text of a batchexecute response: an anti-XSSI prefix, then length-prefixed JSON
+    envelopes. The MkEWBc envelope carries the translation as a JSON string whose [1][0][0][5]
+    lists the translated parts; [1][0][0][3] tells whether the parts are joined with spaces.
+    """
+    for line in body.splitlines():
+        line = line.strip()
+        if not line.startswith("["):
+            continue
+        try:
+            envelopes = json.loads(line)
+        except ValueError:
+            continue
+        for envelope in envelopes:
+            if len(envelope) > 2 and envelope[:2] == ["wrb.fr", TRANSLATION_RPC_ID] and isinstance(envelope[2], str):
+                try:
+                    translation = json.loads(envelope[2])[1][0][0]
+                    parts: List = translation[5] or []
+                except (ValueError, IndexError, TypeError):
+                    return None
+                text = (" " if translation[3] else "").join(part[0] for part in parts if part and part[0])
+                return text.strip() or None
+    return None
+
+
+def capture_output(
+    page: Page,
+    sentence: str,
+    previous_output: Optional[str] = None,
+    msg: str = '',
+    trigger: Optional[Callable[[], None]] = None,
+) -> str:
+    """
+    Set the input (or run trigger, anything that makes the page translate again) and read the
+    translation from the page's own translate response, falling back to the DOM.
+    """
+    output = None
+    try:
+        with page.expect_response(is_translation_response, timeout=cap_timeout_ms(CONFIG["output_timeout_ms"])) as response_info:
+            if trigger is None:
+                set_input(page, sentence, msg=msg)
+            else:
+                trigger()
+        response = response_info.value
+    except PlaywrightTimeoutError:
+        response = None
+        logger.warning(f"{msg} No translate response within {CONFIG['output_timeout_ms'] / 1000:.1f}s")
+
+    if response is not None:
+        if not response.ok:
+            # the page shows an error and no output, no point waiting for the DOM
+            raise ValueError(f"{msg} Translate request failed with status {response.status}")
+        output = decode_translation_response(response.text())
+
+    if output:
+        logger.debug(f"{msg} Obtained translation output from the network: {output}...")
+        return output
+    logger.debug(f"{msg} Falling back to the page output...")
+    return get_output(page=page, msg=msg, previous_output=previous_output)
+
+
+def stealthInteractionRoutine(page: Page, msg: str = "", tl: str = TL) -> None:
     # light scroll to trigger lazy load
     if random.random() < CONFIG["safe_button_click_probability"]:
         simulate_human(page=page, selectors=SAFE_CLICK_SELECTORS, msg=msg)
@@ -267,21 +440,67 @@ def stealthInteractionRoutine(page: Page, msg: str = "") -> None:
             logger.warning(f"{msg} Using unsafe selectors...")
             simulate_human(page=page, selectors=UNSAFE_CLICK_SELECTORS, msg=msg)
             logger.warning(f"{msg} Finished using unsafe selectors...")
-    final_query_params = get_current_query_params(page.url)
-        
-    ensure_language_parameters_stability(
-        page=page,
-        current_sl=final_query_params.get('sl'),
-        current_tl=final_query_params.get('tl'),
-        final_sl=SL,
-        final_tl=TL,
-        batch_msg=msg,
-    )
+    ensure_languages(page, batch_msg=msg, tl=tl)
     logger.debug(f"{msg} Stealth routine completed...")
 
 def get_current_query_params(url: str) -> Dict[str, Any]:
     return parse_qs(urlparse(url).query)
 
+
+def _track_navigation(page: Page) -> None:
+    if page in _tracked_pages:
+        return
+    _tracked_pages.add(page)
+    page.on("framenavigated", lambda frame: _language_states.pop(page, None) if frame == page.main_frame else None)
+
+
+def get_language_state(page: Page) -> Tuple[Optional[str], Optional[str]]:
+    """(sl, tl) of the page, from the in-memory snapshot when it hasn't navigated since the last read."""
+    state = _language_states.get(page)
+    if state is None:
+        _track_navigation(page)
+        query_params = get_current_query_params(page.url)
+        state = _language_states[page] = (query_params.get('sl', [None])[0], query_params.get('tl', [None])[0])
+    return state
+
+
+def get_language_url(url: str, sl: str, tl: str) -> str:
+    """Same page with the language pair set in its query string."""
+    parsed_url = urlparse(url)
+    query_params = parse_qs(parsed_url.query)
+    query_params.update({'sl': [sl], 'tl': [tl]})
+    query_params.setdefault('op', ['translate'])
+    return urlunparse(parsed_url._replace(query=urlencode(query_params, doseq=True)))
+
+
+def ensure_languages(page: Page, batch_msg: str = '', tl: str = TL) -> None:
+    """
+    Keep the page on SL → tl. A drifted pair is fixed by navigating to the ?sl=..&tl=.. URL;
+    the language menus are only used if the site doesn't honour the URL.
+    """
+    current_sl, current_tl = get_language_state(page)
+    if (current_sl, current_tl) == (SL, tl):
+        return
+
+    logger.warning(f"{batch_msg} Language mismatch: [{current_sl} → {current_tl}] expected [{SL} → {tl}]. Navigating...")
+    perform_action(
+        lambda: page.goto(get_language_url(page.url, SL, tl), timeout=cap_timeout_ms(CONFIG["page_timeout_ms"])),
+        f"{batch_msg} reset languages",
+        msg=batch_msg
+    )
+    _language_states.pop(page, None)
+    current_sl, current_tl = get_language_state(page)
+    if (current_sl, current_tl) != (SL, tl):
+        logger.warning(f"{batch_msg} Still on [{current_sl} → {current_tl}] after navigating, resetting through the language menus...")
+        ensure_language_parameters_stability(
+            page=page,
+            current_sl=current_sl,
+            current_tl=current_tl,
+            final_sl=SL,
+            final_tl=tl,
+            batch_msg=batch_msg,
+        )
+
 def ensure_language_parameters_stability(
     page: Page,
     current_sl: str,
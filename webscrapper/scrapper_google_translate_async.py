@@ -0,0 +1,131 @@
+import itertools
+import random
+
+from typing import Optional
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+
+from constants.languages import SL, TL
+from constants.output import LOG_FILENAME, OUTPUT_FOLDER
+from exceptions.output_timeout_exception import OutputTimeoutException
+from scrapper_config import CONFIG
+from scrapper_google_translate import (
+    INPUT_TEXTAREA_SELECTOR,
+    OUTPUT_SELECTOR,
+    SAFE_CLICK_SELECTORS,
+    UNSAFE_CLICK_SELECTORS,
+    WAIT_FOR_OUTPUT_JS,
+    get_current_query_params,
+    get_url,
+)
+from utils.pw_async_helper import click_element, get_random_delay, perform_action, random_mouse_movement, take_screenshot
+
+# Import the singleton logger
+from logger import translation_logger
+
+'''
+Google Translate backend for the asyncio engine (translator_async.py).
+Mirrors scrapper_google_translate on playwright.async_api. Language drift is fixed by
+navigating to the ?sl=..&tl=.. URL instead of clicking through the language menus.
+'''
+
+logger = translation_logger.get_logger(
+    output_folder=OUTPUT_FOLDER,
+    log_filename=LOG_FILENAME
+)
+
+__all__ = ["get_url", "translate_sentence"]
+
+_output_waits = itertools.count(1)
+
+
+async def ensure_languages(page: Page, batch_msg: str = '') -> None:
+    query_params = get_current_query_params(page.url)
+    current_sl = query_params.get('sl', [None])[0]
+    current_tl = query_params.get('tl', [None])[0]
+    if current_sl == SL and current_tl == TL:
+        return
+
+    logger.warning(f"{batch_msg} Language mismatch: [{current_sl} → {current_tl}] expected [{SL} → {TL}]. Navigating...")
+    await perform_action(lambda: page.goto(get_url(SL, TL), timeout=CONFIG["page_timeout_ms"]), f"{batch_msg} reset languages", raise_exception=True, msg=batch_msg)
+
+
+async def set_input(page: Page, sentence: str, msg: str = '') -> None:
+    await perform_action(lambda: page.wait_for_selector(INPUT_TEXTAREA_SELECTOR, timeout=20000), f"{msg} wait input", msg=msg)
+    await perform_action(lambda: page.fill(INPUT_TEXTAREA_SELECTOR, sentence), f"{msg} type in text to be translated", msg=msg)
+
+    textbox = page.locator(INPUT_TEXTAREA_SELECTOR).first
+    final_text = await textbox.input_value()
+    attempts = 0
+    while final_text != sentence and attempts < 3:
+        await click_element(page.locator(UNSAFE_CLICK_SELECTORS[0]).first, msg_prefix=msg)
+        await perform_action(lambda: page.fill(INPUT_TEXTAREA_SELECTOR, sentence), f"{msg} type in text to be translated", msg=msg)
+        final_text = await textbox.input_value()
+        attempts += 1
+    if final_text != sentence:
+        raise ValueError(f"{msg} Failed to set input text after {attempts} attempts.")
+
+
+async def read_output(page: Page) -> str:
+    return await page.evaluate(
+        "(selector) => { const node = document.querySelector(selector); return node ? node.innerText.trim() : ''; }",
+        OUTPUT_SELECTOR
+    )
+
+
+async def get_output(page: Page, msg: str = '', previous_output: Optional[str] = None, timeout_ms: float = CONFIG["output_timeout_ms"]) -> str:
+    """Same in-page wait as scrapper_google_translate.get_output."""
+    previous_output = (previous_output or '').strip()
+    try:
+        handle = await page.wait_for_function(
+            WAIT_FOR_OUTPUT_JS,
+            arg=[OUTPUT_SELECTOR, previous_output, CONFIG["output_stable_ms"], next(_output_waits)],
+            polling=CONFIG["output_poll_interval_ms"],
+            timeout=timeout_ms,
+        )
+    except PlaywrightTimeoutError:
+        stale = bool(previous_output) and await read_output(page) == previous_output
+        error = OutputTimeoutException(timeout_ms, stale=stale, message=f"{msg} No translation output")
+        logger.error(error.message)
+        await take_screenshot(page, filename="Translation output timeout", msg_prefix=msg)
+        raise error
+    output = await handle.json_value()
+    logger.debug(f"{msg} Obtained translation output: {output}...")
+    return output
+
+
+async def stealth_interaction_routine(page: Page, msg: str = "") -> None:
+    if random.random() < CONFIG["safe_button_click_probability"]:
+        await random_mouse_movement(page, msg)
+        selector = random.choice(SAFE_CLICK_SELECTORS)
+        locator = page.locator(selector).first
+        if await locator.count() and await locator.is_visible():
+            await click_element(locator, msg_prefix=msg, hover=True)
+    await ensure_languages(page, batch_msg=msg)
+
+
+# Translation Core
+async def translate_sentence(page: Page, sentence: str, batch_idx: int) -> str:
+    """Translate one (merged) sentence using Google Translate."""
+    batch_msg = f"Batch {batch_idx}"
+
+    # Replace double quotes with single quotes to avoid issues
+    sentence = sentence.replace('"', "'")
+
+    await random_mouse_movement(page, batch_msg)
+    await ensure_languages(page, batch_msg=batch_msg)
+    # whatever the output shows now is stale once the new input is in
+    previous_output = await read_output(page) if await page.input_value(INPUT_TEXTAREA_SELECTOR) != sentence else None
+    await set_input(page, sentence, msg=batch_msg)
+
+    logger.debug(f"{batch_msg} Translating: [{SL} → {TL}] {sentence}...")
+    output = await get_output(page=page, msg=batch_msg, previous_output=previous_output)
+
+    if output == sentence:
+        # the sync backend attempts a swap-based backtranslation here; the async engine
+        # leaves it to the retry loop, which reloads the page before trying again
+        raise ValueError(f"{batch_msg} Output matches input for [{SL}] -> [{TL}]: {sentence[:50]}...")
+
+    logger.debug(f"{batch_msg} Translated: {sentence[:30]}... → {output}...")
+    await stealth_interaction_routine(page, batch_msg)
+    await get_random_delay(CONFIG["scroll_delay_range"])
+    return output
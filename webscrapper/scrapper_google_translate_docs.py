@@ -0,0 +1,79 @@
+import tempfile
+
+from pathlib import Path
+from typing import List, Optional
+from playwright.sync_api import Page
+
+from constants.output import LOG_FILENAME, OUTPUT_FOLDER
+from scrapper_config import CONFIG
+from scrapper_google_translate import ensure_languages
+from utils.deadline import cap_timeout_ms
+from utils.document_helper import number_lines, read_document, realign_lines, write_document
+from utils.pw_helper import click_element, take_screenshot
+
+# Import the singleton logger
+from logger import translation_logger
+
+'''
+Document mode of Google Translate (?op=docs). A whole chunk is written to one .docx/.txt file
+with a [[n]] id in front of every line, uploaded through the document translation flow, and the
+downloaded translation is realigned by id, so one page interaction covers hundreds of sentences.
+Chunk size comes from the backend's request_char_budget / sentences_per_request in CONFIG["backends"].
+'''
+
+logger = translation_logger.get_logger(
+    output_folder=OUTPUT_FOLDER,
+    log_filename=LOG_FILENAME
+)
+
+FILE_INPUT_SELECTOR = "input[type='file'][name='file']"
+TRANSLATE_BUTTON_NAME = "Translate"
+DOWNLOAD_BUTTON_NAME = "Download translation"
+
+
+def get_url(sl, tl):
+    return f"https://translate.google.com/?sl={sl}&tl={tl}&op=docs"
+
+
+def translate_batch(page: Page, sentences: List[str], batch_idx: int) -> List[Optional[str]]:
+    """Translate sentences through one document upload; sentences missing from the download are None."""
+    batch_msg = f"Batch {batch_idx}"
+    download_button = page.get_by_role("button", name=DOWNLOAD_BUTTON_NAME)
+
+    # the page still shows the previous document, start from an empty upload form
+    if download_button.is_visible():
+        page.goto(page.url, timeout=cap_timeout_ms(CONFIG["page_timeout_ms"]))
+    ensure_languages(page, batch_msg=batch_msg)
+
+    with tempfile.TemporaryDirectory(prefix="google_docs_") as folder:
+        source_path = write_document(number_lines(sentences), Path(folder) / f"batch_{batch_idx}.{CONFIG['docs_upload_format']}")
+        logger.debug(f"{batch_msg} Uploading {len(sentences)} sentences as {source_path.name}...")
+        page.set_input_files(FILE_INPUT_SELECTOR, str(source_path))
+        click_element(page.get_by_role("button", name=TRANSLATE_BUTTON_NAME, exact=True), msg_prefix=batch_msg, raise_exception=True)
+
+        try:
+            download_button.wait_for(state="visible", timeout=cap_timeout_ms(CONFIG["docs_translation_timeout_ms"]))
+        except Exception as e:
+            take_screenshot(page, filename="Document translation timeout", msg_prefix=batch_msg)
+            raise ValueError(f"{batch_msg} Document translation didn't finish: {e}")
+
+        with page.expect_download(timeout=cap_timeout_ms(CONFIG["docs_translation_timeout_ms"])) as download_info:
+            click_element(download_button, msg_prefix=batch_msg, raise_exception=True)
+        translated_path = Path(folder) / f"translated_{source_path.name}"
+        download_info.value.save_as(translated_path)
+        lines = read_document(translated_path)
+
+    translations = realign_lines(lines, len(sentences))
+    missing = sum(translation is None for translation in translations)
+    if missing:
+        logger.warning(f"{batch_msg} {missing}/{len(sentences)} line ids missing from the translated document")
+    logger.debug(f"{batch_msg} Realigned {len(sentences) - missing} sentences from {len(lines)} translated lines")
+    return translations
+
+
+def translate_sentence(page: Page, sentence: str, batch_idx: int) -> str:
+    """Translate one sentence as a one-line document."""
+    translation = translate_batch(page, [sentence], batch_idx)[0]
+    if translation is None:
+        raise ValueError(f"Batch {batch_idx} Empty document translation for: {sentence[:50]}...")
+    return translation
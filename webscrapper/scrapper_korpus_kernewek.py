@@ -1,12 +1,14 @@
-from typing import Any, Dict, List, Tuple
-from playwright.sync_api import sync_playwright, Page
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from playwright.sync_api import sync_playwright, Page, TimeoutError as PlaywrightTimeoutError
 
 from exceptions.not_found_exception import NotFoundException
 from constants.languages import SL, TL
 from constants.output import LOG_FILENAME, OUTPUT_FOLDER
 from scrapper_config import CONFIG
 
+from utils.deadline import cap_timeout_ms
 from utils.pw_helper import click_element, perform_action, get_random_delay
+from utils.query_planner import QueryPlanner
 from pw_user_sim import simulate_human
 
 # Import the singleton logger
@@ -75,6 +77,47 @@ DOUBLE_CLICK_SELECTORS = [
 ]
 
 INPUT_TEXTAREA_SELECTOR = "input[class='gwt-TextBox searchBox']"
+RESULT_ROWS_SELECTOR = "tr.even, tr.odd"
+
+# Reads the whole result table in one round-trip: rows in table order as [en, kw] pairs, their
+# signature, plus the pager state when the results are paginated ("1-50 of 234" and whether a next
+# page is enabled). Returns null while there are no rows yet or while the rows still carry the
+# signature of the previous search, so it also serves as the wait_for_function predicate; an empty
+# table showing the site's "no results" message reads as zero rows.
+READ_RESULTS_JS = r"""
+([rowsSelector, previous]) => {
+    const NO_RESULTS = /^\s*no (results|matches|data)\b/i;
+    const clean = (text) => (text || "").replace(/"/g, "'").trim();
+    const rows = [];
+    for (const row of document.querySelectorAll(rowsSelector)) {
+        const cells = row.cells && row.cells.length >= 2
+            ? Array.from(row.cells).map((cell) => cell.innerText)
+            : row.innerText.split("\t");
+        if (cells.length >= 2) rows.push([clean(cells[0]), clean(cells[1])]);
+    }
+    if (!rows.length) {
+        const empty = Array.from(document.querySelectorAll("td, div"))
+            .some((node) => !node.children.length && NO_RESULTS.test(node.textContent || ""));
+        return empty ? {rows, signature: null, pagination: null} : null;
+    }
+    const signature = JSON.stringify(rows);
+    if (previous !== null && signature === previous) return null;
+
+    let pagination = null;
+    const pattern = /(\d[\d,]*)\s*[-–]\s*(\d[\d,]*)\s+of\s+(\d[\d,]*)/i;
+    for (const node of document.querySelectorAll(".gwt-SimplePager, .gwt-SimplePager *")) {
+        if (node.children.length) continue;
+        const match = pattern.exec(node.textContent || "");
+        if (!match) continue;
+        const [start, end, total] = match.slice(1).map((value) => Number(value.replace(/,/g, "")));
+        const next = document.querySelector("[aria-label='Next page'], [title='Next page']");
+        const nextDisabled = !next || next.getAttribute("aria-disabled") === "true" || next.disabled;
+        pagination = {start, end, total, hasNext: !nextDisabled && end < total};
+        break;
+    }
+    return {rows, signature, pagination};
+}
+"""
 
 def get_url (sl, tl):
     return 'https://www.akademikernewek.org.uk/corpus/?locale=en'
@@ -90,16 +133,16 @@ def translate_sentence(page: Page, sentence: str, batch_idx: int) -> str:
     # Optional: light scroll to trigger lazy load
     simulate_human(page=page, msg=batch_msg)
     
-    set_input(page, sentence, msg=batch_msg, logger=logger)
+    set_input(page, sentence, msg=batch_msg)
    
     logger.debug(f"{batch_msg} | Searching: {sentence}...")
     
-    return get_output(logger=logger, page=page, msg=batch_msg)
+    return get_output(page=page, msg=batch_msg)
     
 def set_input(page: Page, sentence: str, msg: str = '') -> None:
  
    
-    perform_action(lambda: page.wait_for_selector(INPUT_TEXTAREA_SELECTOR, timeout=20000), f"{msg} | wait result")
+    perform_action(lambda: page.wait_for_selector(INPUT_TEXTAREA_SELECTOR, timeout=cap_timeout_ms(20000)), f"{msg} | wait result")
     perform_action(lambda:  page.fill(INPUT_TEXTAREA_SELECTOR, sentence), f"{msg} | type in text to be translated")
        
     textbox = page.wait_for_selector(INPUT_TEXTAREA_SELECTOR)
@@ -115,39 +158,97 @@ def set_input(page: Page, sentence: str, msg: str = '') -> None:
         raise ValueError(f"{msg} | Failed to set input text after {attempts} attempts.")
     
 def get_output(page: Page, msg: str = '') -> Tuple[List[str], List[str]]:
+    """Run the search and return the (en, kw) columns of the result table, in table order."""
+    results = get_results(page, msg=msg)
+    en_output = [en for en, _ in results["rows"]]
+    kw_output = [kw for _, kw in results["rows"]]
+    return en_output, kw_output
+
+
+def get_results(page: Page, msg: str = '') -> Dict[str, Any]:
+    """
+    Click search and read the result table with a single in-page evaluation:
+    {"rows": [[en, kw], ...], "pagination": {"start", "end", "total", "hasNext"} or None}.
+    Raises NotFoundException when no new row shows up after a second search.
+    """
+    # rows left over from the previous search stay in the table until the new ones replace them
+    previous = read_results(page, timeout_ms=0)
+    previous_signature = previous["signature"] if previous else None
     buttons = page.locator(SAFE_CLICK_SELECTORS[0])
-    attempts = 0
     max_attempts = 2
-    while(attempts < max_attempts):
-        logger.debug(f"{msg} | Attempt {attempts+1}/{max_attempts} {buttons.last.inner_text()}")
+    for attempt in range(max_attempts):
+        logger.debug(f"{msg} | Attempt {attempt + 1}/{max_attempts} {buttons.last.inner_text()}")
         click_element(buttons.last, msg)
-        first_half = page.locator("tr[class='even']")
-        second_half = page.locator("tr[class='odd']")
-        even_elements = first_half.element_handles()
-        odd_elements = second_half.element_handles()
-        if len(even_elements) == 0 and len(odd_elements) == 0:
-            if attempts > 0:
-                raise NotFoundException(f"{msg} | No translation output found.")
-            get_random_delay()
-        else:
+        results = read_results(page, previous=previous_signature)
+        if results is not None:
             break
-        attempts += 1
-    
-    logger.debug(f"{msg} | First half ({len(even_elements)}): {first_half}")
-    logger.debug(f"{msg} | Second half ({len(odd_elements)}): {second_half}")
-    all_elements = even_elements + odd_elements
-    
-    en_output = []
-    kw_output = []
-    
-    for e in all_elements:
-        text = e.inner_text().strip()
-        # logger.debug(f"{msg} | First half element text: {text}")
-        result = text.replace("\"", '\'').split('	')
-        en_output.append(result[0].strip())
-        kw_output.append(result[1].strip())
-        
-    return en_output, kw_output
+        if attempt == max_attempts - 1:
+            raise NotFoundException(f"{msg} | No translation output found.")
+        get_random_delay()
+
+    pagination = results["pagination"]
+    logger.debug(f"{msg} | {len(results['rows'])} rows, pagination: {pagination}")
+    if pagination and pagination["hasNext"]:
+        logger.info(f"{msg} | Showing rows {pagination['start']}-{pagination['end']} of {pagination['total']}")
+    return results
+
+
+def harvest(
+    page: Page,
+    planner: QueryPlanner,
+    terms: Iterable[str] = wordbank,
+    max_requests: int = CONFIG["korpus_max_requests"],
+    delay_range: Tuple[float, float] = CONFIG["new_request_delay_range"],
+    batch_idx: int = 0) -> int:
+    """
+    Search the terms the planner expects to add the most new pairs, re-ranking after every search,
+    until the request budget runs out or every term is covered. Returns the number of searches made.
+    """
+    batch_msg = f"Batch {batch_idx}"
+    terms = list(terms)
+    for request in range(max_requests):
+        ranked = planner.plan(terms)
+        if not ranked:
+            logger.info(f"{batch_msg} | Every term is searched or covered by earlier results")
+            return request
+        term, expected = ranked[0]
+
+        set_input(page, term, msg=batch_msg)
+        try:
+            results = get_results(page, msg=batch_msg)
+            rows = results["rows"]
+            total = (results["pagination"] or {}).get("total", len(rows))
+        except NotFoundException:
+            rows, total = [], 0
+        new_pairs = planner.record(term, rows, total)
+        logger.info(
+            f"{batch_msg} | '{term}': {len(rows)}/{total} rows, {new_pairs} new pairs "
+            f"(expected {expected:.1f}), {len(ranked) - 1} terms left"
+        )
+        get_random_delay(delay_range)
+    return max_requests
+
+
+def read_results(
+    page: Page,
+    timeout_ms: float = CONFIG["korpus_results_timeout_ms"],
+    previous: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Wait in the page for result rows other than the previous signature and return them with the
+    pager state, None if none show up in time. A timeout_ms of 0 reads the table as it is.
+    """
+    if not timeout_ms:
+        return page.evaluate(READ_RESULTS_JS, [RESULT_ROWS_SELECTOR, previous])
+    try:
+        handle = page.wait_for_function(
+            READ_RESULTS_JS,
+            arg=[RESULT_ROWS_SELECTOR, previous],
+            polling=CONFIG["output_poll_interval_ms"],
+            timeout=cap_timeout_ms(timeout_ms),
+        )
+    except PlaywrightTimeoutError:
+        return None
+    return handle.json_value()
 
 '''
     "television", "screen", "remote", "channel", "movie", "actor", "actress", "director", "scene", "script",
@@ -0,0 +1,259 @@
+import asyncio
+import queue
+import time
+
+from typing import Dict, List
+from playwright.async_api import async_playwright, Browser
+
+from constants.output import LOG_FILENAME, OUTPUT_FOLDER
+from constants.languages import SL, TL, OL
+from pw_context import launch_browser, new_browser_context
+from scrapper_config import CONFIG
+from scrapper_backends import get_backend, get_origin_interval_ranges
+from scrapper_google_translate_async import translate_sentence
+
+from logger import translation_logger
+from translator_maitre import (
+    BatchType,
+    TaskResultType,
+    chunk_planner,
+    failed_entries,
+    ledger,
+    merge_sentences,
+    prepare_ledger,
+    record_chunk_entries,
+    request_latencies,
+    reserve_from_cache,
+    save_final_results,
+    save_partial_result,
+    split_translation,
+    split_waited_pairs,
+)
+from exceptions.split_mismatch_exception import SplitMismatchException
+from utils.async_batch_scheduler import AsyncBatchScheduler
+from utils.rate_limiter import RateLimiter
+from utils.pw_async_helper import get_random_delay, handle_cookies_request, perform_action, take_screenshot
+from utils.result_sink import ResultSink
+from utils.txt_helper import clean_text
+'''
+Asyncio engine for the translator: a single event loop drives many pages through playwright.async_api.
+Concurrency is bounded by a semaphore (CONFIG["async_max_pages"]) instead of one OS thread per worker.
+Usage: python translator_async.py
+'''
+
+
+logger = translation_logger.get_logger(
+    output_folder=OUTPUT_FOLDER,
+    log_filename=LOG_FILENAME
+)
+
+STEALTH_INIT_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {get: () => false});
+    window.chrome = { runtime: {}, app: {}, LoadTimes: function(){} };
+    Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
+    Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
+"""
+
+# same name, origin and translation memory as the threaded Google Translate backend
+backend = get_backend("google_translate")
+scheduler = AsyncBatchScheduler(
+    max_workers=CONFIG["async_max_pages"],
+    rate_limiter=RateLimiter(
+        global_interval_range=CONFIG["backends_global_interval_range"],
+        origin_interval_ranges=get_origin_interval_ranges([backend]),
+    )
+)
+
+
+async def request_translation(page, merged_text: str, current_batch: int, batch_msg: str):
+    """Send one merged request, reloading between attempts; None once the attempts run out."""
+    for attempt in range(CONFIG["retry_attempts"]):
+        try:
+            return await translate_sentence(page=page, sentence=merged_text, batch_idx=current_batch)
+        except Exception as e:
+            logger.warning(f"{batch_msg} Attempt {attempt+1} failed for '{merged_text[:40]}...': {e}")
+            await get_random_delay(CONFIG["retry_delay_range"])
+            await perform_action(lambda: page.reload(), f"{batch_msg} reload", msg=batch_msg)
+
+    scheduler.increment_errors_count()
+    return None
+
+
+async def translate_chunk(page, chunk: BatchType, current_batch: int, batch_msg: str, depth: int = 0) -> List[Dict]:
+    """Async counterpart of translator_maitre.translate_chunk, bisecting chunks that don't split back cleanly."""
+    merged_text = merge_sentences([pair[0] for pair in chunk], msg=batch_msg)
+    if depth > 0:
+        await scheduler.ensure_batch_interval(batch_msg, origin=backend.origin)
+
+    translation = await request_translation(page, merged_text, current_batch, batch_msg)
+    if translation is None:
+        return failed_entries(chunk, f"[TRANSLATION FAILED] - {merged_text}")
+
+    try:
+        split_translations = split_translation(translation, len(chunk), msg=batch_msg)
+        chunk_planner.record_split(ok=True, msg=batch_msg)
+    except SplitMismatchException as e:
+        chunk_planner.record_split(ok=False, msg=batch_msg)
+        if not CONFIG["bisect_on_mismatch"]:
+            raise
+        if len(chunk) == 1 or depth >= CONFIG["bisect_max_depth"]:
+            logger.warning(f"{batch_msg} {e.message}. Giving up on {len(chunk)} sentences at depth {depth}.")
+            scheduler.increment_errors_count()
+            return failed_entries(chunk, f"[SPLIT MISMATCH] - {merged_text}")
+        middle = len(chunk) // 2
+        logger.warning(f"{batch_msg} {e.message}. Bisecting {len(chunk)} sentences into {middle} + {len(chunk) - middle}...")
+        return (
+            await translate_chunk(page, chunk[:middle], current_batch, batch_msg, depth + 1)
+            + await translate_chunk(page, chunk[middle:], current_batch, batch_msg, depth + 1)
+        )
+
+    return [{
+        SL: " ".join(pair[0].split()),
+        TL: clean_text(translated),
+        OL: " ".join(pair[1].split())
+    } for pair, translated in zip(chunk, split_translations)]
+
+
+async def translate_chunks(page, pairs: BatchType, task_id: int, batch_msg: str, results_list: List[Dict]) -> None:
+    chunked_sentences = chunk_planner.plan(pairs, msg=batch_msg)
+
+    for i, chunk in enumerate(chunked_sentences):
+        try:
+            await scheduler.ensure_batch_interval(batch_msg, origin=backend.origin)
+            if scheduler.check_errors_limit():
+                logger.error(f"{batch_msg} Too many errors, adding pause...")
+                await get_random_delay(CONFIG["new_request_delay_range"], fatigue=2, msg=f"{batch_msg}: Cooling down after errors")
+                scheduler.reset_errors_count()
+
+            logger.info(f"{batch_msg} Translating {i + 1}/{len(chunked_sentences)}: {len(chunk)} sentences...")
+            chunk_start_time = time.perf_counter()
+            chunk_entries = await translate_chunk(page, chunk, task_id, batch_msg)
+            record_chunk_entries(chunk, chunk_entries, backend, latency=time.perf_counter() - chunk_start_time)
+            results_list.extend(chunk_entries)
+        except Exception as e:
+            error_msg = f"Unexpected error: {e}"
+            logger.error(f"{batch_msg} {error_msg}")
+            await take_screenshot(page, filename=error_msg, msg_prefix=batch_msg)
+            scheduler.increment_errors_count()
+            chunk_entries = failed_entries(chunk, "[ERROR]")
+            ledger.record_chunk(chunk, chunk_entries, backend=backend.name)
+            results_list.extend(chunk_entries)
+        # not in a finally: a cancelled batch (CancelledError) leaves right away without entries for this chunk
+        await get_random_delay(CONFIG["new_request_delay_range"])
+
+
+async def collect_from_cache(waiting_pairs, batch_msg: str = ''):
+    """Await the sentences another batch is translating without blocking the event loop."""
+    translations = []
+    for pair, future in waiting_pairs:
+        try:
+            # shield: a timeout must not cancel the future other waiters share
+            translations.append(await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), CONFIG["tm_cache_wait_s"]))
+        except asyncio.TimeoutError:
+            logger.warning(f"{batch_msg} Timed out waiting for another batch to translate: {pair[0][:40]}...")
+            translations.append(None)
+    return split_waited_pairs(waiting_pairs, translations)
+
+
+async def translate_batch(
+    browser: Browser,
+    semaphore: asyncio.Semaphore,
+    task_id: int,
+    total_of_batches: int) -> TaskResultType:
+
+    batch_msg = f"Page | Batch {task_id}/{total_of_batches} | "
+    results_list: List[Dict] = []
+
+    async with semaphore:
+        # claiming only once a page slot is free keeps the other rows available after a crash
+        batch = ledger.claim_batch(CONFIG["batch_size"], worker="async")
+        if not batch:
+            return {"worker_id": 0, "task_id": task_id, "entries": results_list}
+
+        cached_entries, waiting_pairs, pairs_to_translate, owned = reserve_from_cache(batch, backend, batch_msg)
+        results_list.extend(cached_entries)
+        if not pairs_to_translate and not waiting_pairs:
+            return {"worker_id": 0, "task_id": task_id, "entries": results_list}
+
+        await scheduler.ensure_batch_interval(batch_msg, origin=backend.origin)
+        # pw_context builds the options; with an async browser the call returns an awaitable
+        context = await new_browser_context(browser=browser, msg_prefix=batch_msg)
+        try:
+            page = await context.new_page()
+            await page.add_init_script(STEALTH_INIT_SCRIPT)
+
+            logger.info(f"{batch_msg} {len(pairs_to_translate)} sentences")
+            await perform_action(lambda: page.goto(backend.get_url(SL, TL), timeout=CONFIG["page_timeout_ms"]), f"{batch_msg} goto", msg=batch_msg)
+            await handle_cookies_request(page=page, batch_msg=batch_msg)
+
+            await translate_chunks(page, pairs_to_translate, task_id, batch_msg, results_list)
+            backend.cache.abandon(owned)
+
+            waited_entries, leftovers = await collect_from_cache(waiting_pairs, batch_msg)
+            results_list.extend(waited_entries)
+            if leftovers:
+                await translate_chunks(page, leftovers, task_id, batch_msg, results_list)
+        finally:
+            backend.cache.abandon(owned)
+            await context.close()
+
+    # the pause happens outside of the semaphore so another batch can use the slot
+    await scheduler.ensure_interval_before_next_batch(total_of_batches, batch_msg)
+    return {"worker_id": 0, "task_id": task_id, "entries": results_list}
+
+
+async def run(headless: bool = True) -> None:
+    run_started_at = time.time()
+    claimable = prepare_ledger()
+    number_of_batches = -(-claimable // CONFIG["batch_size"])
+    total_of_batches = number_of_batches + 1
+    columns = [SL, TL, OL]
+
+    max_pages = min(CONFIG["async_max_pages"], total_of_batches)
+    scheduler.set_max_workers(max_pages)
+    semaphore = asyncio.Semaphore(max_pages)
+    logger.info(f"Starting async engine with {max_pages} concurrent pages and {number_of_batches} batches.")
+
+    result_queue = queue.Queue()
+    sink = ResultSink(
+        result_queue=result_queue,
+        columns=columns,
+        filename=f"{SL}_{TL}_{OL}_stream",
+        on_batch=lambda result: save_partial_result(result, total_of_batches, columns),
+    )
+    sink.start()
+
+    start_time = time.perf_counter()
+    async with async_playwright() as p:
+        browser = await launch_browser(playwright=p, headless=headless)
+        try:
+            tasks = [
+                asyncio.create_task(translate_batch(browser, semaphore, task_id, total_of_batches))
+                for task_id in range(1, number_of_batches + 1)
+            ]
+            for finished in asyncio.as_completed(tasks):
+                try:
+                    result = await finished
+                except Exception as e:
+                    logger.error(f"Async batch failed: {e}")
+                    continue
+                if result["entries"]:
+                    result_queue.put(result)
+        finally:
+            await browser.close()
+
+    sink.stop()
+    elapsed = time.perf_counter() - start_time
+    logger.info(f"Async engine finished {sink.get_stats()['total']:,} sentences in {elapsed:.1f}s")
+    logger.info(f"Translation cache: {backend.cache.get_stats()}")
+    logger.info(f"Scheduler: {scheduler.get_stats()}")
+    logger.info(f"Request latencies: {request_latencies.get_stats()}")
+    save_final_results([sink.jsonl_path], [sink.failed_path], columns, run_started_at)
+
+
+def main():
+    asyncio.run(run(headless=True))
+
+
+if __name__ == "__main__":
+    main()
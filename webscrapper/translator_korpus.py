@@ -0,0 +1,46 @@
+from constants.languages import SL, TL
+from constants.output import LOG_FILENAME, OUTPUT_FOLDER
+from pw_browser_pool import BrowserPool
+from scrapper_backends import get_backend
+from scrapper_config import CONFIG
+from scrapper_korpus_kernewek import harvest, wordbank
+from utils.json_helper import save_batch_to_json
+from utils.pw_helper import handle_cookies_request, perform_action
+from utils.query_planner import QueryPlanner
+
+from logger import translation_logger
+'''
+Harvests English-Cornish pairs from Korpus Kernewek. The wordbank is searched in the order the query
+planner expects to add the most new pairs; every search and pair is kept in korpus_queries.sqlite3,
+so a later run only spends requests on terms that still add corpus.
+Usage: python translator_korpus.py
+'''
+
+logger = translation_logger.get_logger(
+    output_folder=OUTPUT_FOLDER,
+    log_filename=LOG_FILENAME
+)
+
+
+def main():
+    backend = get_backend("korpus_kernewek")
+    planner = QueryPlanner()
+    browser_pool = BrowserPool(headless=True)
+    msg = "Korpus |"
+
+    try:
+        with browser_pool.new_context(headless=True, msg_prefix=msg) as context:
+            page = context.new_page()
+            perform_action(lambda: page.goto(backend.get_url(SL, TL), timeout=CONFIG["page_timeout_ms"]), f"{msg} goto", msg=msg)
+            handle_cookies_request(page=page, batch_msg=msg)
+            requests = harvest(page, planner, terms=wordbank, delay_range=backend.request_delay_range)
+    finally:
+        browser_pool.close_worker(msg_prefix=msg)
+
+    logger.info(f"{msg} {requests} searches, planner: {planner.get_stats()}")
+    save_batch_to_json(batch_results=list(planner.iter_pairs()), filename="korpus_kernewek_pairs")
+    planner.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,48 @@
 
+import itertools
 import pandas as pd
 import os
 import random
 import queue
 import threading
+import time
 
+from pathlib import Path
 from datasets import Dataset, load_dataset
-from playwright.sync_api import sync_playwright
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from playwright.sync_api import Page
 from typing import Dict, List, Tuple, Optional, TypedDict
 
 from constants.output import LOG_FILENAME, OUTPUT_FOLDER
 from constants.languages import SL, TL, OL
+from exceptions.deadline_exceeded_exception import DeadlineExceededException
 from exceptions.not_found_exception import NotFoundException
-from pw_context import get_new_context
+from exceptions.page_crashed_exception import PageCrashedException
+from exceptions.split_mismatch_exception import SplitMismatchException
+from pw_browser_pool import BrowserPool
+from pw_page_session import PageSession, is_page_crash
 from scrapper_config import CONFIG
-from scrapper_google_translate import get_url, translate_sentence
-# from scrapper_korpus_kernewek import get_url, translate_sentence
+from scrapper_backends import Backend, assign_workers, get_enabled_backends, get_origin_interval_ranges, get_target_languages
 # from scrapper_korpus_kernewek import wordbank
 
 from logger import translation_logger
 from utils.batch_scheduler import BatchScheduler
-from utils.csv_helper import save_batch_to_csv
-from utils.json_helper import save_batch_to_json
+from utils.rate_limiter import RateLimiter
+from utils.chunk_planner import ChunkPlanner
+from utils.deadline import HangWatchdog, current_deadline, deadline_scope
+from utils.csv_helper import save_batch_to_csv, stream_batches_to_csv
+from utils.json_helper import iter_jsonl, save_batch_to_json, stream_batches_to_json
 from utils.list_helper import remove_duplicates_from_list
-from utils.pw_helper import handle_cookies_request, take_screenshot, get_random_delay, perform_action
+from utils.result_sink import ResultSink, is_failed_entry
+from utils.latency_recorder import LatencyRecorder
+from utils.retry_queue import RetryQueue
+from utils.pw_helper import apply_deadline_timeouts, take_screenshot, get_random_delay, perform_action
 from utils.txt_helper import clean_text, get_last_directory_alphabetic
+from utils.work_ledger import DONE, WorkLedger, normalize_sentence
 from utils.worker_helper import get_latest_iteration
 '''
-Translator using Google Translate via Playwright.
+Translator using the backends enabled in CONFIG["backends"] (Google Translate by default) via Playwright.
 Translates sentences from a Parquet dataset and saves results in CSV and JSON formats.
 '''
 
@@ -53,8 +67,25 @@ logger = translation_logger.get_logger(
 
 MERGE_SYMBOL = "<|||>"  # Symbol to merge multiple sentences
 
+chunk_planner = ChunkPlanner(separator=f" {MERGE_SYMBOL} ")
+chunk_planners: Dict[str, ChunkPlanner] = {}
 
-scheduler = BatchScheduler(max_workers=CONFIG["max_workers"])
+backends = get_enabled_backends()
+
+# each backend is paced on its own origin, so their throughputs add up
+scheduler = BatchScheduler(
+    max_workers=CONFIG["max_workers"],
+    rate_limiter=RateLimiter(
+        global_interval_range=CONFIG["backends_global_interval_range"],
+        origin_interval_ranges=get_origin_interval_ranges(backends),
+    )
+)
+browser_pool = BrowserPool(headless=True)
+ledger = WorkLedger()
+retry_queue = RetryQueue()
+request_latencies = LatencyRecorder()
+watchdog = HangWatchdog()
+task_counter = itertools.count(1)
 
 def clean_corpus_entries(entries):
     """
@@ -94,136 +125,461 @@ def puppeter_browser(
     current_batch: int,
     total_of_batches: int,
     batch_msg: str,
-    results_list: List[Dict] = [],
+    backend: Backend,
+    results_list: Optional[List[Dict]] = None,
     headless: bool = True):
     
-    scheduler.ensure_batch_interval(batch_msg)  
-    with sync_playwright() as p:
-        browser, context = get_new_context(playwright=p, headless=headless, msg_prefix=batch_msg)
-        page = context.new_page()
-        
-        page.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', {get: () => false});
-            window.chrome = { runtime: {}, app: {}, LoadTimes: function(){} };
-            Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
-            Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
-        """)        
-        
-     
-        logger.info(f"{batch_msg} {len(batch)} sentences")
-        perform_action(lambda: page.goto(get_url(SL, TL), timeout=CONFIG["page_timeout_ms"]), f"{batch_msg} goto")
-        handle_cookies_request(page=page, batch_msg=batch_msg)
-        
-        sentences_per_request = random.randint(*CONFIG["sentences_per_request_range"])
-        chunked_sentences = [batch[i:i + sentences_per_request] for i in range(0, len(batch), sentences_per_request)]
-        logger.debug(f"{batch_msg} Chunked_sentences: {len(batch)} elements")
-       
-        for i, chunk in enumerate(chunked_sentences):  
+    if results_list is None:
+        results_list = []
+
+    # sentences already in the translation memory never reach a chunk
+    cached_entries, waiting_pairs, pairs_to_translate, owned = reserve_from_cache(batch, backend, batch_msg)
+    results_list.extend(cached_entries)
+    if not pairs_to_translate and not waiting_pairs and not retry_queue.has_ready(backend.name):
+        logger.info(f"{batch_msg} All {len(batch)} sentences served from the translation cache")
+        return results_list
+
+    batch_deadline = None
+    crashed = False
+    try:
+        scheduler.ensure_batch_interval(batch_msg, origin=backend.origin)  
+        with deadline_scope(CONFIG["batch_deadline_s"], label=batch_msg.strip()) as batch_deadline, watchdog.watch(batch_deadline), \
+                PageSession(browser_pool, backend.get_url(SL, TL), headless=headless, msg_prefix=batch_msg) as session:
+            logger.info(f"{batch_msg} {len(pairs_to_translate)} sentences")
             try:
-                scheduler.ensure_batch_interval(batch_msg) 
-                if scheduler.check_errors_limit():
-                    error_msg = "Too many errors, adding pause..."
-                    logger.error(f"{batch_msg} {error_msg}")
-                    take_screenshot(page, filename=error_msg, msg_prefix=batch_msg)                   
-                   
-                    get_random_delay(CONFIG["new_request_delay_range"], fatigue=2, msg=f"{batch_msg}: Cooling down after errors")
-                    scheduler.reset_errors_count()
-                logger.debug(f"{batch_msg} Translating {len(chunk)} sentences per request")
-
-                merged_text = merge_sentences([pair[0] for pair in chunk], msg=batch_msg)
-                logger.info(f"{batch_msg} Translating {i + 1}/{len(chunked_sentences)}: {merged_text}...")
-            
-                for attempt in range(CONFIG["retry_attempts"]):
-                    try:
-                        translation = translate_sentence(page=page, sentence=merged_text, batch_idx=current_batch)
-                        break
-                    except Exception as e:
-                        if(isinstance(e, NotFoundException)):
-                            logger.warning(e.message + f" - {merged_text}")
-                            translation = f"[NOT FOUND] - {merged_text}"
-                            take_screenshot(page, filename=f"{e.message}", msg_prefix=batch_msg)
-                            break
-                        logger.warning(f"{batch_msg} Attempt {attempt+1} failed for '{merged_text[:40]}...': {e}")
-                      
-                        get_random_delay(CONFIG["retry_delay_range"])
-                        page.reload()
-                        get_random_delay(CONFIG["retry_delay_range"])
-                        # checks if it's the last attempt
-                        if attempt == CONFIG["retry_attempts"] - 1:
-                            translation = f"[TRANSLATION FAILED] - {merged_text}"
-                            scheduler.increment_errors_count()
-                logger.debug(f"{batch_msg} translation type: {type(translation)}")
-                if isinstance(translation, tuple):
-                    logger.debug(f"{batch_msg} Translation {translation}")
-                    source_texts, target_texts = translation[0], translation[1]
-                    
-                    for i, (sl, tl) in enumerate(zip(source_texts, target_texts)):
-                        results_list.append({    
-                            SL: sl.strip() if sl else "",
-                            TL: tl.strip() if tl else "",
-                            OL: merged_text.strip()
-                        })
-                else: 
-                    split_translations = split_translation(translation, len(chunk), msg=batch_msg)
-
-                    for i, translation in enumerate(split_translations):
-                        
-                        results_list.append({    
-                            SL: " ".join(chunk[i][0].split()),
-                            TL: clean_text(translation),
-                            OL: " ".join(chunk[i][1].split())
-                        })
+                translate_chunks(session, pairs_to_translate, current_batch, batch_msg, backend, results_list)
+                # whatever failed is released before waiting, duplicates inside this batch may be waiting on it
+                backend.cache.abandon(owned)
+
+                # sentences another worker was already translating; whatever it gave up on is done here
+                waited_entries, leftovers = collect_from_cache(waiting_pairs, batch_msg, backend=backend)
+                results_list.extend(waited_entries)
+                if leftovers:
+                    logger.info(f"{batch_msg} Translating {len(leftovers)} sentences released by other workers")
+                    translate_chunks(session, leftovers, current_batch, batch_msg, backend, results_list)
+
+                # failed chunks of any worker whose backoff has expired by now
+                drain_retry_queue(session, current_batch, batch_msg, backend, results_list)
+            except PageCrashedException as e:
+                # the chunks not translated are in the retry queue, the ones translated stay in this batch's results
+                logger.error(f"{batch_msg} {e.message}. Ending the batch with {len(results_list)} entries")
+                crashed = True
+
+            logger.debug(f"{batch_msg} Filtering logs.")
+            batch_msg = batch_msg.split('|')[0]
+
+                                
+            translation_logger.filter_log(
+                filter_func=lambda line: batch_msg in line,
+                new_filename=batch_msg if scheduler.get_errors_count() < 1 else f"{batch_msg}_err",
+                output_folder="filtered_logs",
+                msg=batch_msg
+            )
+    finally:
+        # wake up the workers waiting on sentences this batch didn't translate
+        backend.cache.abandon(owned)
+        # a page stuck past its deadline or crashing over and over may have left the browser unusable, the next batch gets a new one
+        if crashed or (batch_deadline is not None and batch_deadline.hung):
+            browser_pool.discard_browser(msg_prefix=batch_msg)
+    
+    # the context is already closed here, so the pooled browser idles during the pause
+    scheduler.ensure_interval_before_next_batch(total_of_batches, batch_msg)
+          
+    return results_list
+
+
+def get_chunk_planner(backend: Backend) -> ChunkPlanner:
+    """Backends with a request budget of their own get their own planner, the others share chunk_planner."""
+    if (backend.char_budget, backend.max_sentences) == (chunk_planner.char_budget, chunk_planner.max_sentences):
+        return chunk_planner
+    planner = chunk_planners.get(backend.name)
+    if planner is None:
+        planner = chunk_planners.setdefault(backend.name, ChunkPlanner(
+            separator=chunk_planner.separator,
+            char_budget=backend.char_budget,
+            max_sentences=backend.max_sentences,
+        ))
+    return planner
+
+
+def translate_chunks(session: PageSession, pairs: BatchType, current_batch: int, batch_msg: str, backend: Backend, results_list: List[Dict]) -> None:
+    """
+    Plan the pairs into requests and translate them one by one; failed requests go to the retry queue,
+    and so do the requests not started yet when the page can't be rebuilt any more.
+    """
+    chunked_sentences = get_chunk_planner(backend).plan(pairs, msg=batch_msg)
+    logger.debug(f"{batch_msg} Chunked_sentences: {len(pairs)} elements into {len(chunked_sentences)} requests")
+   
+    for i, chunk in enumerate(chunked_sentences):  
+        if batch_deadline_exceeded(chunked_sentences[i:], backend, batch_msg):
+            return
+        logger.info(f"{batch_msg} Translating {i + 1}/{len(chunked_sentences)}: {len(chunk)} sentences...")
+        try:
+            run_chunk(session, chunk, current_batch, batch_msg, backend, results_list)
+        except PageCrashedException:
+            for remaining_chunk in chunked_sentences[i + 1:]:
+                retry_queue.push(remaining_chunk, 0, error="page crashed before the request", msg=batch_msg, backend=backend.name)
+            raise
 
+
+def run_chunk(session: PageSession, chunk: BatchType, current_batch: int, batch_msg: str, backend: Backend, results_list: List[Dict], attempts: int = 0) -> None:
+    """
+    Translate one chunk on the session's page. When the page crashed under it, the page is rebuilt
+    and the same chunk translated again on it; past the session's recoveries the chunk goes to the
+    retry queue and PageCrashedException ends the batch.
+    """
+    try:
+        while True:
+            try:
+                results_list.extend(translate_chunk(page=session.page, chunk=chunk, current_batch=current_batch, batch_msg=batch_msg, backend=backend, attempts=attempts))
+                session.save_state()
+                break
+            except PageCrashedException:
+                raise
             except Exception as e:
-                error_msg = f"Unexpected error: {e}"
-                logger.error(f"{batch_msg} {error_msg}")
-                take_screenshot(page, filename=error_msg, msg_prefix=batch_msg   )
-                scheduler.increment_errors_count()
-                results_list.append({f"{SL}": chunk[i][0], f"{TL}": "[ERROR]", f"{OL}": chunk[i][1]})
-            finally:
-                # Random delay between requests
-                get_random_delay(CONFIG["new_request_delay_range"])
-        
+                if not session.is_crash(e):
+                    raise
+                session.recover(error=e, msg=batch_msg)
+                logger.warning(f"{batch_msg} Resuming {len(chunk)} sentences on the rebuilt page")
+
+    except PageCrashedException as e:
+        # counted as an attempt: a chunk that keeps killing the renderer ends up in the requeue file
+        retry_queue.push(chunk, attempts + 1, error=e.message, msg=batch_msg, backend=backend.name)
+        raise
+    except DeadlineExceededException as e:
+        # the batch ran out of time around the request: no reload, another worker retries the chunk
+        logger.warning(f"{batch_msg} {e.message}")
+        if not retry_queue.push(chunk, attempts + 1, error=e.message, msg=batch_msg, backend=backend.name):
+            chunk_entries = failed_entries(chunk, "[DEADLINE EXCEEDED]")
+            results_list.extend(chunk_entries)
+            ledger.record_chunk(chunk, chunk_entries, backend=backend.name)
+    except Exception as e:
+        error_msg = f"Unexpected error: {e}"
+        logger.error(f"{batch_msg} {error_msg}")
+        take_screenshot(session.page, filename=error_msg, msg_prefix=batch_msg   )
+        scheduler.increment_errors_count()
+        chunk_entries = failed_entries(chunk, "[ERROR]")
+        results_list.extend(chunk_entries)
+        ledger.record_chunk(chunk, chunk_entries, backend=backend.name)
+    finally:
+        # Random delay between requests
+        get_random_delay(backend.request_delay_range)
+
+
+def batch_deadline_exceeded(chunks: List[BatchType], backend: Backend, batch_msg: str = '') -> bool:
+    """Past the batch deadline, hand the chunks not started yet to the retry queue instead of starting them."""
+    deadline = current_deadline()
+    if deadline is None or not deadline.expired:
+        return False
+    logger.warning(f"{batch_msg} Batch deadline of {deadline.budget_s:.0f}s exceeded, {len(chunks)} chunks go to the retry queue")
+    for chunk in chunks:
+        retry_queue.push(chunk, 0, error="batch deadline exceeded before the request", msg=batch_msg, backend=backend.name)
+    return True
+
+
+def reserve_from_cache(batch: BatchType, backend: Backend, batch_msg: str = '') -> Tuple[List[Dict], List[Tuple[Tuple[str, str], Future]], BatchType, Dict[str, Future]]:
+    """
+    Split a claimed batch into entries answered by the translation cache, pairs whose sentence
+    is already being translated (with the future to wait on) and pairs this worker has to translate.
+    Cache hits are recorded in the ledger straight away.
+    """
+    if not CONFIG["tm_cache_enabled"]:
+        return [], [], list(batch), {}
+
+    cached, waiting, owned = backend.cache.reserve(pair[0] for pair in batch)
+    # when the backend fans out, a hit needs every target language, the others are translated again
+    extras = get_extra_translations(list(cached), backend)
+    cached_pairs: BatchType = []
+    waiting_pairs: List[Tuple[Tuple[str, str], Future]] = []
+    pairs_to_translate: BatchType = []
+    first_owner = set()
+    for pair in batch:
+        if pair[0] in cached and pair[0] in extras:
+            cached_pairs.append(pair)
+        elif pair[0] in waiting:
+            waiting_pairs.append((pair, waiting[pair[0]]))
+        elif pair[0] in first_owner:
+            # same sentence twice in the batch: the second pair waits on the first one's request
+            waiting_pairs.append((pair, owned[pair[0]]))
+        else:
+            first_owner.add(pair[0])
+            pairs_to_translate.append(pair)
+
+    cached_entries = [cache_entry(pair, cached[pair[0]], extras[pair[0]]) for pair in cached_pairs]
+    if cached_entries:
+        ledger.record_chunk(cached_pairs, cached_entries, backend="cache")
+    logger.info(
+        f"{batch_msg} Translation cache: {len(cached_pairs)} hits, "
+        f"{len(waiting_pairs)} in flight elsewhere, {len(pairs_to_translate)} to translate"
+    )
+    return cached_entries, waiting_pairs, pairs_to_translate, owned
+
+
+def collect_from_cache(waiting_pairs: List[Tuple[Tuple[str, str], Future]], batch_msg: str = '', backend: Optional[Backend] = None) -> Tuple[List[Dict], BatchType]:
+    """Wait for the sentences other workers were translating; returns their entries and the pairs left untranslated."""
+    translations = []
+    for pair, future in waiting_pairs:
+        try:
+            translations.append(future.result(timeout=CONFIG["tm_cache_wait_s"]))
+        except FutureTimeoutError:
+            logger.warning(f"{batch_msg} Timed out waiting for another worker to translate: {pair[0][:40]}...")
+            translations.append(None)
+    return split_waited_pairs(waiting_pairs, translations, backend=backend)
+
+
+def split_waited_pairs(
+    waiting_pairs: List[Tuple[Tuple[str, str], Future]],
+    translations: List[Optional[str]],
+    backend: Optional[Backend] = None) -> Tuple[List[Dict], BatchType]:
+    """Turn the waited-on results into entries; pairs whose owner gave up (or lost a target language) come back as leftovers."""
+    extras = get_extra_translations([pair[0] for (pair, _), translation in zip(waiting_pairs, translations) if translation is not None], backend)
+    answered: BatchType = []
+    entries: List[Dict] = []
+    leftovers: BatchType = []
+    for (pair, _), translation in zip(waiting_pairs, translations):
+        if translation is None or pair[0] not in extras:
+            leftovers.append(pair)
+        else:
+            answered.append(pair)
+            entries.append(cache_entry(pair, translation, extras[pair[0]]))
+    if entries:
+        ledger.record_chunk(answered, entries, backend="cache")
+    return entries, leftovers
+
 
-        logger.debug(f"{batch_msg} Filtering logs.")
-        batch_msg = batch_msg.split('|')[0]
+def get_extra_translations(sentences: List[str], backend: Optional[Backend] = None) -> Dict[str, Dict[str, str]]:
+    """{sentence: {language: translation}} of the sentences cached in every target language of the backend besides TL."""
+    found: Dict[str, Dict[str, str]] = {sentence: {} for sentence in sentences}
+    for language in (backend.target_languages[1:] if backend else []):
+        cached = backend.get_cache(language).get_many(found)
+        found = {sentence: {**translations, language: cached[sentence]} for sentence, translations in found.items() if sentence in cached}
+    return found
 
-                            
-        translation_logger.filter_log(
-            filter_func=lambda line: batch_msg in line,
-            new_filename=batch_msg if scheduler.get_errors_count() < 1 else f"{batch_msg}_err",
-            output_folder="filtered_logs",
-            msg=batch_msg
+
+def cache_entry(pair: Tuple[str, str], translation: str, extras: Optional[Dict[str, str]] = None) -> Dict:
+    return {SL: " ".join(pair[0].split()), TL: translation, **(extras or {}), OL: " ".join(pair[1].split())}
+
+
+def store_in_cache(chunk: BatchType, entries: List[Dict], backend: Backend) -> None:
+    """Put the successful translations of a chunk in the translation cache, one per target language."""
+    if not CONFIG["tm_cache_enabled"]:
+        return
+    successful = {normalize_sentence(entry.get(SL, "")): entry for entry in entries if not is_failed_entry(entry)}
+    # TL last: storing it wakes up the workers waiting on these sentences, the other languages must be there by then
+    for language in backend.target_languages[::-1]:
+        translations = {
+            pair[0]: successful[normalize_sentence(pair[0])][language]
+            for pair in chunk
+            if normalize_sentence(pair[0]) in successful and language in successful[normalize_sentence(pair[0])]
+        }
+        backend.get_cache(language).put(translations)
+
+
+def failed_entries(chunk: BatchType, marker: str) -> List[Dict]:
+    return [{SL: pair[0], TL: marker, OL: pair[1]} for pair in chunk]
+
+
+def record_chunk_entries(chunk: BatchType, entries: List[Dict], backend: Backend, latency: Optional[float] = None) -> List[Dict]:
+    """Record a finished request in the ledger and the backend's translation cache."""
+    ledger.record_chunk(chunk, entries, backend=backend.name, latency=latency)
+    request_latencies.record(latency, backend.name)
+    store_in_cache(chunk, entries, backend)
+    return entries
+
+
+def translate_chunk(page: Page, chunk: BatchType, current_batch: int, batch_msg: str, backend: Backend, depth: int = 0, attempts: int = 0) -> List[Dict]:
+    """
+    Translate a chunk as one merged request and record the outcome. A failed request doesn't retry
+    in place: the chunk goes to the shared retry queue with a backoff and no entries are returned.
+    When the output doesn't split back into one part per sentence, the chunk is bisected and each
+    half translated on its own, recursively, so every half that splits cleanly is kept.
+    """
+    merged_text = merge_sentences([pair[0] for pair in chunk], msg=batch_msg)
+    logger.debug(f"{batch_msg} Translating {len(chunk)} sentences per request (depth {depth}): {merged_text}...")
+
+    # while the site keeps failing every worker on it waits here, then probes one request at a time
+    breaker = scheduler.get_breaker(backend.name, backend.origin)
+    try:
+        breaker.acquire(msg=batch_msg)
+        try:
+            scheduler.ensure_batch_interval(batch_msg, origin=backend.origin)
+        except DeadlineExceededException:
+            breaker.release(msg=batch_msg)
+            raise
+    except DeadlineExceededException as e:
+        # nothing was sent: only this slice goes back, the halves of a bisection already done are kept
+        logger.warning(f"{batch_msg} {e.message} before the request, {len(chunk)} sentences go to the retry queue")
+        if retry_queue.push(chunk, attempts, error=e.message, msg=batch_msg, backend=backend.name):
+            return []
+        return record_chunk_entries(chunk, failed_entries(chunk, f"[DEADLINE EXCEEDED] - {merged_text}"), backend)
+    request_start_time = time.perf_counter()
+    try:
+        # every wait of the request is capped by the chunk deadline, itself capped by the batch one
+        with deadline_scope(backend.chunk_deadline_s, label=f"{batch_msg.strip()} chunk of {len(chunk)}") as chunk_deadline, watchdog.watch(chunk_deadline):
+            apply_deadline_timeouts(page)
+            if len(backend.target_languages) > 1:
+                # the merged input is entered once and read back in every target language
+                translation = backend.translate_targets(page=page, sentence=merged_text, batch_idx=current_batch, target_languages=backend.target_languages)
+            elif backend.translate_batch:
+                # backends that translate a list themselves skip the merge symbol round-trip
+                translation = backend.translate_batch(page=page, sentences=[pair[0] for pair in chunk], batch_idx=current_batch)
+            else:
+                translation = backend.translate_sentence(page=page, sentence=merged_text, batch_idx=current_batch)
+    except NotFoundException as e:
+        breaker.record(ok=True, msg=batch_msg)
+        logger.warning(e.message + f" - {merged_text}")
+        take_screenshot(page, filename=f"{e.message}", msg_prefix=batch_msg)
+        return record_chunk_entries(chunk, failed_entries(chunk, f"[NOT FOUND] - {merged_text}"), backend)
+    except DeadlineExceededException as e:
+        # reloading would spend the batch's remaining time on a page that may be stuck
+        logger.warning(f"{batch_msg} Attempt {attempts + 1} for '{merged_text[:40]}...': {e.message}")
+        breaker.record(ok=False, msg=batch_msg)
+        scheduler.increment_errors_count()
+        if retry_queue.push(chunk, attempts + 1, error=e.message, msg=batch_msg, backend=backend.name):
+            return []
+        return record_chunk_entries(chunk, failed_entries(chunk, f"[DEADLINE EXCEEDED] - {merged_text}"), backend)
+    except Exception as e:
+        if is_page_crash(page, e):
+            # our browser failed, not the site: run_chunk rebuilds the page and translates the chunk again
+            breaker.release(msg=batch_msg)
+            raise
+        logger.warning(f"{batch_msg} Attempt {attempts + 1} failed for '{merged_text[:40]}...': {e}")
+        breaker.record(ok=False, msg=batch_msg)
+        scheduler.increment_errors_count()
+        try:
+            perform_action(lambda: page.reload(), f"{batch_msg} reload", msg=batch_msg)
+        except DeadlineExceededException as reload_error:
+            # past the batch deadline only this slice goes back, the halves of a bisection already done are kept
+            logger.warning(f"{batch_msg} Skipping the reload: {reload_error.message}")
+        if retry_queue.push(chunk, attempts + 1, error=str(e), msg=batch_msg, backend=backend.name):
+            # the pairs stay in flight in the ledger until a worker picks the retry up
+            return []
+        return record_chunk_entries(chunk, failed_entries(chunk, f"[TRANSLATION FAILED] - {merged_text}"), backend)
+    finally:
+        # back to the batch deadline for the actions between requests
+        apply_deadline_timeouts(page)
+    latency = time.perf_counter() - request_start_time
+    # the site answered; a split mismatch is the merge symbol's fault, not the site's
+    breaker.record(ok=True, msg=batch_msg)
+
+    logger.debug(f"{batch_msg} translation type: {type(translation)}")
+    if isinstance(translation, tuple):
+        logger.debug(f"{batch_msg} Translation {translation}")
+        source_texts, target_texts = translation[0], translation[1]
+        return record_chunk_entries(chunk, [{    
+            SL: sl.strip() if sl else "",
+            TL: tl.strip() if tl else "",
+            OL: merged_text.strip()
+        } for sl, tl in zip(source_texts, target_texts)], backend, latency=latency)
+
+    planner = get_chunk_planner(backend)
+    if isinstance(translation, list) and len(translation) == len(chunk) and None in translation and depth < CONFIG["bisect_max_depth"]:
+        translated_pairs = [(pair, translated) for pair, translated in zip(chunk, translation) if translated is not None]
+        if translated_pairs:
+            # realigned by id: keep what came back and send only the lost sentences again
+            missing = [pair for pair, translated in zip(chunk, translation) if translated is None]
+            logger.warning(f"{batch_msg} {len(missing)}/{len(chunk)} sentences missing from the batch translation, translating them again...")
+            planner.record_split(ok=False, msg=batch_msg)
+            return (
+                record_chunk_entries([pair for pair, _ in translated_pairs], translated_entries(translated_pairs), backend, latency=latency)
+                + translate_chunk(page, missing, current_batch, batch_msg, backend, depth + 1, attempts)
+            )
+
+    try:
+        if isinstance(translation, dict):
+            split_translations = {
+                language: split_translation(text, len(chunk), msg=f"{batch_msg} [{language}]")
+                for language, text in translation.items()
+            }
+        elif isinstance(translation, list):
+            split_translations = translation
+            if len(split_translations) != len(chunk) or None in split_translations:
+                translated_count = sum(translated is not None for translated in split_translations)
+                raise SplitMismatchException(len(chunk), translated_count, message=f"{batch_msg} Batch translation count mismatch")
+        else:
+            split_translations = split_translation(translation, len(chunk), msg=batch_msg)
+        planner.record_split(ok=True, msg=batch_msg)
+    except SplitMismatchException as e:
+        planner.record_split(ok=False, msg=batch_msg)
+        if not CONFIG["bisect_on_mismatch"]:
+            raise
+        if len(chunk) == 1 or depth >= CONFIG["bisect_max_depth"]:
+            # only this slice is lost, the halves that split cleanly are kept
+            logger.warning(f"{batch_msg} {e.message}. Giving up on {len(chunk)} sentences at depth {depth}.")
+            scheduler.increment_errors_count()
+            return record_chunk_entries(chunk, failed_entries(chunk, f"[SPLIT MISMATCH] - {merged_text}"), backend, latency=latency)
+        middle = len(chunk) // 2
+        logger.warning(f"{batch_msg} {e.message}. Bisecting {len(chunk)} sentences into {middle} + {len(chunk) - middle}...")
+        return (
+            translate_chunk(page, chunk[:middle], current_batch, batch_msg, backend, depth + 1, attempts)
+            + translate_chunk(page, chunk[middle:], current_batch, batch_msg, backend, depth + 1, attempts)
         )
-              
-        context.close()
-        browser.close()
-        scheduler.ensure_interval_before_next_batch(total_of_batches, batch_msg)
-              
-        return results_list
+
+    if isinstance(split_translations, dict):
+        return record_chunk_entries(chunk, fan_out_entries(chunk, split_translations), backend, latency=latency)
+    return record_chunk_entries(chunk, translated_entries(zip(chunk, split_translations)), backend, latency=latency)
+
+
+def translated_entries(translated_pairs) -> List[Dict]:
+    """Result entries of ((SL, OL), translation) tuples."""
+    return [{    
+        SL: " ".join(pair[0].split()),
+        TL: clean_text(translated),
+        OL: " ".join(pair[1].split())
+    } for pair, translated in translated_pairs]
+
+
+def fan_out_entries(chunk: BatchType, split_translations: Dict[str, List[str]]) -> List[Dict]:
+    """One entry per sentence with a column per target language, TL first."""
+    return [
+        cache_entry(pair, clean_text(split_translations[TL][i]), {
+            language: clean_text(translations[i]) for language, translations in split_translations.items() if language != TL
+        })
+        for i, pair in enumerate(chunk)
+    ]
+
+
+def drain_retry_queue(session: PageSession, current_batch: int, batch_msg: str, backend: Backend, results_list: List[Dict]) -> None:
+    """Translate every chunk of this worker's backend from the shared retry queue whose backoff has expired."""
+    while True:
+        deadline = current_deadline()
+        if deadline is not None and deadline.expired:
+            logger.info(f"{batch_msg} Batch deadline exceeded, leaving the retry queue to the other workers")
+            return
+        item = retry_queue.pop_ready(backend.name)
+        if item is None:
+            return
+        logger.info(f"{batch_msg} Retrying {len(item.chunk)} sentences (attempt {item.attempts + 1}, last error: {item.last_error})")
+        run_chunk(session, item.chunk, current_batch, batch_msg, backend, results_list, attempts=item.attempts)
 
 
 # Worker: Process One Batch
-#def process_task(sentence_pairs: List[Tuple[str, str]], batch_idx: int, total_of_batches: int) -> List[Dict]:
 def process_task(
     worker_id: int,
-    task_queue: queue.Queue[TaskType],
     result_queue: queue.Queue[TaskResultType],
-    total_of_batches: int
+    total_of_batches: int,
+    backend: Backend,
+    shard: Optional[Tuple[int, int]] = None
     ) -> None:
-    batch_msg = "Worker {worker_id} | "
+    """Claim batches from the ledger until nothing claimable is left, translating them on the worker's backend."""
+    batch_msg = f"Worker {worker_id} | "
     
     while True:       
+        batch = []
         try:
-            task = task_queue.get(timeout=10)  # Wait for task
-            if task is None:  # Poison pill to stop worker
-                task_queue.task_done()
-                break
+            batch = ledger.claim_batch(backend.batch_size, worker=f"worker_{worker_id}", shard=shard)
+            if not batch:
+                # stay around while other workers' failed chunks are waiting for their backoff
+                if not retry_queue.wait_until_ready(backend=backend.name):
+                    logger.info(f"Worker {worker_id} No claimable sentences left in the ledger.")
+                    break
+                logger.info(f"Worker {worker_id} Picking up chunks from the retry queue.")
             
-            task_id, batch = task
+            task_id = next(task_counter)
             
             batch_msg = (
                 f"Worker {worker_id} | "
+                f"{backend.name} | "
                 f"Batch {task_id}/{total_of_batches} | "
             )              
             
@@ -233,6 +589,7 @@ def process_task(
                 current_batch=task_id,
                 total_of_batches=total_of_batches,
                 batch_msg=batch_msg,
+                backend=backend,
                 headless=True
             )
             
@@ -242,17 +599,16 @@ def process_task(
                 "entries": entries
             })
                     
-            task_queue.task_done()
-        except queue.Empty as e:
-            logger.warning(f"Worker {worker_id} Batch is empty: {str(e)}")
-            break
         except Exception as e:
             logger.error(f"Worker {worker_id} error: {str(e)}")
-            task_queue.task_done()
+            # rows that never got a result go back to pending for the other workers
+            ledger.release(batch)
         finally:
-            scheduler.ensure_batch_interval(batch_msg)
-            
-
+            scheduler.ensure_batch_interval(batch_msg, origin=backend.origin)
+    
+    browser_pool.close_worker(msg_prefix=f"Worker {worker_id} | ")
+    ledger.close()
+    backend.close_caches()
 
 
 def merge_sentences(sentences: List[str], msg: str = '') -> str:
@@ -275,7 +631,7 @@ def split_translation(translated_text: str, expected_count: int, msg: str = '')
     logger.debug(f"{msg} Gathered parts {(len(parts))} {parts}")
     if len(parts) != expected_count:   
         logger.warning(f"{msg} Expected {expected_count} parts but got {len(parts)} after splitting. Attempting recovery...")
-        raise Exception(f"{msg} Split count mismatch Expected {expected_count} but got {len(parts)}")
+        raise SplitMismatchException(expected_count, len(parts), message=f"{msg} Split count mismatch")
 
     return parts
     
@@ -348,152 +704,111 @@ def load_dataset_hugging_face(
         return [], []
 
 
-def main():
-    
-    dataset_path = "./scrapper_korpus_kernewek"
-    dataset_paths = [
-    #    "Bretagne/Banque_Sonore_Dialectes_Bretons",
-        "Bretagne/Autogramm_Breton_translation",
-        "Bretagne/UD_Breton-KEB_translation",
-        "Bretagne/Korpus-divyezhek-brezhoneg-galleg"
-        
-    ]
-
-    data = {SL: [], OL: []}
+def prepare_ledger(dataset_paths: Optional[List[str]] = None) -> int:
+    """
+    Seed the work ledger with the source datasets and recover rows left in flight by a crashed run.
+    Datasets already seeded in an earlier run are not loaded again, so resuming only costs a few queries.
+    Returns the number of claimable sentences.
+    """
+    if dataset_paths is None:
+        dataset_paths = [
+        #    "Bretagne/Banque_Sonore_Dialectes_Bretons",
+            "Bretagne/Autogramm_Breton_translation",
+            "Bretagne/UD_Breton-KEB_translation",
+            "Bretagne/Korpus-divyezhek-brezhoneg-galleg"
+        ]
+
+    # One-off migration of the results saved by runs that predate the ledger
+    if ledger.get_meta("legacy_imported") is None:
+        corpus_entries, error_count = get_latest_iteration(
+            expected_pattern=f"*_*_*_*.json",
+            return_all_matches=True
+        )
+        corpus_entries = clean_corpus_entries(corpus_entries)
+        imported = ledger.import_entries(corpus_entries)
+        ledger.set_meta("legacy_imported", str(time.time()))
+        logger.info(f"Imported {imported:,} entries from previous runs into the ledger ({error_count} files failed to load)")
 
     for path in dataset_paths:
-        # Load dataset   
+        seeded_key = f"seeded:{path}"
+        if ledger.get_meta(seeded_key) is not None:
+            logger.info(f"Dataset already in the ledger, skipping download: {path}")
+            continue
         sl_sentences, ol_sentences = load_dataset_hugging_face(path)
-        data[SL].extend(sl_sentences)
-        data[OL].extend(ol_sentences)
-        
-    # Merge the lists using zip()
-    logger.info(f"Merged datasets: {len(data[SL]):,} sentences total")
-    
-    expected_pattern = f"*_*_*_*.json"
-    
-    corpus_entries, error_count = get_latest_iteration(
-        expected_pattern=expected_pattern,
-        return_all_matches=True
-    )
-    
-
-    filtered_sl = []
-    filtered_ol = []
-    
-    corpus_entries = clean_corpus_entries(corpus_entries)
-    logger.info(f"Number of corpus entries: {len(corpus_entries):,}")
-    if corpus_entries:
-        logger.info(f"First pair: {corpus_entries[0]}")
-        logger.info(f"First corpus entry keys: {list(corpus_entries[0].keys())}")
-
-
-    existing_pairs = {(entry[SL], entry[OL]) for entry in corpus_entries}
-
-    # remove all items found in corpus_entries from data[SL] and data[OL]
-    for sl_sent, ol_sent in zip(data[SL], data[OL]):
-        # print(f"Checking if ({sl_sent}, {ol_sent}) is in corpus entries...")
-        if (sl_sent, ol_sent) not in existing_pairs:
-            filtered_sl.append(sl_sent)
-            filtered_ol.append(ol_sent)           
-     
-    logger.info(f"After removing existing entries from previous runs:")
-    logger.info(f"{len(filtered_ol):,}/{len(data[OL]):,} original language sentences total")
-    logger.info(f"{len(filtered_sl):,}/{len(data[SL]):,} target language sentences total")
-                 
-    data[SL] = filtered_sl
-    data[OL] = filtered_ol
-    
-    # Merge the lists using zip()
-    merged_list = []
-    for sl, ol in zip(data[SL], data[OL]):
-        merged_list.append({SL: sl, OL: ol})
+        if not sl_sentences:
+            continue
+        pairs = list(zip(sl_sentences, ol_sentences))
+        # rows are claimed in insertion order, so shuffling here keeps the requests randomised
+        random.shuffle(pairs)
+        inserted = ledger.seed(pairs)
+        ledger.set_meta(seeded_key, str(time.time()))
+        logger.info(f"Seeded {inserted:,}/{len(pairs):,} new sentences from {path}")
+
+    # chunks a previous run gave up on get one more round
+    requeued = ledger.requeue(retry_queue.iter_requeued())
+    if requeued:
+        logger.info(f"Requeued {requeued:,} sentences from {retry_queue.requeue_path}")
+    retry_queue.requeue_path.unlink(missing_ok=True)
+
+    recovered = ledger.recover_in_flight()
+    if recovered:
+        logger.warning(f"Recovered {recovered:,} sentences left in flight by a previous run")
+
+    counts = ledger.counts()
+    claimable = ledger.count_claimable()
+    logger.info(f"Ledger {ledger.db_path}: {counts} | claimable: {claimable:,}")
+    return claimable
+
+
+def save_partial_result(result: TaskResultType, total_of_batches: int, columns: List[str]) -> None:
+    """Save one finished batch to its own files in partial_results."""
+    logger.warning(f"Batch {result.get('task_id')}/{total_of_batches}.")
     
-    random.shuffle(merged_list) 
+   
+    # Save batch immediately to individual files
+    filename = f"worker_{result.get('worker_id')}_batch_{result.get('task_id')}_{total_of_batches}"
     
-    merged_list_of_tuples = [(item[SL], item[OL]) for item in merged_list]
+    filtered_results = [entry for entry in result['entries'] if entry[TL] != entry[SL]]
     
-    # Split into batches
-    batch_size = CONFIG["batch_size"]
-    batches: BatchType = [merged_list_of_tuples[i:i + batch_size] for i in range(0, len(merged_list_of_tuples), batch_size)]
-    all_results = []
-
-    columns = [SL, TL, OL]
+    save_batch_to_csv(
+        batch_results=filtered_results,
+        filename=filename,
+        columns=columns,
+        output_folder="partial_results",
+    )
+                    
+    save_batch_to_json(
+        batch_results=filtered_results,
+        filename=filename,
+        output_folder="partial_results",
+    )
     
-    # shuffle the batches so the request will be randomised
+    logger.info(f"Batch {result.get('task_id')}/{total_of_batches} completed.")
 
-    
-    task_queue = queue.Queue[TaskType]()
-    result_queue = queue.Queue[TaskResultType]()
 
-    for task_id, item in enumerate(batches, 1):
-        task_queue.put((task_id, item))
-    
-    workers = []
-    task_queue_size = task_queue.qsize() + 1
-    
-    scheduler.set_max_workers(min(CONFIG['max_workers'], task_queue_size))
-    
-    for worker_id in range(1, scheduler.max_workers + 1):
-        worker_thread = threading.Thread(target=process_task, args=(worker_id, task_queue, result_queue, task_queue_size))
-        worker_thread.start()
-        workers.append(worker_thread)
-    
-    
-    # Wait for all tasks to complete
-    task_queue.join()
-    
-        
-    # Send poison pills to stop workers
-    for _ in workers:
-        task_queue.put(None)
-    
-    # Wait for workers to finish
-    for worker_thread in workers:
-        worker_thread.join()
-        
-    while not result_queue.empty():        
-        try:
-            result = result_queue.get()
-            all_results.extend(result["entries"])
-            logger.warning(f"Batch {result.get('task_id')}/{task_queue_size}.")
-            
-           
-            # Save batch immediately to individual files
-            filename = f"worker_{result.get('worker_id')}_batch_{result.get('task_id')}_{task_queue_size}"
-            
-            filtered_results = [entry for entry in result['entries'] if entry[TL] != entry[SL]]
-            
-            save_batch_to_csv(
-                batch_results=filtered_results,
-                filename=filename,
-                columns=columns,
-                output_folder="partial_results",
-            )
-                            
-            save_batch_to_json(
-                batch_results=filtered_results,
-                filename=filename,
-                output_folder="partial_results",
-            )
-            
-            logger.info(f"Batch {result.get('task_id')}/{task_queue_size} completed.")
-        except Exception as e:
-            logger.error(f"Batch {result.get('task_id')} failed: {e}")
-        
-    
-    
+def save_final_results(
+    stream_paths: List[Path],
+    failed_paths: List[Path],
+    columns: List[str],
+    run_started_at: float) -> None:
+    """
+    Build the merged run output from the result sinks' stream files (one per process) plus the
+    previous runs' entries in the ledger, then log the success rate and the detailed error report.
+    Everything is streamed.
+    """
     output_filename = f"{SL}_{TL}_{OL}_parallel"  
+    previous_runs = lambda: ledger.iter_results(states=(DONE,), updated_before=run_started_at)
+    this_run = lambda: itertools.chain.from_iterable(iter_jsonl(path) for path in stream_paths)
     
-    save_batch_to_csv(
-        batch_results=corpus_entries,
+    stream_batches_to_csv(
+        sources=[previous_runs()],
         filename=f"{output_filename}_previous_runs",
         columns=columns,
         add_timestamp=True
     )
     
-    save_batch_to_json(
-        batch_results=corpus_entries,
+    stream_batches_to_json(
+        sources=[previous_runs()],
         filename=f"{output_filename}_previous_runs",
         remove_duplicates=True,
         columns=columns,
@@ -501,18 +816,17 @@ def main():
         add_timestamp=True
     )   
             
-    all_results.extend(corpus_entries)   
     # Save CSV
-    save_batch_to_csv(
-        batch_results=all_results,
+    stream_batches_to_csv(
+        sources=[this_run(), previous_runs()],
         filename=output_filename,
         columns=columns,
         add_timestamp=True
     )
 
     # Save JSON
-    save_batch_to_json(
-        batch_results=all_results,
+    stream_batches_to_json(
+        sources=[this_run(), previous_runs()],
         filename=output_filename,
         remove_duplicates=True,
         columns=columns,
@@ -521,8 +835,9 @@ def main():
         add_timestamp=True
     )
     
-     
-    if(len(all_results) == 0):
+    total = sum(1 for _ in this_run()) + sum(1 for _ in previous_runs())
+    failed = sum(1 for path in failed_paths for _ in iter_jsonl(path))
+    if(total == 0):
         logger.warning("Catastrophic failure! No results were obtained.")
         logger.warning(f"Whatever results were saved to {output_filename} and {output_filename}")
         
@@ -530,11 +845,10 @@ def main():
         logger.info(f"Translation complete! Saved to {output_filename}.csv and {output_filename}.json")
         
         # 1. Overall success rate
-        successful = sum(1 for r in all_results if not r[TL].startswith('['))
-        failed = len(all_results) - successful
-        logger.info(f"Total sentences processed: {len(all_results):,}")
-        logger.info(f"Successful translations : {successful:,} ({successful/len(all_results):.1%})")
-        logger.info(f"Failed / errored        : {failed:,} ({failed/len(all_results):.1%})")
+        successful = total - failed
+        logger.info(f"Total sentences processed: {total:,}")
+        logger.info(f"Successful translations : {successful:,} ({successful/total:.1%})")
+        logger.info(f"Failed / errored        : {failed:,} ({failed/total:.1%})")
 
         # 2. Print ALL errors with source + original + failed translation
         if failed > 0:
@@ -542,16 +856,16 @@ def main():
             logger.warning(f"  DETAILED ERROR REPORT ({failed} failed translations)")
             logger.warning(f"{'='*60}")
 
-            for idx, row in enumerate(all_results, 1):
+            failed_rows = itertools.chain.from_iterable(iter_jsonl(path) for path in failed_paths)
+            for idx, row in enumerate(failed_rows, 1):
                 translation = row[TL]
-                if translation.startswith('['):  # [ERROR], [TRANSLATION FAILED], etc.
-                    src = row[SL]
-                    orig = row.get(OL, "N/A")
-                    logger.error(f"FAIL #{idx:04d} | {SL} → {TL}")
-                    logger.error(f"   Source ({SL}):     {src}")
-                    logger.error(f"   Original ({OL}):  {orig}")
-                    logger.error(f"   Result:           {translation}")
-                    logger.error(f"   {'-'*50}")
+                src = row[SL]
+                orig = row.get(OL, "N/A")
+                logger.error(f"FAIL #{idx:04d} | {SL} → {TL}")
+                logger.error(f"   Source ({SL}):     {src}")
+                logger.error(f"   Original ({OL}):  {orig}")
+                logger.error(f"   Result:           {translation}")
+                logger.error(f"   {'-'*50}")
 
             logger.warning(f"END OF ERROR REPORT")
             logger.warning(f"{'='*60}\n")
@@ -559,5 +873,82 @@ def main():
             logger.info("Perfect run! No errors detected.")
 
 
+def run_workers(total_of_batches: int, columns: List[str], shard: Optional[Tuple[int, int]] = None) -> ResultSink:
+    """Run up to scheduler.max_workers worker threads until the ledger (or its shard) is drained; returns the closed sink."""
+    result_queue = queue.Queue[TaskResultType]()
+    
+    workers = []
+    
+    # Results are written to disk as soon as each batch finishes
+    sink = ResultSink(
+        result_queue=result_queue,
+        columns=columns,
+        filename=f"{SL}_{TL}_{OL}_stream",
+        on_batch=lambda result: save_partial_result(result, total_of_batches, columns),
+    )
+    sink.start()
+    watchdog.start()
+    
+    target_languages = get_target_languages()
+    if len(target_languages) > 1:
+        logger.info(f"Translating into {target_languages}")
+        for backend in backends:
+            if len(backend.target_languages) == 1:
+                logger.warning(f"Backend {backend.name} can't fan out, its rows only get {TL}")
+
+    # workers are bound to backends up to each backend's max_concurrency
+    worker_backends = assign_workers(backends, scheduler.max_workers)
+    logger.info(f"Workers per backend: { {backend.name: worker_backends.count(backend) for backend in backends} }")
+    for worker_id, backend in enumerate(worker_backends, 1):
+        worker_thread = threading.Thread(target=process_task, args=(worker_id, result_queue, total_of_batches, backend, shard))
+        worker_thread.start()
+        workers.append(worker_thread)
+    
+    # Wait for workers to run out of claimable work
+    for worker_thread in workers:
+        worker_thread.join()
+    
+    watchdog.stop()
+    browser_pool.log_stats()
+    logger.info(f"Hang watchdog: {watchdog.get_stats()}")
+    for hang in watchdog.get_hangs():
+        logger.warning(f"Hung page: {hang['label']} during '{hang['action']}', {hang['overdue_s']}s past its deadline")
+    logger.info(f"Chunk planner: {chunk_planner.get_stats()}")
+    for name, planner in chunk_planners.items():
+        logger.info(f"Chunk planner {name}: {planner.get_stats()}")
+    for backend in backends:
+        logger.info(f"Translation cache {backend.name}: {backend.cache.get_stats()}")
+    logger.info(f"Scheduler: {scheduler.get_stats()}")
+    for name, stats in scheduler.breakers.get_stats().items():
+        logger.info(f"Circuit breaker {name}: {stats}")
+    logger.info(f"Request latencies: {request_latencies.get_stats()}")
+    retry_queue.flush_to_requeue()
+    logger.info(f"Retry queue: {retry_queue.get_stats()}")
+    sink.stop()
+    return sink
+
+
+def get_columns() -> List[str]:
+    """Output columns: the source, one per target language and the original."""
+    return [SL, *get_target_languages(), OL]
+
+
+def main():
+    run_started_at = time.time()
+    claimable = prepare_ledger()
+    
+    columns = get_columns()
+    total_of_batches = -(-claimable // CONFIG["batch_size"]) + 1
+    
+    scheduler.set_max_workers(min(CONFIG['max_workers'], total_of_batches))
+    sink = run_workers(total_of_batches, columns)
+
+    # every worker is done, anything still in flight was waiting for a retry
+    ledger.recover_in_flight()
+    logger.info(f"Ledger after run: {ledger.counts()}")
+    
+    save_final_results([sink.jsonl_path], [sink.failed_path], columns, run_started_at)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
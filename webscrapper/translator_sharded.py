@@ -0,0 +1,95 @@
+import multiprocessing
+import os
+import time
+
+from pathlib import Path
+from typing import List
+
+from constants.output import LOG_FILENAME, OUTPUT_FOLDER
+from constants.languages import SL, TL, OL
+from scrapper_config import CONFIG
+
+from logger import translation_logger
+'''
+Multi-process launcher for translator_maitre. The ledger is split into N shards (rowid % N) and every
+shard runs in its own spawned process with its own workers, browser pool and scheduler, so the
+post-processing of each shard gets its own GIL. The shard outputs are merged into this run's folder.
+Usage: python translator_sharded.py
+
+Nothing that creates a logger may be imported at module level: spawned children re-import this
+module, and the shard has to point the logger at its own folder before translator_maitre is loaded.
+'''
+
+
+def run_shard(shard_index: int, shard_count: int, run_folder: str, total_of_batches: int) -> None:
+    """Entry point of a shard process: drain one slice of the ledger with a share of the budget."""
+    translation_logger.setup_logger(
+        output_folder=os.path.join(run_folder, "shards"),
+        log_filename=f"shard_{shard_index + 1}_of_{shard_count}"
+    )
+    import translator_maitre as maitre
+
+    logger = translation_logger.get_logger()
+    shard_msg = f"Shard {shard_index + 1}/{shard_count} |"
+
+    # each process gets its share of the workers and of the request rate
+    maitre.scheduler.rate_limiter = maitre.scheduler.rate_limiter.scaled(shard_count)
+    for backend in maitre.backends:
+        backend.max_concurrency = max(1, backend.max_concurrency // shard_count)
+    maitre.scheduler.set_max_workers(max(1, min(CONFIG["max_workers"] // shard_count, total_of_batches)))
+    logger.info(f"{shard_msg} Starting {maitre.scheduler.max_workers} workers (pid {os.getpid()})")
+
+    sink = maitre.run_workers(total_of_batches, maitre.get_columns(), shard=(shard_index, shard_count))
+    logger.info(f"{shard_msg} Done: {sink.get_stats()}")
+    translation_logger.shutdown()
+
+
+def find_shard_outputs(run_folder: str, suffix: str = "") -> List[Path]:
+    return sorted(Path(run_folder, "shards").glob(f"*/{SL}_{TL}_{OL}_stream{suffix}.jsonl"))
+
+
+def main():
+    logger = translation_logger.get_logger(
+        output_folder=OUTPUT_FOLDER,
+        log_filename=LOG_FILENAME
+    )
+    from translator_maitre import get_columns, ledger, prepare_ledger, save_final_results
+
+    run_started_at = time.time()
+    claimable = prepare_ledger()
+    columns = get_columns()
+
+    number_of_batches = -(-claimable // CONFIG["batch_size"])
+    shard_count = max(1, min(CONFIG["shard_processes"], number_of_batches))
+    total_of_batches = -(-number_of_batches // shard_count) + 1
+    run_folder = translation_logger.get_filepath()
+    logger.info(f"Starting {shard_count} shard processes for {claimable:,} sentences ({total_of_batches - 1} batches each)")
+
+    # spawn: a forked child would inherit the parent's threads and SQLite connections
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(
+            target=run_shard,
+            args=(shard_index, shard_count, run_folder, total_of_batches),
+            name=f"shard_{shard_index + 1}"
+        )
+        for shard_index in range(shard_count)
+    ]
+    start_time = time.perf_counter()
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        if process.exitcode != 0:
+            logger.error(f"{process.name} exited with code {process.exitcode}")
+    logger.info(f"All shards finished in {time.perf_counter() - start_time:.1f}s")
+
+    # every shard is done, anything still in flight belongs to a shard that died or was waiting for a retry
+    ledger.recover_in_flight()
+    logger.info(f"Ledger after run: {ledger.counts()}")
+
+    save_final_results(find_shard_outputs(run_folder), find_shard_outputs(run_folder, "_failed"), columns, run_started_at)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import asyncio
+import time
+
+from typing import Dict, Optional
+
+from constants.output import LOG_FILENAME, OUTPUT_FOLDER
+from utils.pw_async_helper import get_random_delay
+from utils.rate_limiter import RateLimiter
+from scrapper_config import CONFIG
+from logger import translation_logger
+
+class AsyncBatchScheduler:
+    """
+    Event-loop counterpart of BatchScheduler. Request slots are reserved on the same RateLimiter
+    and awaited outside of it, so pages waiting for their slot don't hold up each other.
+    """
+
+    __logger = translation_logger.get_logger(
+        output_folder=OUTPUT_FOLDER,
+        log_filename=LOG_FILENAME
+    )
+
+    def __init__(self, max_workers: int, rate_limiter: Optional[RateLimiter] = None):
+        # the limiter only holds its lock for bookkeeping, so it is safe to call from the event loop
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.completed_batches = 0
+        self.max_workers = max_workers
+
+        self.sleeping_batches = 0
+        self.errors_count = 0
+        self.errors_limit = 5
+
+    async def ensure_interval_before_next_batch(self, total_of_batches: int, msg: str = ""):
+        """
+        Applies a random delay before allowing the next batch if there are enough remaining batches.
+        """
+        if self.sleeping_batches > self.max_workers/2:
+            return None
+
+        if self.completed_batches >= total_of_batches:
+            return None
+
+        # no awaits until the counters are updated, so this block can't be interleaved
+        self.completed_batches += 1
+        remaining_batches = total_of_batches - self.completed_batches
+        completed_ratio = self.completed_batches / total_of_batches
+
+        if self.max_workers > remaining_batches:
+            self.__logger.info(f"{msg} Not enough remaining batches ({remaining_batches}) to enforce delay.")
+            return None
+
+        fatigue = 0.5 + (2.0 * completed_ratio)
+        new_batch_delay_range = CONFIG.get("new_batch_delay_range", (60, 180))
+        if self.sleeping_batches >= self.max_workers/4:
+            new_batch_delay_range = tuple(item * 0.5 for item in new_batch_delay_range)
+
+        self.sleeping_batches += 1
+        try:
+            self.__logger.info(f"{msg} Sleeping before next batch...")
+            await get_random_delay(
+                delay_range=new_batch_delay_range,
+                fatigue=fatigue,
+                msg=msg,
+                verbose=True
+            )
+        finally:
+            self.sleeping_batches -= 1
+        self.__logger.info(f"{msg} Next batch is ready to start...")
+
+    async def ensure_batch_interval(self, msg: str, origin: Optional[str] = None):
+        """
+        Ensures a minimum time interval between the start of consecutive requests,
+        globally and for the request's origin when one is given.
+        """
+        interval_scale = 0.5 if self.sleeping_batches >= self.max_workers/4 else 1.0
+        wait_time = self.rate_limiter.reserve(origin=origin, interval_scale=interval_scale) - time.monotonic()
+        if wait_time <= 0:
+            return
+        self.__logger.info(f"{msg} Waiting {wait_time:.2f}s to maintain batch interval")
+        self.rate_limiter.begin_wait(origin)
+        try:
+            await asyncio.sleep(wait_time)
+        finally:
+            self.rate_limiter.finish_wait(origin)
+
+    def get_errors_count(self):
+        return self.errors_count
+
+    def increment_errors_count(self):
+        self.errors_count += 1
+
+    def reset_errors_count(self):
+        self.errors_count = 0
+
+    def check_errors_limit(self):
+        return self.errors_count >= self.errors_limit
+
+    def get_sleeping_batches_count(self):
+        return self.sleeping_batches
+
+    def get_waiting_batches_count(self):
+        return self.rate_limiter.get_waiting_count()
+
+    def get_stats(self) -> Dict:
+        return {
+            "completed_batches": self.completed_batches,
+            "sleeping_batches": self.sleeping_batches,
+            "errors_count": self.errors_count,
+            "rate_limiter": self.rate_limiter.get_stats(),
+        }
+
+    def set_max_workers(self, max_workers: int):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
@@ -1,23 +1,30 @@
-import random
 import threading
-import time
 
+from typing import Dict, Optional
 
 from constants.output import LOG_FILENAME, OUTPUT_FOLDER
+from utils.circuit_breaker import CircuitBreaker, CircuitBreakers
 from utils.pw_helper import get_random_delay
+from utils.rate_limiter import RateLimiter
 from scrapper_config import CONFIG
 from logger import translation_logger
 
 class BatchScheduler:
+    """
+    Paces the workers: `ensure_batch_interval` spaces out the requests through a reservation-based
+    RateLimiter (global and per-origin limits, no lock held while sleeping) and
+    `ensure_interval_before_next_batch` adds the longer pause between batches.
+    Workers waiting for a request slot and workers sleeping between batches are counted separately.
+    Failing sites are handled by the circuit breakers, one per (backend, origin), see `get_breaker`.
+    """
 
     __logger = translation_logger.get_logger(
         output_folder=OUTPUT_FOLDER,
         log_filename=LOG_FILENAME
     )
 
-    def __init__(self, max_workers: int):
-        self.last_batch_start_time = 0
-        self.batch_timing_lock = threading.Lock()
+    def __init__(self, max_workers: int, rate_limiter: Optional[RateLimiter] = None):
+        self.rate_limiter = rate_limiter or RateLimiter()
         self.completed_batches = 0
         self.completed_batches_lock = threading.Lock()
         self.max_workers = max_workers
@@ -28,47 +35,37 @@ class BatchScheduler:
         self.errors_count_lock = threading.Lock()
         
         self.errors_limit = 5
+        self.breakers = CircuitBreakers()
         
 
     def ensure_interval_before_next_batch(self, total_of_batches: int, msg: str = ""):
         """
         Applies a random delay before allowing the next batch if there are enough remaining batches.
         """
-        if self.sleeping_batches > self.max_workers/2:
+        with self.completed_batches_lock, self.sleeping_batches_lock:
+            if self.sleeping_batches > self.max_workers/2:
+                return None
+            
+            if self.completed_batches >= total_of_batches:
                 return None
         
-        if self.completed_batches >= total_of_batches:
-            return None
-        
-        self.__logger.debug(f"{msg} Ensuring interval before next batch...")
-        should_sleep = False
-        fatigue = 1.0
-        
-        with self.completed_batches_lock:
+            self.__logger.debug(f"{msg} Ensuring interval before next batch...")
             self.completed_batches += 1
             remaining_batches = total_of_batches - self.completed_batches                
             completed_ratio = self.completed_batches / total_of_batches
             
-            if self.max_workers <= remaining_batches:
-                should_sleep = True
-                with self.sleeping_batches_lock:
-                    self.sleeping_batches += 1
-                
-                # Simple fatigue calculation: starts at 1, approaches 2.5 near completion
-                # Using a simple linear approach: fatigue = 1 + 2 * completion_ratio
-                fatigue = 0.5 + (2.0 * completed_ratio)
-           
-                                  
-                new_batch_delay_range = CONFIG.get("new_batch_delay_range", (60, 180))
-
-                if self.sleeping_batches >= self.max_workers/4:
-                    new_batch_delay_range = tuple(item * 0.5 for item in new_batch_delay_range)
-              
-          
-            else:
+            if self.max_workers > remaining_batches:
                 self.__logger.info(f"{msg} Not enough remaining batches ({remaining_batches}) to enforce delay.")
+                return None
+
+            # Simple fatigue calculation: starts at 0.5, approaches 2.5 near completion
+            fatigue = 0.5 + (2.0 * completed_ratio)
+            new_batch_delay_range = CONFIG.get("new_batch_delay_range", (60, 180))
+            if self.sleeping_batches >= self.max_workers/4:
+                new_batch_delay_range = tuple(item * 0.5 for item in new_batch_delay_range)
+            self.sleeping_batches += 1
 
-        if should_sleep:
+        try:
             self.__logger.info(f"{msg} Sleeping before next batch...")  
             get_random_delay(
                 delay_range=new_batch_delay_range,
@@ -76,41 +73,23 @@ class BatchScheduler:
                 msg=msg,
                 verbose=True
             )
-                  
+        finally:
             with self.sleeping_batches_lock:
                 self.sleeping_batches -= 1
             
-            self.__logger.info(f"{msg} Next batch is ready to start...")
+        self.__logger.info(f"{msg} Next batch is ready to start...")
                 
-    def ensure_batch_interval(self, msg: str):
+    def ensure_batch_interval(self, msg: str, origin: Optional[str] = None):
         """
-        Ensures a minimum time interval between the start of consecutive requests.
+        Ensures a minimum time interval between the start of consecutive requests,
+        globally and for the request's origin when one is given.
         """
-    
-        with self.batch_timing_lock:
-            current_time = time.time()
-            time_since_last_batch = current_time - self.last_batch_start_time
-            
-            batch_interval = random.randint(CONFIG["min_batch_interval"], CONFIG["max_batch_interval"])
-                       
-            if self.get_sleeping_batches_count() >= self.max_workers/4:
-                    batch_interval = batch_interval * 0.5
-                    
-            with self.sleeping_batches_lock:
-                    self.sleeping_batches += 1
-                
-            if time_since_last_batch < batch_interval:
-                wait_time = batch_interval - time_since_last_batch
-                self.__logger.info(f"{msg} Waiting {wait_time:.2f}s to maintain batch interval")
-                time.sleep(wait_time)
-                
-            with self.sleeping_batches_lock:
-                self.sleeping_batches -= 1
-                
-            self.last_batch_start_time = time.time()
+        # many workers pausing between batches leaves fewer requests to spread out
+        interval_scale = 0.5 if self.get_sleeping_batches_count() >= self.max_workers/4 else 1.0
+        self.rate_limiter.acquire(origin=origin, interval_scale=interval_scale, msg=msg)
             
     def get_errors_count(self):
-        """Get the number of batches currently sleeping."""
+        """Get the number of errors since the last reset."""
         with self.errors_count_lock:
             return self.errors_count  
         
@@ -129,12 +108,31 @@ class BatchScheduler:
         with self.errors_count_lock:
             return self.errors_count >= self.errors_limit
 
+    def get_breaker(self, backend: str, origin: Optional[str] = None) -> CircuitBreaker:
+        """Circuit breaker shared by every worker sending requests for backend to origin."""
+        return self.breakers.get(backend, origin)
+
     def get_sleeping_batches_count(self):
-        """Get the number of batches currently sleeping."""
+        """Get the number of batches currently sleeping between batches."""
         with self.sleeping_batches_lock:
             return self.sleeping_batches
+
+    def get_waiting_batches_count(self):
+        """Get the number of workers currently waiting for a request slot."""
+        return self.rate_limiter.get_waiting_count()
+
+    def get_stats(self) -> Dict:
+        with self.completed_batches_lock, self.sleeping_batches_lock, self.errors_count_lock:
+            stats = {
+                "completed_batches": self.completed_batches,
+                "sleeping_batches": self.sleeping_batches,
+                "errors_count": self.errors_count,
+            }
+        stats["rate_limiter"] = self.rate_limiter.get_stats()
+        stats["circuit_breakers"] = self.breakers.get_stats()
+        return stats
         
     def set_max_workers(self, max_workers: int):
         if max_workers < 1:
             raise ValueError("max_workers must be at least 1")
-        self.max_workers = max_workers
\ No newline at end of file
+        self.max_workers = max_workers
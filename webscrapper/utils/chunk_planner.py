@@ -0,0 +1,99 @@
+import threading
+from collections import deque
+from typing import Dict, List, Tuple
+
+from constants.output import LOG_FILENAME, OUTPUT_FOLDER
+from logger import translation_logger
+from scrapper_config import CONFIG
+
+logger = translation_logger.get_logger(
+    output_folder=OUTPUT_FOLDER,
+    log_filename=LOG_FILENAME
+)
+
+PairType = Tuple[str, str]
+
+
+class ChunkPlanner:
+    """
+    Packs the (SL, OL) pairs of a batch into translation requests that fill up to a character
+    budget, counting the merge separator between sentences. Bins are filled first-fit decreasing,
+    so long and short sentences share requests instead of wasting round-trips.
+
+    The effective budget adapts to the observed split_translation mismatch rate: every mismatch
+    shrinks it multiplicatively and every clean split grows it back additively (AIMD), so the
+    planner settles on the largest request size the site still returns intact.
+    """
+
+    def __init__(
+        self,
+        separator: str,
+        char_budget: int = CONFIG["request_char_budget"],
+        max_sentences: int = CONFIG["sentences_per_request_range"][1],
+        min_budget_ratio: float = CONFIG["planner_min_budget_ratio"],
+        window: int = CONFIG["planner_mismatch_window"],
+    ):
+        self.separator = separator
+        self.char_budget = char_budget
+        self.max_sentences = max_sentences
+        self.min_budget_ratio = min_budget_ratio
+        self.budget_ratio = 1.0
+        self.lock = threading.Lock()
+        self.recent_splits = deque(maxlen=window)
+
+    def get_budget(self) -> int:
+        with self.lock:
+            return max(1, int(self.char_budget * self.budget_ratio))
+
+    def get_max_sentences(self) -> int:
+        with self.lock:
+            return max(1, round(self.max_sentences * self.budget_ratio))
+
+    def plan(self, batch: List[PairType], msg: str = '') -> List[List[PairType]]:
+        """Split a batch into chunks whose merged text stays within the current budget."""
+        budget = self.get_budget()
+        max_sentences = self.get_max_sentences()
+        separator_cost = len(self.separator)
+
+        bins: List[List[PairType]] = []
+        bin_sizes: List[int] = []
+        for pair in sorted(batch, key=lambda pair: len(pair[0]), reverse=True):
+            cost = len(pair[0])
+            for index, chunk in enumerate(bins):
+                if len(chunk) < max_sentences and bin_sizes[index] + separator_cost + cost <= budget:
+                    chunk.append(pair)
+                    bin_sizes[index] += separator_cost + cost
+                    break
+            else:
+                # sentences longer than the budget still get a request of their own
+                bins.append([pair])
+                bin_sizes.append(cost)
+
+        logger.debug(
+            f"{msg} Planned {len(batch)} sentences into {len(bins)} requests "
+            f"(budget {budget} chars, max {max_sentences} sentences, sizes {bin_sizes})"
+        )
+        return bins
+
+    def record_split(self, ok: bool, msg: str = '') -> None:
+        """Feed back whether a planned request split cleanly into the expected number of parts."""
+        with self.lock:
+            self.recent_splits.append(ok)
+            if ok:
+                self.budget_ratio = min(1.0, self.budget_ratio + CONFIG["planner_budget_increase"])
+            else:
+                self.budget_ratio = max(self.min_budget_ratio, self.budget_ratio * CONFIG["planner_budget_decrease"])
+                logger.info(f"{msg} Split mismatch, request budget lowered to {self.budget_ratio:.0%} ({self._get_mismatch_rate():.0%} mismatch rate)")
+
+    def _get_mismatch_rate(self) -> float:
+        if not self.recent_splits:
+            return 0.0
+        return 1 - sum(self.recent_splits) / len(self.recent_splits)
+
+    def get_stats(self) -> Dict[str, float]:
+        with self.lock:
+            return {
+                "budget_ratio": self.budget_ratio,
+                "mismatch_rate": self._get_mismatch_rate(),
+                "observed_splits": len(self.recent_splits),
+            }
@@ -0,0 +1,194 @@
+import threading
+import time
+
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from constants.output import LOG_FILENAME, OUTPUT_FOLDER
+from logger import translation_logger
+from scrapper_config import CONFIG
+from utils.deadline import current_deadline
+
+logger = translation_logger.get_logger(
+    output_folder=OUTPUT_FOLDER,
+    log_filename=LOG_FILENAME
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Error-rate circuit breaker shared by every worker sending requests to one (backend, origin).
+
+    Closed: requests go through and their outcomes are kept for window_s seconds. Once at least
+    min_requests are in the window and error_rate of them failed, the breaker opens.
+    Open: acquire() blocks every worker until the pause is over; each trip in a row multiplies the
+    pause by backoff_factor, up to max_open_s.
+    Half-open: one probe request at a time is let through. probe_successes successes in a row close
+    the breaker (and reset the backoff), a failed probe opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_s: float = CONFIG["circuit_window_s"],
+        min_requests: int = CONFIG["circuit_min_requests"],
+        error_rate: float = CONFIG["circuit_error_rate"],
+        open_s: float = CONFIG["circuit_open_s"],
+        backoff_factor: float = CONFIG["circuit_backoff_factor"],
+        max_open_s: float = CONFIG["circuit_max_open_s"],
+        probe_successes: int = CONFIG["circuit_probe_successes"],
+    ):
+        self.name = name
+        self.window_s = window_s
+        self.min_requests = min_requests
+        self.error_rate = error_rate
+        self.open_s = open_s
+        self.backoff_factor = backoff_factor
+        self.max_open_s = max_open_s
+        self.probe_successes = probe_successes
+
+        self.condition = threading.Condition()
+        self.state = CLOSED
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self.open_until = 0.0
+        self.consecutive_trips = 0
+        self.probe_in_flight = False
+        self.probe_streak = 0
+
+        self.trips = 0
+        self.transitions: Dict[str, int] = {}
+        self.total_open_time = 0.0
+        self.total_wait = 0.0
+        self.waiting = 0
+
+    def _transition(self, state: str, reason: str, msg: str = '') -> None:
+        """Call with self.condition held."""
+        key = f"{self.state}->{state}"
+        self.transitions[key] = self.transitions.get(key, 0) + 1
+        log = logger.warning if state == OPEN else logger.info
+        log(f"{msg} Circuit {self.name}: {self.state} → {state} ({reason})")
+        self.state = state
+        self.condition.notify_all()
+
+    def _prune(self, now: float) -> None:
+        while self._outcomes and now - self._outcomes[0][0] > self.window_s:
+            self._outcomes.popleft()
+
+    def _trip(self, now: float, reason: str, msg: str = '') -> None:
+        pause = min(self.max_open_s, self.open_s * self.backoff_factor ** self.consecutive_trips)
+        self.consecutive_trips += 1
+        self.trips += 1
+        self.open_until = now + pause
+        self.total_open_time += pause
+        self.probe_in_flight = False
+        self.probe_streak = 0
+        self._transition(OPEN, f"{reason}, pausing {pause:.0f}s", msg)
+
+    def acquire(self, msg: str = '') -> float:
+        """
+        Block until a request may go out: right away when closed, once the pause is over and no other
+        probe is in flight otherwise. Never waits past the current deadline (raises at it). Returns the time waited.
+        """
+        started_at = time.monotonic()
+        logged = False
+        with self.condition:
+            self.waiting += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    if self.state == OPEN and now >= self.open_until:
+                        self._transition(HALF_OPEN, "pause over, probing", msg)
+                    if self.state == CLOSED:
+                        break
+                    if self.state == HALF_OPEN and not self.probe_in_flight:
+                        self.probe_in_flight = True
+                        break
+
+                    wait = self.open_until - now if self.state == OPEN else self.window_s
+                    deadline = current_deadline()
+                    if deadline is not None:
+                        deadline.check(msg)
+                        wait = min(wait, deadline.remaining())
+                    if not logged:
+                        logger.info(f"{msg} Circuit {self.name} is {self.state}, waiting up to {wait:.0f}s")
+                        logged = True
+                    self.condition.wait(max(wait, 0.01))
+            finally:
+                self.waiting -= 1
+            waited = time.monotonic() - started_at
+            self.total_wait += waited
+            return waited
+
+    def record(self, ok: bool, msg: str = '') -> None:
+        """Outcome of a request let through by acquire()."""
+        with self.condition:
+            now = time.monotonic()
+            if self.state == HALF_OPEN:
+                self.probe_in_flight = False
+                if not ok:
+                    self._trip(now, "probe failed", msg)
+                    return
+                self.probe_streak += 1
+                if self.probe_streak >= self.probe_successes:
+                    # failures from before the pause must not trip the breaker again
+                    self._outcomes.clear()
+                    self.consecutive_trips = 0
+                    self._transition(CLOSED, f"{self.probe_streak} probes succeeded", msg)
+                else:
+                    self.condition.notify_all()
+                return
+
+            self._outcomes.append((now, ok))
+            self._prune(now)
+            if self.state != CLOSED or ok:
+                return
+            failures = sum(1 for _, outcome_ok in self._outcomes if not outcome_ok)
+            if len(self._outcomes) >= self.min_requests and failures / len(self._outcomes) >= self.error_rate:
+                self._trip(now, f"{failures}/{len(self._outcomes)} requests failed in the last {self.window_s:.0f}s", msg)
+
+    def release(self, msg: str = '') -> None:
+        """Give back a request let through by acquire() that never reached the site (e.g. the page crashed)."""
+        with self.condition:
+            if self.state == HALF_OPEN and self.probe_in_flight:
+                self.probe_in_flight = False
+                self.condition.notify_all()
+
+    def get_stats(self) -> Dict[str, object]:
+        with self.condition:
+            self._prune(time.monotonic())
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            return {
+                "state": self.state,
+                "window_requests": len(self._outcomes),
+                "window_error_rate": failures / len(self._outcomes) if self._outcomes else 0.0,
+                "trips": self.trips,
+                "transitions": dict(self.transitions),
+                "total_open_time": self.total_open_time,
+                "total_wait": self.total_wait,
+                "waiting": self.waiting,
+            }
+
+
+class CircuitBreakers:
+    """One CircuitBreaker per (backend, origin), created on first use."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+
+    def get(self, backend: str, origin: Optional[str] = None) -> CircuitBreaker:
+        key = (backend, origin or '')
+        with self.lock:
+            breaker = self.breakers.get(key)
+            if breaker is None:
+                breaker = self.breakers[key] = CircuitBreaker(name=f"{backend}@{origin}" if origin else backend)
+            return breaker
+
+    def get_stats(self) -> Dict[str, Dict[str, object]]:
+        with self.lock:
+            breakers = list(self.breakers.values())
+        return {breaker.name: breaker.get_stats() for breaker in breakers}
@@ -3,7 +3,7 @@ import os
 import pandas as pd
 
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from datetime import datetime
 from constants.output import LOG_FILENAME, OUTPUT_FOLDER
 from logger import translation_logger
@@ -160,3 +160,38 @@ def save_batch_to_csv(
     except Exception as e:
         logger.error(f"{msg_prefix} Failed to save {filename} to CSV: {e}")
         return None
+
+
+def stream_batches_to_csv(
+    sources: Iterable[Iterable[Dict]],
+    filename: str,
+    columns: List[str],
+    output_folder: str = None,
+    msg_prefix: str = 'Streaming as csv | ',
+    add_timestamp: bool = False
+) -> Optional[Path]:
+    """Streaming variant of save_batch_to_csv: rows are written as they are read, without a DataFrame."""
+    filename = sanitize_txt(filename)
+    if add_timestamp:
+        current_date = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filename = f"{filename}_{current_date}"
+
+    base_path = Path(translation_logger.get_filepath())
+    target_dir = base_path / sanitize_txt(output_folder) if output_folder else base_path
+    os.makedirs(target_dir, exist_ok=True)
+    csv_file_path = target_dir / f"{filename}.csv"
+
+    rows = 0
+    try:
+        with open(csv_file_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+            writer.writeheader()
+            for source in sources:
+                for row in source:
+                    writer.writerow({key: clean_text(value) if isinstance(value, str) else value for key, value in row.items()})
+                    rows += 1
+        logger.info(f"{msg_prefix} Successfully saved {rows} rows to {csv_file_path}")
+        return csv_file_path
+    except Exception as e:
+        logger.error(f"{msg_prefix} Failed to save {filename} to CSV: {e}")
+        return None
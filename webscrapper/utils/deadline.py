@@ -0,0 +1,159 @@
+import contextvars
+import threading
+import time
+
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from constants.output import LOG_FILENAME, OUTPUT_FOLDER
+from exceptions.deadline_exceeded_exception import DeadlineExceededException
+from logger import translation_logger
+from scrapper_config import CONFIG
+
+logger = translation_logger.get_logger(
+    output_folder=OUTPUT_FOLDER,
+    log_filename=LOG_FILENAME
+)
+'''
+Deadlines for batches and chunks. deadline_scope() makes a deadline current for the calling thread
+(nested scopes never outlive the enclosing one); perform_action, click_element, get_random_delay and
+the backends' explicit Playwright timeouts are capped by it, so a stuck page fails at its deadline
+instead of holding the worker. The sync Playwright API can't be interrupted from another thread, so
+HangWatchdog only flags scopes still running well past their deadline; their browser is discarded.
+'''
+
+_current_deadline: contextvars.ContextVar[Optional["Deadline"]] = contextvars.ContextVar("current_deadline", default=None)
+
+
+class Deadline:
+    """Point in time a batch or chunk has to be done by, plus what it was doing last (for the watchdog)."""
+
+    def __init__(self, budget_s: float, label: str = '', parent: Optional["Deadline"] = None):
+        self.label = label
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + budget_s
+        if parent is not None:
+            self.expires_at = min(self.expires_at, parent.expires_at)
+        self.budget_s = self.expires_at - self.started_at
+        self.parent = parent
+        self.action = ''
+        self.hung = False
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self, msg: str = '') -> None:
+        """Raise DeadlineExceededException once the deadline has passed."""
+        if self.expired:
+            raise DeadlineExceededException(self.label, self.budget_s, message=f"{msg} Deadline exceeded".strip())
+
+    def set_action(self, action: str) -> None:
+        """Record what the page is doing on this deadline and the enclosing ones, for the watchdog's report."""
+        deadline = self
+        while deadline is not None:
+            deadline.action = action
+            deadline = deadline.parent
+
+    def timeout_ms(self, timeout_ms: float) -> float:
+        """timeout_ms capped to the time left; raises if none is left."""
+        self.check()
+        return min(timeout_ms, self.remaining() * 1000)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(budget_s: float, label: str = '') -> Iterator[Deadline]:
+    """Make a deadline current for the calling thread; a hang flagged inside is passed on to the enclosing scope."""
+    deadline = Deadline(budget_s, label=label, parent=current_deadline())
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+        if deadline.hung and deadline.parent is not None:
+            deadline.parent.hung = True
+
+
+def cap_timeout_ms(timeout_ms: float) -> float:
+    """A Playwright timeout capped by the current deadline, if any."""
+    deadline = current_deadline()
+    return timeout_ms if deadline is None else deadline.timeout_ms(timeout_ms)
+
+
+def cap_delay(delay: float) -> float:
+    """A sleep capped by the current deadline, if any."""
+    deadline = current_deadline()
+    return delay if deadline is None else max(0.0, min(delay, deadline.remaining()))
+
+
+class HangWatchdog:
+    """
+    Checks the watched deadlines every interval and flags those still running grace seconds past
+    their deadline: the page is stuck in a call nothing bounds. Every hang is kept for the run summary.
+    """
+
+    def __init__(self, interval: float = CONFIG["watchdog_interval_s"], grace: float = CONFIG["watchdog_grace_s"]):
+        self.interval = interval
+        self.grace = grace
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._watched: Dict[int, Deadline] = {}
+        self.hangs: List[Dict[str, object]] = []
+
+    @contextmanager
+    def watch(self, deadline: Deadline) -> Iterator[Deadline]:
+        with self.lock:
+            self._watched[id(deadline)] = deadline
+        try:
+            yield deadline
+        finally:
+            with self.lock:
+                self._watched.pop(id(deadline), None)
+
+    def start(self) -> None:
+        """Start checking in a daemon thread; a stopped watchdog can be started again."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="hang_watchdog", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self.stop_event.wait(self.interval):
+            self.check()
+
+    def check(self) -> None:
+        now = time.monotonic()
+        with self.lock:
+            overdue = [deadline for deadline in self._watched.values() if not deadline.hung and now - deadline.expires_at > self.grace]
+            for deadline in overdue:
+                deadline.hung = True
+                self.hangs.append({
+                    "label": deadline.label,
+                    "action": deadline.action,
+                    "overdue_s": round(now - deadline.expires_at, 1),
+                })
+        for deadline in overdue:
+            logger.error(f"{deadline.label} Hung {now - deadline.expires_at:.0f}s past its deadline during '{deadline.action}', its browser will be discarded")
+
+    def stop(self) -> None:
+        self.stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def get_hangs(self) -> List[Dict[str, object]]:
+        with self.lock:
+            return list(self.hangs)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {"watched": len(self._watched), "hung": len(self.hangs)}
@@ -0,0 +1,87 @@
+import re
+import zipfile
+
+from pathlib import Path
+from typing import Iterable, List, Optional
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+# every line of an uploaded document starts with its id, e.g. "[[12]] Bonjour."
+LINE_ID_PATTERN = re.compile(r"^\s*\[\[\s*(\d+)\s*\]\]\s*")
+
+WORD_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+
+DOCX_RELATIONSHIPS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+
+def number_lines(sentences: Iterable[str]) -> List[str]:
+    """One line per sentence, prefixed with its 1-based id. Line breaks inside a sentence are flattened."""
+    return [f"[[{index}]] {' '.join(sentence.split())}" for index, sentence in enumerate(sentences, 1)]
+
+
+def realign_lines(lines: Iterable[str], expected_count: int) -> List[Optional[str]]:
+    """
+    Map translated lines back to their ids. A line without an id is glued to the previous one
+    (the site may wrap long sentences); ids that never came back, or came back empty, are None.
+    """
+    translations: List[Optional[str]] = [None] * expected_count
+    current = None
+    for line in lines:
+        match = LINE_ID_PATTERN.match(line)
+        if match:
+            index = int(match.group(1)) - 1
+            current = index if 0 <= index < expected_count else None
+            if current is not None:
+                translations[current] = line[match.end():].strip()
+        elif current is not None and line.strip():
+            translations[current] = f"{translations[current]} {line.strip()}".strip()
+    return [translation or None for translation in translations]
+
+
+def write_document(lines: List[str], path: Path) -> Path:
+    """Write one paragraph per line as .txt or .docx, depending on the suffix of path."""
+    path = Path(path)
+    if path.suffix == ".txt":
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    elif path.suffix == ".docx":
+        paragraphs = "".join(f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in lines)
+        document = (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            f'<w:document xmlns:w="{WORD_NAMESPACE}"><w:body>{paragraphs}</w:body></w:document>'
+        )
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("[Content_Types].xml", DOCX_CONTENT_TYPES)
+            archive.writestr("_rels/.rels", DOCX_RELATIONSHIPS)
+            archive.writestr("word/document.xml", document)
+    else:
+        raise ValueError(f"Unsupported document format: {path.suffix}")
+    return path
+
+
+def read_document(path: Path) -> List[str]:
+    """Paragraphs of a .txt or .docx file, in order."""
+    path = Path(path)
+    if path.suffix == ".txt":
+        return path.read_text(encoding="utf-8-sig").splitlines()
+    if path.suffix == ".docx":
+        with zipfile.ZipFile(path) as archive:
+            root = ElementTree.fromstring(archive.read("word/document.xml"))
+        return [
+            "".join(text.text or "" for text in paragraph.iter(f"{{{WORD_NAMESPACE}}}t"))
+            for paragraph in root.iter(f"{{{WORD_NAMESPACE}}}p")
+        ]
+    raise ValueError(f"Unsupported document format: {path.suffix}")
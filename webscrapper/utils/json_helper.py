@@ -3,7 +3,7 @@ import os
 from collections import OrderedDict
 
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
 from constants.languages import OL, SL, TL
 from constants.output import LOG_FILENAME, OUTPUT_FOLDER
@@ -232,4 +232,107 @@ def save_batch_to_json(
         return None
     except Exception as e:
         logger.error(f"{msg_prefix} Unexpected error: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+def iter_jsonl(filepath: Path, msg_prefix: str = "Reading JSONL |") -> Iterator[Dict]:
+    """Yield one record per line of a JSONL file, skipping (and logging) lines that don't parse."""
+    filepath = Path(filepath)
+    if not filepath.exists():
+        return
+    with open(filepath, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                # a crash mid-write leaves at most one truncated line behind
+                logger.warning(f"{msg_prefix} Skipping malformed line {line_number} in {filepath}: {e}")
+
+
+def _dedup_key(entry: Dict, columns: List[str]) -> Tuple[str, str]:
+    src = entry.get(columns[0]) or ""
+    tgt = entry.get(columns[1]) or ""
+    return src.strip(), tgt.strip()
+
+
+def stream_batches_to_json(
+    sources: Iterable[Iterable[Dict]],
+    filename: str,
+    output_folder: str = None,
+    msg_prefix: str = 'Streaming as json |',
+    indent: int = 2,
+    remove_duplicates: bool = False,
+    columns: Optional[List[str]] = None,
+    save_duplicates: bool = False,
+    duplicate_filename: Optional[str] = None,
+    add_timestamp: bool = False
+) -> Optional[str]:
+    """
+    Streaming variant of save_batch_to_json: records are read from the given iterables
+    (e.g. iter_jsonl generators) and written one by one, so only the dedup keys are kept in memory.
+    """
+    if remove_duplicates and not columns:
+        raise ValueError("columns list must be provided when remove_duplicates=True")
+
+    filename = sanitize_txt(filename)
+    if add_timestamp:
+        current_date = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filename = f"{filename}_{current_date}"
+    filename = f"{Path(filename).stem}.json"
+
+    base_path = Path(translation_logger.get_filepath())
+    target_dir = base_path / sanitize_txt(output_folder) if output_folder else base_path
+    os.makedirs(target_dir, exist_ok=True)
+    json_file_path = target_dir / filename
+
+    if duplicate_filename is None:
+        duplicate_filename = f"{Path(filename).stem}_duplicates.json"
+    else:
+        duplicate_filename = f"{Path(sanitize_txt(duplicate_filename)).stem}.json"
+    dup_file_path = target_dir / duplicate_filename
+
+    def write_record(f, record: Dict, first: bool) -> None:
+        body = json.dumps(record, ensure_ascii=False, indent=indent)
+        if indent:
+            body = "\n".join(" " * indent + line for line in body.splitlines())
+        f.write(("\n" if first else ",\n") + body)
+
+    seen = set()
+    written = 0
+    duplicates = 0
+    try:
+        with open(json_file_path, "w", encoding="utf-8") as f:
+            dup_file = open(dup_file_path, "w", encoding="utf-8") if remove_duplicates and save_duplicates else None
+            try:
+                f.write("[")
+                if dup_file:
+                    dup_file.write("[")
+                for source in sources:
+                    for record in source:
+                        if remove_duplicates:
+                            key = _dedup_key(record, columns)
+                            if key in seen:
+                                if dup_file:
+                                    write_record(dup_file, record, duplicates == 0)
+                                duplicates += 1
+                                continue
+                            seen.add(key)
+                        write_record(f, record, written == 0)
+                        written += 1
+                f.write("\n]\n" if written else "]\n")
+            finally:
+                if dup_file:
+                    dup_file.write("\n]\n" if duplicates else "]\n")
+                    dup_file.close()
+
+        if remove_duplicates:
+            logger.info(f"{msg_prefix} Duplicate removal: {written + duplicates} total -> "
+                        f"{written} unique, {duplicates} duplicates (based on columns: {columns})")
+        logger.info(f"{msg_prefix} Saved {written} records to {json_file_path}")
+        return str(json_file_path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.error(f"{msg_prefix} Failed to save {filename}: {e}")
+        return None
@@ -0,0 +1,51 @@
+import math
+import threading
+
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not values:
+        return 0.0
+    return values[min(len(values), max(1, math.ceil(fraction * len(values)))) - 1]
+
+
+class LatencyRecorder:
+    """
+    Thread-safe record of request latencies per key (usually the backend name).
+    Only the most recent max_samples per key are kept, so percentiles describe the
+    current behaviour of a long run rather than its warm-up.
+    """
+
+    def __init__(self, max_samples: int = 10000):
+        self.max_samples = max_samples
+        self.lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+
+    def record(self, latency: Optional[float], key: str = '') -> None:
+        if latency is None:
+            return
+        with self.lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.max_samples)
+                self._counts[key] = 0
+            samples.append(latency)
+            self._counts[key] += 1
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        with self.lock:
+            snapshot = {key: (sorted(samples), self._counts[key]) for key, samples in self._samples.items()}
+        return {
+            key: {
+                "count": count,
+                "mean": sum(values) / len(values) if values else 0.0,
+                "p50": percentile(values, 0.5),
+                "p95": percentile(values, 0.95),
+                "max": values[-1] if values else 0.0,
+            }
+            for key, (values, count) in snapshot.items()
+        }
@@ -0,0 +1,118 @@
+import asyncio
+import random
+from datetime import datetime
+from typing import Awaitable, Callable, Tuple
+from playwright.async_api import Page, Locator
+
+from constants.output import LOG_FILENAME, OUTPUT_FOLDER
+from logger import translation_logger
+from scrapper_config import CONFIG
+from utils.pw_helper import set_fatigue
+from utils.txt_helper import sanitize_txt
+
+
+'''
+Async counterparts of utils/pw_helper for the playwright.async_api engine.
+Delays await asyncio.sleep, so a waiting page never blocks the other pages on the event loop.
+'''
+
+logger = translation_logger.get_logger(
+    output_folder=OUTPUT_FOLDER,
+    log_filename=LOG_FILENAME
+)
+
+
+async def take_screenshot(page: Page, filename: str, msg_prefix: str = "") -> None:
+    logger.warning(f"{msg_prefix} Taking screenshot in order to sort out an issue {filename}...")
+
+    msg_prefix = sanitize_txt(msg_prefix)
+    filename = sanitize_txt(filename).removeprefix(msg_prefix)
+    try:
+        await page.screenshot(path=f"{translation_logger.get_filepath()}/screenshots/{msg_prefix}_{filename}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png")
+    except Exception as e:
+        logger.warning(f"{msg_prefix} Screenshot failed: {e}")
+
+async def get_random_delay(delay_range: Tuple[float, float] = None, fatigue: float = 1, msg: str = "", verbose: bool = False) -> None:
+    if delay_range is None or len(delay_range) != 2:
+        delay_range = CONFIG["interaction_delay_range"]
+    delay = random.uniform(*delay_range) * set_fatigue(fatigue)
+    if fatigue > 1 or verbose:
+        logger.info(f"{msg} Sleeping {delay:.1f}s (fatigue mode)")
+
+    await asyncio.sleep(delay)
+
+
+async def perform_action(action: Callable[[], Awaitable], description: str, delay_range: Tuple[float, float] = CONFIG["interaction_delay_range"],
+        raise_exception: bool = False, msg: str = '') -> bool:
+    if msg:
+        description = description.removeprefix(msg)
+    try:
+        await action()
+        logger.debug(f"{msg} Action '{description}' performed successfully.")
+        await get_random_delay(delay_range)
+        return True
+    except Exception as e:
+        logger.warning(f"{msg} Action '{description}' failed: {e}")
+        if raise_exception:
+            raise
+        return False
+
+
+async def random_mouse_movement(page: Page, msg: str = "") -> None:
+    """Perform random mouse movement within viewport."""
+    await perform_action(
+        action=lambda: page.mouse.move(
+            random.randint(*CONFIG["mouse_move_range_x"]),
+            random.randint(*CONFIG["mouse_move_range_y"]),
+            steps=random.randint(5, 15)
+        ),
+        description="random mouse movement",
+        delay_range=CONFIG["scroll_delay_range"],
+        msg=msg
+    )
+
+
+async def click_element(element: Locator, msg_prefix: str = "", hover: bool = False, raise_exception: bool = False) -> bool:
+    """Click an element with realistic delay."""
+    try:
+        element_description = (
+            await element.get_attribute('aria-label') or
+            await element.get_attribute('title') or
+            (await element.text_content() or '')[:50] or 'unknown element'
+        )
+
+        if hover:
+            await perform_action(
+                action=lambda: element.hover(),
+                description=f"hover: {element_description}",
+                delay_range=CONFIG["scroll_delay_range"],
+                raise_exception=raise_exception,
+                msg=msg_prefix
+            )
+
+        return await perform_action(
+            action=lambda: element.click(delay=random.uniform(100, 300)),
+            description=f"click: {element_description}",
+            delay_range=CONFIG["button_delay_range"],
+            raise_exception=raise_exception,
+            msg=msg_prefix
+        )
+    except Exception as e:
+        logger.warning(f"{msg_prefix} Click failed: {e}")
+        if raise_exception:
+            raise e
+        return False
+
+
+async def handle_cookies_request(page: Page, batch_msg: str = "") -> None:
+    try:
+        button_name = "Accept all" if random.randint(1, 100) < 50 else "Reject all"
+        accept_button = page.get_by_role("button", name=button_name, exact=True)
+        if await accept_button.count() == 0:
+            logger.info(f"{batch_msg} No accept button found → probably already accepted or no banner")
+            return
+
+        if await click_element(accept_button.first, msg_prefix=batch_msg, hover=True):
+            logger.info(f"{batch_msg} Accepted cookies")
+    except Exception as e:
+        logger.warning(f"{batch_msg} Cookie banner handling failed: {e}")
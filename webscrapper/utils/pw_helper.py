@@ -1,12 +1,16 @@
 from datetime import datetime
+import itertools
 import random
 import time
-from typing import Tuple
-from playwright.sync_api import sync_playwright, Page, BrowserContext, Locator
+from typing import Optional, Tuple
+from playwright.sync_api import sync_playwright, Page, BrowserContext, Locator, TimeoutError as PlaywrightTimeoutError
 
 from constants.output import LOG_FILENAME, OUTPUT_FOLDER
+from exceptions.deadline_exceeded_exception import DeadlineExceededException
+from exceptions.output_timeout_exception import OutputTimeoutException
 from logger import translation_logger
 from scrapper_config import CONFIG
+from utils.deadline import cap_delay, cap_timeout_ms, current_deadline
 from utils.txt_helper import sanitize_txt
 
 
@@ -16,6 +20,35 @@ logger = translation_logger.get_logger(
 )
 
 
+# Polled in the page: resolves with the text of selector once it is non-empty, differs from the
+# previous text and hasn't changed for stableMs (and readySelector, if any, is shown).
+# State lives on window, keyed per wait.
+WAIT_FOR_STABLE_TEXT_JS = """
+([selector, previous, stableMs, token, readySelector]) => {
+    const node = document.querySelector(selector);
+    const text = node ? node.innerText.trim() : "";
+    let state = window.__outputWait;
+    if (!state || state.token !== token) {
+        state = window.__outputWait = {token, text: null, since: 0};
+    }
+    const ready = !readySelector || Boolean(document.querySelector(readySelector)?.checkVisibility());
+    if (!text || text === previous || !ready) {
+        state.text = null;
+        return false;
+    }
+    const now = performance.now();
+    if (text !== state.text) {
+        state.text = text;
+        state.since = now;
+        return false;
+    }
+    return now - state.since >= stableMs ? text : false;
+}
+"""
+
+_text_waits = itertools.count(1)
+
+
 def set_fatigue(fatigue: float = 1):
     return max(1.0, fatigue)
     
@@ -24,12 +57,62 @@ def take_screenshot(page: Page, filename: str, msg_prefix: str = "") -> None:
     
     msg_prefix = sanitize_txt(msg_prefix)
     filename = sanitize_txt(filename).removeprefix(msg_prefix)
-    page.screenshot(path=f"{translation_logger.get_filepath()}/screenshots/{msg_prefix}_{filename}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png")
+    try:
+        page.screenshot(path=f"{translation_logger.get_filepath()}/screenshots/{msg_prefix}_{filename}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png")
+    except Exception as e:
+        # a crashed or closed page can't be captured, that must not hide the original error
+        logger.warning(f"{msg_prefix} Screenshot failed: {e}")
+
+def read_text(page: Page, selector: str) -> str:
+    """Current text of selector, without waiting."""
+    return page.evaluate(
+        "(selector) => { const node = document.querySelector(selector); return node ? node.innerText.trim() : ''; }",
+        selector
+    )
+
+
+def wait_for_stable_text(
+    page: Page,
+    selector: str,
+    previous_text: Optional[str] = None,
+    timeout_ms: float = CONFIG["output_timeout_ms"],
+    ready_selector: Optional[str] = None,
+    msg: str = "No translation output",
+) -> str:
+    """
+    Wait in the page for the text of selector to be complete: non-empty, different from previous_text
+    and stable for output_stable_ms. Raises OutputTimeoutException when the deadline passes first.
+    """
+    previous_text = (previous_text or '').strip()
+    timeout_ms = cap_timeout_ms(timeout_ms)
+    try:
+        handle = page.wait_for_function(
+            WAIT_FOR_STABLE_TEXT_JS,
+            arg=[selector, previous_text, CONFIG["output_stable_ms"], next(_text_waits), ready_selector],
+            polling=CONFIG["output_poll_interval_ms"],
+            timeout=timeout_ms,
+        )
+    except PlaywrightTimeoutError:
+        deadline = current_deadline()
+        if deadline is not None and deadline.expired:
+            raise DeadlineExceededException(deadline.label, deadline.budget_s, message=f"{msg}, deadline exceeded")
+        stale = bool(previous_text) and read_text(page, selector) == previous_text
+        raise OutputTimeoutException(timeout_ms, stale=stale, message=msg)
+    return handle.json_value()
+
+
+def apply_deadline_timeouts(page: Page) -> None:
+    """Bound the Playwright calls on page that take no explicit timeout by the current deadline, if any."""
+    deadline = current_deadline()
+    remaining_ms = deadline.remaining() * 1000 if deadline is not None else float("inf")
+    page.set_default_timeout(max(1, min(CONFIG["action_timeout_ms"], remaining_ms)))
+    page.set_default_navigation_timeout(max(1, min(CONFIG["page_timeout_ms"], remaining_ms)))
+
 
 def get_random_delay(delay_range: Tuple[float, float] = None, fatigue: float = 1, msg: str = "", verbose: bool = False) -> None:
     if delay_range is None or len(delay_range) != 2:
         delay_range = CONFIG["interaction_delay_range"]
-    delay = random.uniform(*delay_range) * set_fatigue(fatigue)
+    delay = cap_delay(random.uniform(*delay_range) * set_fatigue(fatigue))
     if fatigue > 1 or verbose:
         logger.info(f"{msg} Sleeping {delay:.1f}s (fatigue mode)") 
 
@@ -41,6 +124,10 @@ def perform_action(action: callable, description: str, delay_range: Tuple[float,
         raise_exception: bool = False, msg: str = '') -> bool:
     if msg:        
         description = description.removeprefix(msg)
+    deadline = current_deadline()
+    if deadline is not None:
+        deadline.check(msg)
+        deadline.set_action(description.strip())
     try:
         action()
         logger.debug(f"{msg} Action '{description}' performed successfully.")
@@ -48,6 +135,9 @@ def perform_action(action: callable, description: str, delay_range: Tuple[float,
         return True
     except Exception as e:
         logger.warning(f"{msg} Action '{description}' failed: {e}")
+        # past the deadline a failed action means the chunk ran out of time, whatever the caller expects
+        if deadline is not None and deadline.expired:
+            raise DeadlineExceededException(deadline.label, deadline.budget_s, message=f"{msg} '{description.strip()}' failed, deadline exceeded".strip()) from e
         if raise_exception:
             raise
         return False
@@ -99,6 +189,8 @@ def click_element(element: Locator, msg_prefix: str = "", hover: bool = False, r
                 raise_exception=raise_exception,
                 msg=msg_prefix
             )
+        except DeadlineExceededException:
+            raise
         except Exception as e:
             logger.warning(f"{msg_prefix} Click failed: {e}")
             if raise_exception:
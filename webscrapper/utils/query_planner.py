@@ -0,0 +1,222 @@
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from constants.output import LOG_FILENAME, OUTPUT_FOLDER
+from logger import translation_logger
+from scrapper_config import CONFIG
+
+logger = translation_logger.get_logger(
+    output_folder=OUTPUT_FOLDER,
+    log_filename=LOG_FILENAME
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS queries (
+    term        TEXT PRIMARY KEY,
+    lemma       TEXT NOT NULL,
+    rows        INTEGER NOT NULL,
+    total       INTEGER NOT NULL,
+    new_pairs   INTEGER NOT NULL,
+    queried_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_queries_lemma ON queries(lemma);
+CREATE TABLE IF NOT EXISTS pairs (
+    key         TEXT PRIMARY KEY,
+    en          TEXT NOT NULL,
+    kw          TEXT NOT NULL,
+    term        TEXT NOT NULL,
+    found_at    REAL NOT NULL
+);
+"""
+
+WORD_PATTERN = re.compile(r"[a-z]+")
+VOWELS = set("aeiouy")
+
+
+def get_lemma(word: str) -> str:
+    """
+    Crude stem shared by the inflections of an English word: save, saves, saved, saving -> sav;
+    cries, cried -> cry; stopped, stopping -> stop. Only used to group search terms and result words.
+    """
+    word = word.strip().lower()
+    if len(word) <= 3:
+        return word
+    for suffix, replacement in (("ies", "y"), ("ied", "y"), ("ing", ""), ("ed", ""), ("es", ""), ("s", "")):
+        if word.endswith(suffix) and len(word) - len(suffix) >= (2 if replacement else 3) and not word.endswith("ss"):
+            word = word[:-len(suffix)] + replacement
+            break
+    if word.endswith("e") and len(word) > 3:
+        word = word[:-1]
+    # stopp -> stop, fill -> fil: applied to every form, so the groups stay consistent
+    if len(word) > 3 and word[-1] == word[-2] and word[-1] not in VOWELS:
+        word = word[:-1]
+    return word
+
+
+def pair_key(en: str, kw: str) -> str:
+    key = f"{' '.join(en.lower().split())}\x1f{' '.join(kw.lower().split())}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def get_default_planner_path() -> Path:
+    return Path(OUTPUT_FOLDER) / "korpus_queries.sqlite3"
+
+
+class QueryPlanner:
+    """
+    Decides which search term is worth a request. Every query and every (en, kw) pair it returned is
+    kept in SQLite, pairs deduplicated globally, so the planner resumes across runs.
+
+    A term's expected yield is the rows one request returns times the share of them that should be
+    new. The hit count comes from the term's lemma group when a sibling was already searched, else
+    from the mean over all searches. The overlap is the number of stored pairs whose English side
+    already holds a word of that lemma. Searched terms, and terms expected to add fewer than
+    min_expected_pairs, are dropped.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        min_expected_pairs: float = CONFIG["korpus_min_expected_pairs"],
+        prior_rows: float = CONFIG["korpus_prior_rows"],
+    ):
+        self.db_path = Path(db_path) if db_path else get_default_planner_path()
+        self.min_expected_pairs = min_expected_pairs
+        self.prior_rows = prior_rows
+
+        self.lock = threading.Lock()
+        self._local = threading.local()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = self._get_connection()
+        connection.executescript(SCHEMA)
+
+        # in-memory view of the file: searched terms, hit counts per lemma, stored pairs per result-word lemma
+        self._queried = set()
+        self._lemma_totals: Dict[str, List[int]] = {}
+        self._totals: List[int] = []
+        self._rows_per_request: List[int] = []
+        self._new_pairs: List[int] = []
+        self._known = Counter()
+        for term, lemma, rows, total, new_pairs in connection.execute("SELECT term, lemma, rows, total, new_pairs FROM queries ORDER BY queried_at"):
+            self._remember_query(term, lemma, rows, total, new_pairs)
+        for (en,) in connection.execute("SELECT en FROM pairs"):
+            self._known.update(self._lemmas_of(en))
+        logger.info(f"Query planner | {len(self._queried):,} queries, {self.count_pairs():,} pairs in {self.db_path}")
+
+    def _get_connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def close(self) -> None:
+        """Close the calling thread's connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    @staticmethod
+    def _lemmas_of(text: str) -> set:
+        return {get_lemma(word) for word in WORD_PATTERN.findall(text.lower())}
+
+    def _remember_query(self, term: str, lemma: str, rows: int, total: int, new_pairs: int) -> None:
+        """Update the in-memory view; call with self.lock held (or from __init__)."""
+        self._queried.add(term)
+        self._lemma_totals.setdefault(lemma, []).append(total)
+        self._totals.append(total)
+        if rows:
+            self._rows_per_request.append(rows)
+        self._new_pairs.append(new_pairs)
+
+    def expected_new_pairs(self, term: str) -> float:
+        """New pairs one search for term should add, given everything stored so far."""
+        lemma = get_lemma(term)
+        with self.lock:
+            group_totals = self._lemma_totals.get(lemma)
+            if group_totals:
+                expected_total = sum(group_totals) / len(group_totals)
+            elif self._totals:
+                expected_total = sum(self._totals) / len(self._totals)
+            else:
+                expected_total = self.prior_rows
+            page_size = max(self._rows_per_request) if self._rows_per_request else expected_total
+            known = self._known[lemma]
+        if expected_total <= 0:
+            return 0.0
+        overlap = min(1.0, known / expected_total)
+        return min(expected_total, page_size) * (1 - overlap)
+
+    def plan(self, terms: Iterable[str]) -> List[Tuple[str, float]]:
+        """(term, expected new pairs) of the terms still worth a request, best first; ties keep the input order."""
+        candidates = dict.fromkeys(term.strip().lower() for term in terms if term and term.strip())
+        ranked = []
+        for term in candidates:
+            if term in self._queried:
+                continue
+            expected = self.expected_new_pairs(term)
+            if expected >= self.min_expected_pairs:
+                ranked.append((term, expected))
+        ranked.sort(key=lambda item: item[1], reverse=True)
+        return ranked
+
+    def record(self, term: str, rows: Sequence[Sequence[str]], total: Optional[int] = None) -> int:
+        """Store the (en, kw) rows a search returned; total is the hit count the site reports. Returns the new pairs."""
+        term = term.strip().lower()
+        total = len(rows) if total is None else total
+        now = time.time()
+        by_key = {pair_key(en, kw): (en, kw) for en, kw in rows if en and kw}
+
+        connection = self._get_connection()
+        keys = list(by_key)
+        existing = set()
+        # stay under SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            part = keys[start:start + 500]
+            existing.update(key for (key,) in connection.execute(
+                f"SELECT key FROM pairs WHERE key IN ({','.join('?' * len(part))})", part
+            ))
+        new_keys = [key for key in keys if key not in existing]
+        connection.executemany(
+            "INSERT OR IGNORE INTO pairs (key, en, kw, term, found_at) VALUES (?, ?, ?, ?, ?)",
+            [(key, by_key[key][0], by_key[key][1], term, now) for key in new_keys]
+        )
+        connection.execute(
+            "INSERT OR REPLACE INTO queries (term, lemma, rows, total, new_pairs, queried_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (term, get_lemma(term), len(rows), total, len(new_keys), now)
+        )
+        with self.lock:
+            self._remember_query(term, get_lemma(term), len(rows), total, len(new_keys))
+            for key in new_keys:
+                self._known.update(self._lemmas_of(by_key[key][0]))
+        return len(new_keys)
+
+    def count_pairs(self) -> int:
+        return self._get_connection().execute("SELECT COUNT(*) FROM pairs").fetchone()[0]
+
+    def iter_pairs(self) -> Iterator[Dict[str, str]]:
+        """Stream the stored pairs in discovery order."""
+        for en, kw, term in self._get_connection().execute("SELECT en, kw, term FROM pairs ORDER BY found_at"):
+            yield {"en": en, "kw": kw, "term": term}
+
+    def get_stats(self) -> Dict[str, float]:
+        with self.lock:
+            queries = len(self._new_pairs)
+            recent = self._new_pairs[-20:]
+            return {
+                "queries": queries,
+                "pairs": sum(self._new_pairs),
+                "new_pairs_per_query": sum(self._new_pairs) / queries if queries else 0.0,
+                "recent_new_pairs_per_query": sum(recent) / len(recent) if recent else 0.0,
+                "empty_queries": sum(1 for new_pairs in self._new_pairs if new_pairs == 0),
+            }
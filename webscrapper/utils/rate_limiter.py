@@ -0,0 +1,162 @@
+import random
+import threading
+import time
+
+from typing import Dict, Optional, Tuple
+
+from constants.output import LOG_FILENAME, OUTPUT_FOLDER
+from exceptions.deadline_exceeded_exception import DeadlineExceededException
+from logger import translation_logger
+from scrapper_config import CONFIG
+from utils.deadline import current_deadline
+
+logger = translation_logger.get_logger(
+    output_folder=OUTPUT_FOLDER,
+    log_filename=LOG_FILENAME
+)
+
+GLOBAL_KEY = "*"
+
+IntervalRange = Tuple[float, float]
+
+
+class _Slot:
+    """Pacing state of one key (the global limit or one origin)."""
+
+    def __init__(self, interval_range: IntervalRange):
+        self.interval_range = interval_range
+        self.next_free = 0.0
+        self.reservations = 0
+        self.waiting = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.deadline_skips = 0
+
+    def draw_interval(self, scale: float) -> float:
+        low, high = self.interval_range
+        return random.uniform(low, high) * scale
+
+
+class RateLimiter:
+    """
+    Reservation-based rate limiter. `reserve` hands out the next start time that satisfies both
+    the global spacing and the spacing of the request's origin, and books it immediately, so the
+    lock is only held for the bookkeeping. Callers then sleep (or await) outside the lock until
+    their own start time, and concurrent workers queue up on their reservations in parallel.
+
+    Intervals are drawn at random from each key's range on every reservation. Every counter is
+    updated under the same lock, so `get_stats` is an exact snapshot.
+    """
+
+    def __init__(
+        self,
+        global_interval_range: IntervalRange = (CONFIG["min_batch_interval"], CONFIG["max_batch_interval"]),
+        origin_interval_ranges: Optional[Dict[str, IntervalRange]] = None,
+        default_origin_interval_range: Optional[IntervalRange] = CONFIG["origin_interval_range"],
+    ):
+        self.lock = threading.Lock()
+        self.origin_interval_ranges = dict(CONFIG["origin_interval_ranges"] if origin_interval_ranges is None else origin_interval_ranges)
+        self.default_origin_interval_range = default_origin_interval_range
+        self.slots: Dict[str, _Slot] = {GLOBAL_KEY: _Slot(global_interval_range)}
+
+    def scaled(self, factor: float) -> "RateLimiter":
+        """
+        Fresh limiter with every interval multiplied by factor, e.g. the share of one
+        process out of `factor` processes pacing requests to the same sites.
+        """
+        scale = lambda interval_range: tuple(value * factor for value in interval_range) if interval_range else interval_range
+        return RateLimiter(
+            global_interval_range=scale(self.slots[GLOBAL_KEY].interval_range),
+            origin_interval_ranges={origin: scale(interval_range) for origin, interval_range in self.origin_interval_ranges.items()},
+            default_origin_interval_range=scale(self.default_origin_interval_range),
+        )
+
+    def _get_origin_slot(self, origin: str) -> Optional[_Slot]:
+        """Call with self.lock held. Origins without a configured range only follow the global limit."""
+        slot = self.slots.get(origin)
+        if slot is None:
+            interval_range = self.origin_interval_ranges.get(origin, self.default_origin_interval_range)
+            if interval_range is None:
+                return None
+            slot = self.slots[origin] = _Slot(interval_range)
+        return slot
+
+    def reserve(self, origin: Optional[str] = None, interval_scale: float = 1.0, not_after: Optional[float] = None) -> Optional[float]:
+        """
+        Book the next start slot and return it as a time.monotonic() timestamp. Never sleeps.
+        When the slot would start after not_after nothing is booked and None is returned.
+        """
+        with self.lock:
+            now = time.monotonic()
+            slots = [self.slots[GLOBAL_KEY]]
+            if origin:
+                origin_slot = self._get_origin_slot(origin)
+                if origin_slot is not None:
+                    slots.append(origin_slot)
+
+            start_time = max([now] + [slot.next_free for slot in slots])
+            if not_after is not None and start_time > not_after:
+                for slot in slots:
+                    slot.deadline_skips += 1
+                return None
+            wait_time = start_time - now
+            for slot in slots:
+                slot.next_free = start_time + slot.draw_interval(interval_scale)
+                slot.reservations += 1
+                slot.total_wait += wait_time
+                slot.max_wait = max(slot.max_wait, wait_time)
+            return start_time
+
+    def _update_waiting(self, origin: Optional[str], delta: int) -> None:
+        with self.lock:
+            for key in (GLOBAL_KEY, origin):
+                slot = self.slots.get(key) if key else None
+                if slot is not None:
+                    slot.waiting += delta
+
+    def begin_wait(self, origin: Optional[str] = None) -> None:
+        """Count a caller sleeping until its reservation; pair with finish_wait."""
+        self._update_waiting(origin, 1)
+
+    def finish_wait(self, origin: Optional[str] = None) -> None:
+        self._update_waiting(origin, -1)
+
+    def acquire(self, origin: Optional[str] = None, interval_scale: float = 1.0, msg: str = '') -> float:
+        """
+        Reserve a slot and sleep until it starts. Returns the time waited. A slot that would start
+        after the current deadline isn't booked: DeadlineExceededException is raised instead.
+        """
+        deadline = current_deadline()
+        start_time = self.reserve(origin, interval_scale, not_after=deadline.expires_at if deadline is not None else None)
+        if start_time is None:
+            raise DeadlineExceededException(deadline.label, deadline.budget_s, message=f"{msg} No request slot before the deadline".strip())
+        wait_time = start_time - time.monotonic()
+        if wait_time <= 0:
+            return 0.0
+        logger.info(f"{msg} Waiting {wait_time:.2f}s to maintain request interval")
+        self.begin_wait(origin)
+        try:
+            time.sleep(wait_time)
+        finally:
+            self.finish_wait(origin)
+        return wait_time
+
+    def get_waiting_count(self) -> int:
+        with self.lock:
+            return self.slots[GLOBAL_KEY].waiting
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        with self.lock:
+            now = time.monotonic()
+            return {
+                key: {
+                    "reservations": slot.reservations,
+                    "waiting": slot.waiting,
+                    "total_wait": slot.total_wait,
+                    "average_wait": slot.total_wait / slot.reservations if slot.reservations else 0.0,
+                    "max_wait": slot.max_wait,
+                    "deadline_skips": slot.deadline_skips,
+                    "backlog": max(0.0, slot.next_free - now),
+                }
+                for key, slot in self.slots.items()
+            }
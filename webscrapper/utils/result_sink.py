@@ -0,0 +1,153 @@
+import csv
+import json
+import os
+import queue
+import threading
+import time
+
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from constants.languages import TL
+from constants.output import LOG_FILENAME, OUTPUT_FOLDER
+from logger import translation_logger
+from scrapper_config import CONFIG
+from utils.txt_helper import sanitize_txt
+
+logger = translation_logger.get_logger(
+    output_folder=OUTPUT_FOLDER,
+    log_filename=LOG_FILENAME
+)
+
+
+def is_failed_entry(entry: Dict, target_col: str = TL) -> bool:
+    """Failed rows carry a bracketed marker instead of a translation: [ERROR], [TRANSLATION FAILED], etc."""
+    translation = entry.get(target_col)
+    return not isinstance(translation, str) or translation.startswith('[')
+
+
+class ResultSink(threading.Thread):
+    """
+    Consumer thread that drains the workers' result queue while they are still running.
+    Every entry is appended to per-run JSONL and CSV files (failed rows also go to a
+    separate JSONL), which are flushed and fsynced every flush_every rows or
+    flush_interval seconds. Only counters stay in memory, so RSS doesn't grow with the run.
+    """
+
+    def __init__(
+        self,
+        result_queue: queue.Queue,
+        columns: List[str],
+        filename: str,
+        output_folder: Optional[str] = None,
+        on_batch: Optional[Callable[[Dict], None]] = None,
+        flush_every: int = CONFIG["sink_flush_every"],
+        flush_interval: float = CONFIG["sink_flush_interval_s"],
+    ):
+        super().__init__(name="ResultSink", daemon=True)
+        self.result_queue = result_queue
+        self.columns = columns
+        self.on_batch = on_batch
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+
+        base_path = Path(output_folder) if output_folder else Path(translation_logger.get_filepath())
+        os.makedirs(base_path, exist_ok=True)
+        filename = sanitize_txt(filename)
+        self.jsonl_path = base_path / f"{filename}.jsonl"
+        self.csv_path = base_path / f"{filename}.csv"
+        self.failed_path = base_path / f"{filename}_failed.jsonl"
+
+        self.stats_lock = threading.Lock()
+        self.batches = 0
+        self.total = 0
+        self.successful = 0
+        self.failed = 0
+
+        self._pending_rows = 0
+        self._last_flush = time.monotonic()
+
+    def _open_files(self) -> None:
+        write_header = not self.csv_path.exists() or self.csv_path.stat().st_size == 0
+        self._jsonl_file = open(self.jsonl_path, "a", encoding="utf-8")
+        self._failed_file = open(self.failed_path, "a", encoding="utf-8")
+        self._csv_file = open(self.csv_path, "a", encoding="utf-8", newline="")
+        self._csv_writer = csv.DictWriter(self._csv_file, fieldnames=self.columns, extrasaction="ignore")
+        if write_header:
+            self._csv_writer.writeheader()
+
+    def _flush(self) -> None:
+        for f in (self._jsonl_file, self._failed_file, self._csv_file):
+            f.flush()
+            os.fsync(f.fileno())
+        self._pending_rows = 0
+        self._last_flush = time.monotonic()
+
+    def _close_files(self) -> None:
+        self._flush()
+        for f in (self._jsonl_file, self._failed_file, self._csv_file):
+            f.close()
+
+    def _write_result(self, result: Dict) -> None:
+        entries = result.get("entries") or []
+        failed = 0
+        for entry in entries:
+            line = json.dumps(entry, ensure_ascii=False)
+            self._jsonl_file.write(line + "\n")
+            self._csv_writer.writerow(entry)
+            if is_failed_entry(entry):
+                self._failed_file.write(line + "\n")
+                failed += 1
+
+        with self.stats_lock:
+            self.batches += 1
+            self.total += len(entries)
+            self.failed += failed
+            self.successful += len(entries) - failed
+        self._pending_rows += len(entries)
+
+        if self.on_batch:
+            try:
+                self.on_batch(result)
+            except Exception as e:
+                logger.error(f"Result sink | Batch callback failed for batch {result.get('task_id')}: {e}")
+
+    def run(self) -> None:
+        self._open_files()
+        try:
+            while True:
+                try:
+                    result = self.result_queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    result = False
+
+                if result is None:  # Poison pill to stop the sink
+                    break
+                if result:
+                    try:
+                        self._write_result(result)
+                    except Exception as e:
+                        logger.error(f"Result sink | Failed to write batch {result.get('task_id')}: {e}")
+
+                if self._pending_rows and (
+                    self._pending_rows >= self.flush_every
+                    or time.monotonic() - self._last_flush >= self.flush_interval
+                ):
+                    self._flush()
+        finally:
+            self._close_files()
+            logger.info(f"Result sink | Closed {self.jsonl_path} ({self.total:,} rows from {self.batches:,} batches)")
+
+    def stop(self) -> None:
+        """Drain whatever is left in the queue, flush and close the files."""
+        self.result_queue.put(None)
+        self.join()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self.stats_lock:
+            return {
+                "batches": self.batches,
+                "total": self.total,
+                "successful": self.successful,
+                "failed": self.failed,
+            }
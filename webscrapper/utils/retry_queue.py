@@ -0,0 +1,181 @@
+import heapq
+import itertools
+import json
+import os
+import random
+import threading
+import time
+
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from constants.languages import OL, SL, TL
+from constants.output import LOG_FILENAME, OUTPUT_FOLDER
+from logger import translation_logger
+from scrapper_config import CONFIG
+
+logger = translation_logger.get_logger(
+    output_folder=OUTPUT_FOLDER,
+    log_filename=LOG_FILENAME
+)
+
+
+def get_default_requeue_path() -> Path:
+    return Path(OUTPUT_FOLDER) / f"requeue_{SL}2{TL}_{OL}.jsonl"
+
+
+class RetryItem(NamedTuple):
+    chunk: List[Tuple[str, str]]
+    attempts: int
+    last_error: str
+    backend: str = ''
+
+
+class RetryQueue:
+    """
+    Time-ordered heap of failed chunks shared by every worker. A failing chunk is pushed back with
+    an exponential backoff instead of being retried in place, so its worker moves on right away and
+    whichever worker is free when the backoff expires picks it up. Chunks that run out of attempts
+    are appended to a requeue JSONL file, which the next run puts back in the ledger.
+
+    Chunks are kept per backend: a chunk was planned for its backend's request budget (and a
+    Korpus search term isn't a sentence), so only that backend's workers pick it up again.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = CONFIG["retry_attempts"],
+        base_delay_range: Tuple[float, float] = CONFIG["retry_delay_range"],
+        backoff_factor: float = CONFIG["retry_backoff_factor"],
+        max_delay: float = CONFIG["retry_max_delay_s"],
+        requeue_path: Optional[Path] = None,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay_range = base_delay_range
+        self.backoff_factor = backoff_factor
+        self.max_delay = max_delay
+        self.requeue_path = Path(requeue_path) if requeue_path else get_default_requeue_path()
+
+        self.condition = threading.Condition()
+        self._heaps: Dict[str, List[Tuple[float, int, RetryItem]]] = {}
+        self._sequence = itertools.count()
+
+        self.scheduled = 0
+        self.retried = 0
+        self.requeued = 0
+
+    def get_delay(self, attempts: int) -> float:
+        base = random.uniform(*self.base_delay_range)
+        return min(self.max_delay, base * self.backoff_factor ** max(0, attempts - 1))
+
+    def push(self, chunk: List[Tuple[str, str]], attempts: int, error: str = '', msg: str = '', backend: str = '') -> bool:
+        """
+        Schedule a chunk that failed `attempts` times. Returns False once the attempts are used up,
+        in which case the chunk went to the requeue file instead.
+        """
+        if attempts >= self.max_attempts:
+            self._write_requeue(chunk, attempts, error)
+            logger.warning(f"{msg} Giving up on {len(chunk)} sentences after {attempts} attempts, written to {self.requeue_path}")
+            return False
+
+        delay = self.get_delay(attempts)
+        with self.condition:
+            heap = self._heaps.setdefault(backend, [])
+            heapq.heappush(heap, (time.monotonic() + delay, next(self._sequence), RetryItem(list(chunk), attempts, error, backend)))
+            self.scheduled += 1
+            self.condition.notify_all()
+        logger.info(f"{msg} Retrying {len(chunk)} sentences in {delay:.1f}s (attempt {attempts + 1}/{self.max_attempts})")
+        return True
+
+    def pop_ready(self, backend: str = '') -> Optional[RetryItem]:
+        """Take the next chunk of backend whose backoff has expired, if any."""
+        with self.condition:
+            heap = self._heaps.get(backend)
+            if heap and heap[0][0] <= time.monotonic():
+                self.retried += 1
+                return heapq.heappop(heap)[2]
+        return None
+
+    def has_ready(self, backend: str = '') -> bool:
+        with self.condition:
+            heap = self._heaps.get(backend)
+            return bool(heap) and heap[0][0] <= time.monotonic()
+
+    def wait_until_ready(self, timeout: Optional[float] = None, backend: str = '') -> bool:
+        """Block until a chunk of backend is ready; returns False if it has none left or the timeout expires first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.condition:
+            while self._heaps.get(backend):
+                heap = self._heaps[backend]
+                now = time.monotonic()
+                delay = heap[0][0] - now
+                if delay <= 0:
+                    return True
+                if deadline is not None:
+                    if now >= deadline:
+                        return False
+                    delay = min(delay, deadline - now)
+                # a push with an earlier deadline wakes the waiters up
+                self.condition.wait(delay)
+            return False
+
+    def __len__(self) -> int:
+        with self.condition:
+            return sum(len(heap) for heap in self._heaps.values())
+
+    def flush_to_requeue(self, msg: str = '') -> int:
+        """Move everything still scheduled to the requeue file (end of the run)."""
+        with self.condition:
+            items = [entry[2] for heap in self._heaps.values() for entry in heap]
+            self._heaps.clear()
+        for item in items:
+            self._write_requeue(item.chunk, item.attempts, item.last_error)
+        if items:
+            logger.warning(f"{msg} {len(items)} chunks were still waiting for a retry, written to {self.requeue_path}")
+        return len(items)
+
+    def _write_requeue(self, chunk: List[Tuple[str, str]], attempts: int, error: str) -> None:
+        """
+        Append the chunk with a single write on an O_APPEND descriptor: the shard processes of
+        translator_sharded.py share this file, and their lines must not interleave.
+        """
+        os.makedirs(self.requeue_path.parent, exist_ok=True)
+        data = "".join(
+            json.dumps({SL: sl, OL: ol, "attempts": attempts, "error": error}, ensure_ascii=False) + "\n"
+            for sl, ol in chunk
+        ).encode("utf-8")
+        with self.condition:
+            fd = os.open(self.requeue_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                written = os.write(fd, data)
+                # a short write only happens on a full disk and the like, finish it rather than lose lines
+                while written < len(data):
+                    written += os.write(fd, data[written:])
+            finally:
+                os.close(fd)
+            self.requeued += len(chunk)
+
+    def iter_requeued(self) -> Iterator[Tuple[str, str]]:
+        """Pairs written to the requeue file by previous runs."""
+        if not self.requeue_path.exists():
+            return
+        with open(self.requeue_path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError as e:
+                    # a process killed mid-write leaves a partial last line, the rest is still good
+                    logger.warning(f"Skipping unreadable line {line_number} of {self.requeue_path}: {e}")
+                    continue
+                yield entry[SL], entry[OL]
+
+    def get_stats(self) -> Dict[str, int]:
+        with self.condition:
+            return {
+                "scheduled": self.scheduled,
+                "retried": self.retried,
+                "requeued_sentences": self.requeued,
+                "pending": sum(len(heap) for heap in self._heaps.values()),
+            }
@@ -0,0 +1,230 @@
+import hashlib
+import sqlite3
+import threading
+import time
+
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from constants.languages import SL, TL
+from constants.output import LOG_FILENAME, OUTPUT_FOLDER
+from logger import translation_logger
+from scrapper_config import CONFIG
+from utils.work_ledger import normalize_sentence
+
+logger = translation_logger.get_logger(
+    output_folder=OUTPUT_FOLDER,
+    log_filename=LOG_FILENAME
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    key          TEXT PRIMARY KEY,
+    backend      TEXT NOT NULL,
+    sl           TEXT NOT NULL,
+    tl           TEXT NOT NULL,
+    source       TEXT NOT NULL,
+    translation  TEXT NOT NULL,
+    last_used    REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations(last_used);
+"""
+
+
+def get_default_cache_path() -> Path:
+    return Path(OUTPUT_FOLDER) / "translation_cache.sqlite3"
+
+
+class TranslationCache:
+    """
+    Content-addressed translation memory keyed on (backend, SL, TL, normalized sentence).
+    Lookups go through an in-memory LRU first, then the SQLite file shared by every run;
+    the file itself is trimmed to max_entries by least recent use.
+
+    Sentences being translated are tracked as in-flight futures: `reserve` hands a sentence
+    to the first worker asking for it and a future to the others, so overlapping datasets
+    only send one request per sentence and every waiter gets the same result.
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        db_path: Optional[Path] = None,
+        memory_entries: int = CONFIG["tm_cache_memory_entries"],
+        max_entries: int = CONFIG["tm_cache_max_entries"],
+        source_lang: str = SL,
+        target_lang: str = TL,
+    ):
+        self.backend = backend
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.db_path = Path(db_path) if db_path else get_default_cache_path()
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+
+        self.lock = threading.Lock()
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._in_flight: Dict[str, Future] = {}
+        self._local = threading.local()
+        self._writes_since_trim = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._get_connection().executescript(SCHEMA)
+
+    def _get_connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def close(self) -> None:
+        """Close the calling thread's connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def make_key(self, sentence: str) -> str:
+        key = f"{self.backend}\x1f{self.source_lang}\x1f{self.target_lang}\x1f{normalize_sentence(sentence)}"
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, translation: str) -> None:
+        """Insert into the in-memory LRU; call with self.lock held."""
+        self._memory[key] = translation
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get_many(self, sentences: Iterable[str]) -> Dict[str, str]:
+        """Return {sentence: translation} for the cached sentences, memory first, then disk."""
+        found: Dict[str, str] = {}
+        disk_keys: Dict[str, List[str]] = {}
+        with self.lock:
+            for sentence in sentences:
+                key = self.make_key(sentence)
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[sentence] = self._memory[key]
+                else:
+                    disk_keys.setdefault(key, []).append(sentence)
+
+        if disk_keys:
+            connection = self._get_connection()
+            keys = list(disk_keys)
+            rows = []
+            # stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                part = keys[start:start + 500]
+                rows.extend(connection.execute(
+                    f"SELECT key, translation FROM translations WHERE key IN ({','.join('?' * len(part))})", part
+                ).fetchall())
+            if rows:
+                connection.executemany(
+                    "UPDATE translations SET last_used = ? WHERE key = ?",
+                    [(time.time(), key) for key, _ in rows]
+                )
+            with self.lock:
+                for key, translation in rows:
+                    self._remember(key, translation)
+                    for sentence in disk_keys[key]:
+                        found[sentence] = translation
+        return found
+
+    def reserve(self, sentences: Iterable[str]) -> Tuple[Dict[str, str], Dict[str, Future], Dict[str, Future]]:
+        """
+        Sort sentences into (cached translations, futures owned by other workers, futures owned by the caller).
+        The caller must resolve the sentences it owns with `put`, and hand back the rest with `abandon`.
+        """
+        sentences = list(dict.fromkeys(sentences))
+        cached = self.get_many(sentences)
+        waiting: Dict[str, Future] = {}
+        owned: Dict[str, Future] = {}
+        with self.lock:
+            for sentence in sentences:
+                if sentence in cached:
+                    continue
+                key = self.make_key(sentence)
+                future = self._in_flight.get(key)
+                if future is not None:
+                    waiting[sentence] = future
+                else:
+                    owned[sentence] = self._in_flight[key] = Future()
+            self.hits += len(cached)
+            self.coalesced += len(waiting)
+            self.misses += len(owned)
+        return cached, waiting, owned
+
+    def put(self, translations: Dict[str, str]) -> None:
+        """Store finished translations and wake up the workers waiting on them."""
+        if not translations:
+            return
+        now = time.time()
+        rows = [
+            (self.make_key(sentence), self.backend, self.source_lang, self.target_lang, normalize_sentence(sentence), translation, now)
+            for sentence, translation in translations.items()
+        ]
+        self._get_connection().executemany(
+            "INSERT OR REPLACE INTO translations (key, backend, sl, tl, source, translation, last_used) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        with self.lock:
+            futures = []
+            for row in rows:
+                key, translation = row[0], row[5]
+                self._remember(key, translation)
+                future = self._in_flight.pop(key, None)
+                if future is not None:
+                    futures.append((future, translation))
+            self._writes_since_trim += len(rows)
+            trim = self._writes_since_trim >= max(1, self.max_entries // 10)
+            if trim:
+                self._writes_since_trim = 0
+        for future, translation in futures:
+            if not future.done():
+                future.set_result(translation)
+        if trim:
+            self.trim()
+
+    def abandon(self, owned: Dict[str, Future]) -> None:
+        """Release reserved sentences that didn't get a translation; their waiters get None and translate them themselves."""
+        released = []
+        with self.lock:
+            for sentence, future in owned.items():
+                key = self.make_key(sentence)
+                if self._in_flight.get(key) is future:
+                    del self._in_flight[key]
+                released.append(future)
+        for future in released:
+            if not future.done():
+                future.set_result(None)
+
+    def trim(self) -> int:
+        """Evict the least recently used rows beyond max_entries from the file."""
+        cursor = self._get_connection().execute(
+            "DELETE FROM translations WHERE key IN ("
+            "SELECT key FROM translations ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+        if cursor.rowcount:
+            logger.debug(f"Translation cache | Evicted {cursor.rowcount:,} least recently used entries")
+        return cursor.rowcount
+
+    def get_stats(self) -> Dict[str, float]:
+        with self.lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+            }
@@ -0,0 +1,256 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from constants.languages import OL, SL, TL
+from constants.output import LOG_FILENAME, OUTPUT_FOLDER
+from logger import translation_logger
+from scrapper_config import CONFIG
+from utils.result_sink import is_failed_entry
+
+logger = translation_logger.get_logger(
+    output_folder=OUTPUT_FOLDER,
+    log_filename=LOG_FILENAME
+)
+
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sentences (
+    id          TEXT PRIMARY KEY,
+    source      TEXT NOT NULL,
+    original    TEXT NOT NULL,
+    state       TEXT NOT NULL DEFAULT 'pending',
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    backend     TEXT,
+    latency     REAL,
+    worker      TEXT,
+    result      TEXT,
+    updated_at  REAL
+);
+CREATE INDEX IF NOT EXISTS idx_sentences_state ON sentences(state);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def normalize_sentence(text: str) -> str:
+    return " ".join(text.split()) if isinstance(text, str) else ""
+
+
+def sentence_id(source: str, original: str) -> str:
+    """Stable row id for a (SL, OL) pair, insensitive to whitespace differences."""
+    key = f"{normalize_sentence(source)}\x1f{normalize_sentence(original)}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def get_default_ledger_path() -> Path:
+    return Path(OUTPUT_FOLDER) / f"ledger_{SL}2{TL}_{OL}.sqlite3"
+
+
+class WorkLedger:
+    """
+    Per-project SQLite (WAL) ledger with one row per source sentence and its state
+    (pending / in_flight / done / failed), attempts, backend and latency.
+    Workers claim batches atomically and record results as each chunk finishes, so a restart
+    only has to look at this table instead of rescanning the previous runs' JSON files.
+    Each thread gets its own connection; WAL lets readers run while one writer commits.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None, max_attempts: int = CONFIG["ledger_max_attempts"]):
+        self.db_path = Path(db_path) if db_path else get_default_ledger_path()
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._get_connection().executescript(SCHEMA)
+
+    def _get_connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # autocommit mode, transactions are opened explicitly where they matter
+            connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def close(self) -> None:
+        """Close the calling thread's connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._get_connection().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        self._get_connection().execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def seed(self, pairs: Iterable[Tuple[str, str]]) -> int:
+        """Insert (SL, OL) pairs as pending rows; pairs already in the ledger are left untouched."""
+        now = time.time()
+        rows = ((sentence_id(sl, ol), sl, ol, now) for sl, ol in pairs)
+        connection = self._get_connection()
+        before = connection.total_changes
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany(
+                "INSERT OR IGNORE INTO sentences (id, source, original, updated_at) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return connection.total_changes - before
+
+    def import_entries(self, entries: Iterable[Dict], backend: str = "legacy") -> int:
+        """Mark entries recovered from older JSON outputs as done (used once to bootstrap the ledger)."""
+        now = time.time()
+        rows = [
+            (sentence_id(entry[SL], entry[OL]), entry[SL], entry[OL], DONE, backend, json.dumps(entry, ensure_ascii=False), now)
+            for entry in entries
+            if entry.get(SL) and entry.get(OL) and not is_failed_entry(entry)
+        ]
+        connection = self._get_connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany(
+                "INSERT INTO sentences (id, source, original, state, backend, result, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET state = excluded.state, backend = excluded.backend, "
+                "result = excluded.result, updated_at = excluded.updated_at",
+                rows
+            )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return len(rows)
+
+    def recover_in_flight(self) -> int:
+        """Put rows claimed by a run that died back to pending. Call once before starting workers."""
+        cursor = self._get_connection().execute(
+            "UPDATE sentences SET state = ?, worker = NULL WHERE state = ?", (PENDING, IN_FLIGHT)
+        )
+        return cursor.rowcount
+
+    def claim_batch(self, size: int, worker: str = '', shard: Optional[Tuple[int, int]] = None) -> List[Tuple[str, str]]:
+        """
+        Atomically move up to `size` claimable rows (pending, or failed with attempts left) to in_flight.
+        `shard=(index, count)` restricts the claim to one slice of the ledger for multi-process runs.
+        """
+        shard_clause = ""
+        params: List = [PENDING, FAILED, self.max_attempts]
+        if shard:
+            shard_clause = " AND (rowid % ?) = ?"
+            params.extend([shard[1], shard[0]])
+        params.append(size)
+
+        connection = self._get_connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            rows = connection.execute(
+                "SELECT id, source, original FROM sentences "
+                f"WHERE (state = ? OR (state = ? AND attempts < ?)){shard_clause} "
+                "ORDER BY rowid LIMIT ?",
+                params
+            ).fetchall()
+            connection.executemany(
+                "UPDATE sentences SET state = ?, attempts = attempts + 1, worker = ?, updated_at = ? WHERE id = ?",
+                [(IN_FLIGHT, worker, time.time(), row[0]) for row in rows]
+            )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return [(row[1], row[2]) for row in rows]
+
+    def requeue(self, pairs: Iterable[Tuple[str, str]]) -> int:
+        """Put failed pairs back to pending, whatever their attempts count."""
+        cursor = self._get_connection().executemany(
+            "UPDATE sentences SET state = ?, worker = NULL WHERE id = ? AND state = ?",
+            ((PENDING, sentence_id(sl, ol), FAILED) for sl, ol in pairs)
+        )
+        return cursor.rowcount
+
+    def release(self, pairs: Sequence[Tuple[str, str]]) -> None:
+        """Hand claimed pairs back without counting the attempt (e.g. the batch was aborted)."""
+        self._get_connection().executemany(
+            "UPDATE sentences SET state = ?, attempts = MAX(attempts - 1, 0), worker = NULL WHERE id = ? AND state = ?",
+            [(PENDING, sentence_id(sl, ol), IN_FLIGHT) for sl, ol in pairs]
+        )
+
+    def record_entries(self, entries: Sequence[Dict], backend: str = '', latency: Optional[float] = None) -> None:
+        """Store finished entries; bracketed markers ([ERROR], [TRANSLATION FAILED], ...) are recorded as failed."""
+        now = time.time()
+        rows = [
+            (
+                FAILED if is_failed_entry(entry) else DONE,
+                backend,
+                latency,
+                json.dumps(entry, ensure_ascii=False),
+                now,
+                sentence_id(entry.get(SL, ""), entry.get(OL, "")),
+            )
+            for entry in entries
+        ]
+        self._get_connection().executemany(
+            "UPDATE sentences SET state = ?, backend = ?, latency = ?, result = ?, updated_at = ? WHERE id = ?",
+            rows
+        )
+
+    def mark_pairs(self, pairs: Sequence[Tuple[str, str]], state: str, backend: str = '', latency: Optional[float] = None) -> None:
+        """Set the state of claimed pairs whose results don't map one-to-one to them (e.g. search terms)."""
+        now = time.time()
+        self._get_connection().executemany(
+            "UPDATE sentences SET state = ?, backend = ?, latency = ?, updated_at = ? WHERE id = ?",
+            [(state, backend, latency, now, sentence_id(sl, ol)) for sl, ol in pairs]
+        )
+
+    def record_chunk(self, chunk: Sequence[Tuple[str, str]], entries: Sequence[Dict], backend: str = '', latency: Optional[float] = None) -> None:
+        """Record a finished chunk; claimed pairs with no matching entry (e.g. search terms) are marked done."""
+        self.record_entries(entries, backend=backend, latency=latency)
+        answered = {sentence_id(entry.get(SL, ""), entry.get(OL, "")) for entry in entries}
+        unanswered = [pair for pair in chunk if sentence_id(*pair) not in answered]
+        if unanswered:
+            self.mark_pairs(unanswered, state=DONE, backend=backend, latency=latency)
+
+    def counts(self) -> Dict[str, int]:
+        rows = self._get_connection().execute("SELECT state, COUNT(*) FROM sentences GROUP BY state").fetchall()
+        counts = {PENDING: 0, IN_FLIGHT: 0, DONE: 0, FAILED: 0}
+        counts.update({state: count for state, count in rows})
+        return counts
+
+    def count_claimable(self) -> int:
+        row = self._get_connection().execute(
+            "SELECT COUNT(*) FROM sentences WHERE state = ? OR (state = ? AND attempts < ?)",
+            (PENDING, FAILED, self.max_attempts)
+        ).fetchone()
+        return row[0]
+
+    def iter_results(self, states: Sequence[str] = (DONE,), updated_before: Optional[float] = None) -> Iterator[Dict]:
+        """Stream the stored result entries, optionally only those written before a given time."""
+        query = f"SELECT result FROM sentences WHERE result IS NOT NULL AND state IN ({','.join('?' * len(states))})"
+        params: List = list(states)
+        if updated_before is not None:
+            query += " AND updated_at < ?"
+            params.append(updated_before)
+        # a dedicated connection keeps the cursor independent from writes on this thread
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            for (result,) in connection.execute(query + " ORDER BY rowid", params):
+                yield json.loads(result)
+        finally:
+            connection.close()